@@ -0,0 +1,112 @@
+"""Approximate nearest-neighbour helpers for large-n near-duplicate detection."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from briefing.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_rows(embs: np.ndarray) -> np.ndarray:
+    vecs = np.asarray(embs, dtype=np.result_type(embs.dtype, np.float32))
+    norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vecs / norms
+
+
+class RandomProjectionLSH:
+    """Sign-random-projection LSH over cosine similarity (pure NumPy).
+
+    Each of ``n_tables`` tables hashes a vector to ``n_bits`` hyperplane signs; two
+    vectors at angle θ collide in one table with probability ``(1 - θ/π) ** n_bits``.
+    Only pairs that share a bucket in some table are scored exactly.
+    """
+
+    def __init__(self, n_tables: int = 16, n_bits: int = 10, seed: int = 0) -> None:
+        self.n_tables = max(1, int(n_tables))
+        self.n_bits = max(1, min(62, int(n_bits)))
+        self.seed = seed
+
+    def candidate_pairs(self, normed: np.ndarray, threshold: float) -> np.ndarray:
+        """Return unique ``(i, j)`` pairs with ``i < j`` and cosine similarity >= threshold."""
+
+        n, dim = normed.shape
+        if n < 2:
+            return np.empty((0, 2), dtype=np.int64)
+
+        rng = np.random.default_rng(self.seed)
+        weights = (1 << np.arange(self.n_bits, dtype=np.int64))
+        found: Set[Tuple[int, int]] = set()
+
+        for _ in range(self.n_tables):
+            planes = rng.normal(size=(dim, self.n_bits)).astype(normed.dtype)
+            codes = ((normed @ planes) > 0).astype(np.int64) @ weights
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+            for bucket in np.split(order, bounds):
+                if bucket.size < 2:
+                    continue
+                bucket = np.sort(bucket)
+                sims = normed[bucket] @ normed[bucket].T
+                rows, cols = np.nonzero(np.triu(sims >= threshold, k=1))
+                found.update(zip(bucket[rows].tolist(), bucket[cols].tolist()))
+
+        if not found:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.array(sorted(found), dtype=np.int64)
+
+
+def greedy_keep_from_pairs(n: int, pairs: np.ndarray) -> List[bool]:
+    """Apply the greedy keep-first rule to a list of above-threshold ``(i, j)`` pairs."""
+
+    keep = np.ones(n, dtype=bool)
+    if len(pairs):
+        neighbours: Dict[int, List[int]] = {}
+        for i, j in pairs.tolist():
+            neighbours.setdefault(i, []).append(j)
+        for i in sorted(neighbours):
+            if keep[i]:
+                keep[neighbours[i]] = False
+    return keep.tolist()
+
+
+def exact_pairs(normed: np.ndarray, threshold: float, block_size: int = 1024) -> Set[Tuple[int, int]]:
+    """All ``(i, j)`` pairs with ``i < j`` above threshold, computed tile by tile."""
+
+    n = normed.shape[0]
+    out: Set[Tuple[int, int]] = set()
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        sims = normed[start:stop] @ normed[start:].T
+        rows, cols = np.nonzero(sims >= threshold)
+        for r, c in zip(rows.tolist(), cols.tolist()):
+            i, j = start + r, start + c
+            if j > i:
+                out.add((i, j))
+    return out
+
+
+def lsh_recall(embs: np.ndarray, threshold: float, index: RandomProjectionLSH) -> Dict[str, float]:
+    """Compare LSH against the exact path: pair recall and dropped-item agreement."""
+
+    normed = normalize_rows(embs)
+    truth = exact_pairs(normed, threshold)
+    approx_arr = index.candidate_pairs(normed, threshold)
+    approx = set(map(tuple, approx_arr.tolist()))
+
+    exact_keep = greedy_keep_from_pairs(len(normed), np.array(sorted(truth), dtype=np.int64).reshape(-1, 2))
+    approx_keep = greedy_keep_from_pairs(len(normed), approx_arr)
+    exact_dropped = {i for i, k in enumerate(exact_keep) if not k}
+    approx_dropped = {i for i, k in enumerate(approx_keep) if not k}
+
+    return {
+        "true_pairs": float(len(truth)),
+        "pair_recall": (len(truth & approx) / len(truth)) if truth else 1.0,
+        "dropped_recall": (len(exact_dropped & approx_dropped) / len(exact_dropped)) if exact_dropped else 1.0,
+        "mask_agreement": float(np.mean(np.array(exact_keep) == np.array(approx_keep))) if exact_keep else 1.0,
+    }
@@ -0,0 +1,304 @@
+"""Persistent content-addressed cache for TEI embeddings."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from briefing.utils import file_lock, get_logger
+
+logger = get_logger(__name__)
+
+EMBED_CACHE_DIR_DEFAULT = os.getenv("EMBED_CACHE_DIR", "/workspace/cache/embeddings")
+TEI_MODEL_ID = os.getenv("TEI_MODEL_ID", "sentence-transformers/all-MiniLM-L6-v2")
+
+_INDEX_FILE = "index.json"
+_VECTORS_FILE = "vectors.f32"
+_LOCK_FILE = ".lock"
+_INDEX_VERSION = 1
+
+
+class EmbeddingCache:
+    """On-disk embedding store keyed by ``sha256(model_id, text)``.
+
+    Vectors live in a flat float32 file that is read through ``np.memmap``; a JSON
+    index maps each key to its row plus created/last-used timestamps. New vectors
+    are buffered in memory and appended on :meth:`flush`, which also applies TTL
+    and LRU eviction and compacts the vector file when rows were evicted.
+
+    Loading and flushing hold a file lock in the cache directory, and a flush
+    first merges whatever other processes persisted since this instance loaded,
+    so parallel runs can share one directory.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        *,
+        model_id: str = TEI_MODEL_ID,
+        ttl_hours: float = 72.0,
+        max_entries: int = 50000,
+    ) -> None:
+        self.root = Path(root)
+        self.model_id = model_id
+        self.ttl_seconds = max(0.0, float(ttl_hours)) * 3600
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._dim: Optional[int] = None
+        self._rows = 0
+        # key -> [row, created_ts, last_used_ts]
+        self._entries: Dict[str, List[float]] = {}
+        self._pending: Dict[str, np.ndarray] = {}
+        self._mmap: Optional[np.memmap] = None
+        self._load()
+
+    # ---------- persistence ----------
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / _INDEX_FILE
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.root / _VECTORS_FILE
+
+    @property
+    def _lock_path(self) -> Path:
+        return self.root / _LOCK_FILE
+
+    def _load(self) -> None:
+        if not self._index_path.exists() or not self._vectors_path.exists():
+            return
+        with file_lock(self._lock_path):
+            disk = self._read_disk()
+            if disk is None:
+                return
+            self._dim, self._rows, self._entries = disk
+            # opened under the lock: a later compaction by another process replaces
+            # the file, and this mapping keeps reading the rows the index describes
+            self._vectors()
+
+    def _read_disk(self) -> Optional[Tuple[int, int, Dict[str, List[float]]]]:
+        """Index state as ``(dim, rows, entries)``; call with the file lock held.
+
+        Bytes past ``rows`` (an append interrupted before its index was written)
+        are truncated so the next append lands at the row the index expects.
+        """
+        try:
+            meta = json.loads(self._index_path.read_text(encoding="utf-8"))
+            size = self._vectors_path.stat().st_size
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            logger.warning("embedding cache index unreadable, starting empty: %s", exc)
+            return None
+        if meta.get("version") != _INDEX_VERSION or not meta.get("dim"):
+            return None
+
+        dim = int(meta["dim"])
+        rows = int(meta.get("rows", 0))
+        expected = rows * dim * 4
+        if size < expected:
+            logger.warning("embedding cache vectors truncated, starting empty")
+            return None
+        if size > expected:
+            logger.warning("embedding cache dropping %d trailing bytes from %s", size - expected, self._vectors_path)
+            os.truncate(self._vectors_path, expected)
+        return dim, rows, {k: list(v) for k, v in meta.get("entries", {}).items()}
+
+    def _merge_disk(self) -> None:
+        """Adopt the on-disk index written by any process, keeping local last-used times."""
+        disk = self._read_disk() if self._index_path.exists() and self._vectors_path.exists() else None
+        self._mmap = None
+        if disk is None or disk[0] != self._dim:
+            if disk is not None:
+                logger.warning("embedding cache on disk has dim=%d, replacing with dim=%d", disk[0], self._dim)
+            self._rows = 0
+            self._entries = {}
+            if self._vectors_path.exists():
+                # replaced rather than truncated: other processes may still map the old file
+                tmp_path = self._vectors_path.with_suffix(".tmp")
+                tmp_path.write_bytes(b"")
+                os.replace(tmp_path, self._vectors_path)
+            return
+        _, rows, entries = disk
+        for k, entry in entries.items():
+            local = self._entries.get(k)
+            if local is not None:
+                entry[2] = max(entry[2], local[2])
+        self._rows = rows
+        self._entries = entries
+
+    def _vectors(self) -> Optional[np.memmap]:
+        if self._mmap is None and self._rows and self._dim:
+            self._mmap = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self._dim)
+            )
+        return self._mmap
+
+    # ---------- public API ----------
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.model_id.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return cached vectors (or ``None`` per miss) and update hit/miss counters."""
+
+        now = time.time()
+        out: List[Optional[np.ndarray]] = []
+        with self._lock:
+            vectors = self._vectors()
+            for text in texts:
+                k = self.key(text)
+                if k in self._pending:
+                    out.append(self._pending[k])
+                    self.hits += 1
+                    continue
+                entry = self._entries.get(k)
+                if entry is None or vectors is None or self._expired(entry, now):
+                    out.append(None)
+                    self.misses += 1
+                    continue
+                entry[2] = now
+                out.append(np.array(vectors[int(entry[0])], dtype=np.float32))
+                self.hits += 1
+        return out
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Any]) -> None:
+        with self._lock:
+            for text, vec in zip(texts, vectors):
+                arr = np.asarray(vec, dtype=np.float32).reshape(-1)
+                if self._dim is not None and arr.shape[0] != self._dim:
+                    logger.warning(
+                        "embedding cache dim changed (%d -> %d), resetting cache",
+                        self._dim,
+                        arr.shape[0],
+                    )
+                    self._reset()
+                if self._dim is None:
+                    self._dim = int(arr.shape[0])
+                self._pending[self.key(text)] = arr
+
+    def flush(self) -> None:
+        """Persist pending vectors, evict expired/LRU entries and compact if needed."""
+
+        with self._lock:
+            if self._dim is None:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            with file_lock(self._lock_path):
+                self._merge_disk()
+                self._flush_locked()
+                self._vectors()
+
+    def _flush_locked(self) -> None:
+        now = time.time()
+        live = {
+            k: v
+            for k, v in self._entries.items()
+            if k not in self._pending and not self._expired(v, now)
+        }
+        budget = max(0, self.max_entries - len(self._pending))
+        if len(live) > budget:
+            by_recency = sorted(live.items(), key=lambda kv: kv[1][2], reverse=True)
+            live = dict(by_recency[:budget])
+
+        if len(live) != len(self._entries) or self._rows != len(self._entries):
+            logger.info(
+                "embedding cache evicted=%d kept=%d",
+                len(self._entries) - len(live),
+                len(live),
+            )
+            self._compact(live)
+
+        if self._pending:
+            pending_items = list(self._pending.items())
+            with open(self._vectors_path, "ab") as fh:
+                for offset, (k, arr) in enumerate(pending_items):
+                    fh.write(arr.tobytes())
+                    self._entries[k] = [self._rows + offset, now, now]
+            self._rows += len(pending_items)
+            self._pending.clear()
+            self._mmap = None
+
+        meta = {
+            "version": _INDEX_VERSION,
+            "model_id": self.model_id,
+            "dim": self._dim,
+            "rows": self._rows,
+            "entries": self._entries,
+        }
+        tmp_path = self._index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp_path, self._index_path)
+
+    # ---------- internals ----------
+
+    def _expired(self, entry: List[float], now: float) -> bool:
+        return bool(self.ttl_seconds) and now - entry[1] > self.ttl_seconds
+
+    def _compact(self, live: Dict[str, List[float]]) -> None:
+        vectors = self._vectors()
+        ordered = sorted(live.items(), key=lambda kv: kv[1][0])
+        tmp_path = self._vectors_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as fh:
+            for new_row, (k, entry) in enumerate(ordered):
+                if vectors is not None:
+                    fh.write(np.asarray(vectors[int(entry[0])], dtype=np.float32).tobytes())
+                entry[0] = new_row
+        self._mmap = None
+        os.replace(tmp_path, self._vectors_path)
+        self._entries = dict(ordered)
+        self._rows = len(ordered)
+
+    def _reset(self) -> None:
+        self._dim = None
+        self._rows = 0
+        self._entries = {}
+        self._pending = {}
+        self._mmap = None
+        # the files on disk are replaced by the next flush, under the file lock
+
+
+_CACHES: Dict[Tuple[str, str, float, int], EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def from_config(embedding_cfg: Dict[str, Any]) -> Optional[EmbeddingCache]:
+    """Process-wide :class:`EmbeddingCache` for ``processing.embedding.cache``, or ``None``.
+
+    One instance per directory, model and TTL/size settings, so a resident
+    daemon keeps the index and vector mapping loaded between runs.
+    """
+
+    cache_cfg = (embedding_cfg or {}).get("cache") or {}
+    if not cache_cfg.get("enabled", False):
+        return None
+    key = (
+        str(cache_cfg.get("dir") or EMBED_CACHE_DIR_DEFAULT),
+        cache_cfg.get("model_id") or TEI_MODEL_ID,
+        float(cache_cfg.get("ttl_hours", 72)),
+        int(cache_cfg.get("max_entries", 50000)),
+    )
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            root, model_id, ttl_hours, max_entries = key
+            cache = _CACHES[key] = EmbeddingCache(
+                root, model_id=model_id, ttl_hours=ttl_hours, max_entries=max_entries
+            )
+    return cache
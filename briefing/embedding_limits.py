@@ -0,0 +1,176 @@
+"""Learned TEI embedding batch limits, persisted per server and model across runs."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from briefing.utils import get_logger
+
+logger = get_logger(__name__)
+
+EMBED_LIMITS_DIR_DEFAULT = os.getenv("EMBED_LIMITS_DIR", "/workspace/cache/embed_limits")
+
+_STATE_FILE = "limits.json"
+# an accepted batch at least this full of the current limit earns an additive increase
+_FULL_FRACTION = 0.8
+
+
+class BatchLimitController:
+    """AIMD controller for the token budget of one embedding batch.
+
+    ``limit`` starts from the value learned by earlier runs (or ``initial``),
+    grows by ``step_fraction * ceiling`` (at most half-way to ``min_rejected``)
+    whenever a batch that filled most of it is accepted, and is multiplied by
+    ``decrease`` when a multi-item batch gets a 413. ``max_accepted`` and
+    ``min_rejected`` bracket the server's real limit: the limit never grows to
+    ``min_rejected`` or past ``ceiling``, and never shrinks below a size the
+    server has accepted. The bracket is forgotten after ``forget_hours`` so a
+    reconfigured server is re-probed.
+    """
+
+    def __init__(
+        self,
+        path,
+        key: str,
+        *,
+        initial: int,
+        ceiling: Optional[int] = None,
+        step_fraction: float = 0.05,
+        decrease: float = 0.75,
+        forget_hours: float = 168.0,
+    ) -> None:
+        self.path = Path(path)
+        self.key = key
+        self.ceiling = max(1, int(ceiling or initial))
+        self.step = max(1, int(self.ceiling * step_fraction))
+        self.decrease = min(0.95, max(0.1, float(decrease)))
+        self.forget_seconds = max(0.0, float(forget_hours)) * 3600
+        self.limit = min(max(1, int(initial)), self.ceiling)
+        self.max_accepted = 0
+        self.min_rejected: Optional[int] = None
+        self.increases = 0
+        self.decreases = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            state = json.loads(self.path.read_text(encoding="utf-8")).get(self.key)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable embedding limits %s: %s", self.path, exc)
+            return
+        if not state:
+            return
+        self.limit = min(max(1, int(state.get("limit", self.limit))), self.ceiling)
+        if time.time() - float(state.get("updated", 0)) < self.forget_seconds:
+            self.max_accepted = int(state.get("max_accepted", 0))
+            self.min_rejected = state.get("min_rejected")
+
+    def _upper_bound(self) -> int:
+        bound = self.ceiling
+        if self.min_rejected is not None:
+            bound = min(bound, self.min_rejected - 1)
+        return max(1, bound)
+
+    def _grown(self) -> int:
+        target = self.limit + self.step
+        if self.min_rejected is not None:
+            # bisect towards the smallest rejected size instead of stepping into it
+            target = min(target, (self.limit + self.min_rejected) // 2)
+        return min(target, self._upper_bound())
+
+    def accepted(self, tokens: int) -> None:
+        with self._lock:
+            if self.min_rejected is not None and tokens >= self.min_rejected:
+                # the server now takes what it once refused; re-probe from here
+                self.min_rejected = None
+            self.max_accepted = max(self.max_accepted, tokens)
+            if tokens >= self.limit * _FULL_FRACTION:
+                grown = self._grown()
+                if grown > self.limit:
+                    self.limit = grown
+                    self.increases += 1
+
+    def rejected(self, tokens: int) -> None:
+        """Record a 413 for a multi-item batch of ``tokens``."""
+        with self._lock:
+            if self.max_accepted >= tokens:
+                # contradicts what was accepted before; the server limit changed
+                self.max_accepted = 0
+            self.min_rejected = tokens if self.min_rejected is None else min(self.min_rejected, tokens)
+            shrunk = int(min(self.limit, tokens) * self.decrease)
+            self.limit = max(1, shrunk, min(self.max_accepted, self._upper_bound()))
+            self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "max_accepted": self.max_accepted,
+                "min_rejected": self.min_rejected,
+                "increases": self.increases,
+                "decreases": self.decreases,
+            }
+
+    def save(self) -> None:
+        with self._lock:
+            state = {
+                "limit": self.limit,
+                "max_accepted": self.max_accepted,
+                "min_rejected": self.min_rejected,
+                "updated": time.time(),
+            }
+        with _STATE_LOCK:
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            data[self.key] = state
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+
+_STATE_LOCK = threading.Lock()
+_CONTROLLERS: Dict[Tuple[str, str, int], BatchLimitController] = {}
+_CONTROLLERS_LOCK = threading.Lock()
+
+
+def from_config(
+    embedding_cfg: Dict[str, Any],
+    *,
+    key: str,
+    max_batch_tokens: int,
+) -> Optional[BatchLimitController]:
+    """Process-wide controller for ``processing.embedding.adaptive_limits``, or ``None``.
+
+    ``key`` identifies the TEI origin, model and token-counting mode; the
+    configured ``max_batch_tokens`` is the starting point and, unless
+    ``ceiling_tokens`` is set, also the ceiling.
+    """
+    limits_cfg = (embedding_cfg or {}).get("adaptive_limits") or {}
+    if not limits_cfg.get("enabled", False):
+        return None
+    path = str(Path(limits_cfg.get("dir") or EMBED_LIMITS_DIR_DEFAULT) / _STATE_FILE)
+    ceiling = int(limits_cfg.get("ceiling_tokens") or max_batch_tokens)
+    with _CONTROLLERS_LOCK:
+        controller = _CONTROLLERS.get((path, key, ceiling))
+        if controller is None:
+            controller = _CONTROLLERS[(path, key, ceiling)] = BatchLimitController(
+                path,
+                key,
+                initial=max_batch_tokens,
+                ceiling=ceiling,
+                step_fraction=float(limits_cfg.get("step_fraction", 0.05)),
+                decrease=float(limits_cfg.get("decrease", 0.75)),
+                forget_hours=float(limits_cfg.get("forget_hours", 168)),
+            )
+    return controller
@@ -0,0 +1,186 @@
+"""Exact token counts for embedding inputs, from TEI's tokenizer or a local copy."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from briefing.utils import get_logger
+
+logger = get_logger(__name__)
+
+TEI_ORIGIN = os.getenv("TEI_ORIGIN", "http://tei:3000")
+TEI_MODEL_ID = os.getenv("TEI_MODEL_ID", "sentence-transformers/all-MiniLM-L6-v2")
+
+# TEI rejects requests with more inputs than --max-client-batch-size (32 unless overridden)
+_TEI_CLIENT_BATCH_DEFAULT = 32
+_TEI_TOKENIZE_CONCURRENCY = 4
+# proportional re-cut rounds; anything still oversize is left to the 413 trim path
+_TRUNCATE_ROUNDS = 4
+# a failed /info is retried by from_config, at most this often
+_INFO_RETRY_SECONDS = 60.0
+
+
+class EmbeddingTokenizer:
+    """Counts tokens (special tokens included) the way the embedding model does.
+
+    ``backend="tei"`` calls the server's ``/tokenize`` route and reads
+    ``max_input_length`` from ``/info``; ``backend="local"`` loads the model's
+    ``tokenizer.json`` with the ``tokenizers`` package. ``max_input_tokens`` caps
+    a single text (TEI answers 413 above it); ``requests`` counts tokenize round trips.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        *,
+        model_id: str = TEI_MODEL_ID,
+        origin: str = TEI_ORIGIN,
+        session: Optional[requests.Session] = None,
+        max_input_tokens: Optional[int] = None,
+    ) -> None:
+        if backend not in ("tei", "local"):
+            raise ValueError(f"Unsupported tokenizer backend: {backend}")
+        self.backend = backend
+        self.model_id = model_id
+        self.origin = origin.rstrip("/")
+        self.session = session or requests.Session()
+        self.max_input_tokens = max_input_tokens
+        self.requests = 0
+        self._client_batch = _TEI_CLIENT_BATCH_DEFAULT
+        self._info_loaded = False
+        self._info_retry_at = 0.0
+        self._lock = threading.Lock()
+        self._info_lock = threading.Lock()
+        self._local = None
+        if backend == "local":
+            from tokenizers import Tokenizer
+
+            self._local = Tokenizer.from_pretrained(model_id)
+            self._local.no_truncation()
+            self._local.no_padding()
+        else:
+            self._load_info()
+
+    def _load_info(self) -> None:
+        self._info_retry_at = time.monotonic() + _INFO_RETRY_SECONDS
+        try:
+            resp = self.session.get(f"{self.origin}/info", timeout=10)
+            resp.raise_for_status()
+            info = resp.json()
+        except (requests.exceptions.RequestException, ValueError) as exc:
+            logger.warning("TEI /info unavailable, using defaults: %s", exc)
+            return
+        self._info_loaded = True
+        if self.max_input_tokens is None and info.get("max_input_length"):
+            self.max_input_tokens = int(info["max_input_length"])
+        if info.get("max_client_batch_size"):
+            self._client_batch = max(1, int(info["max_client_batch_size"]))
+
+    def refresh_info(self) -> None:
+        """Retry a failed ``/info`` lookup, at most every ``_INFO_RETRY_SECONDS``."""
+        if self._local is not None or self._info_loaded:
+            return
+        with self._info_lock:
+            if not self._info_loaded and time.monotonic() >= self._info_retry_at:
+                self._load_info()
+
+    def _tokenize_chunk(self, chunk: List[str]) -> List[int]:
+        resp = self.session.post(
+            f"{self.origin}/tokenize",
+            json={"inputs": chunk, "add_special_tokens": True},
+            timeout=30,
+        )
+        resp.raise_for_status()
+        with self._lock:
+            self.requests += 1
+        return [len(tokens) for tokens in resp.json()]
+
+    def count(self, texts: Sequence[str]) -> List[int]:
+        """Token count of every text, in order."""
+        texts = list(texts)
+        if not texts:
+            return []
+        if self._local is not None:
+            return [len(enc.ids) for enc in self._local.encode_batch(texts, add_special_tokens=True)]
+        size = self._client_batch
+        chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+        if len(chunks) == 1:
+            return self._tokenize_chunk(chunks[0])
+        with ThreadPoolExecutor(max_workers=min(_TEI_TOKENIZE_CONCURRENCY, len(chunks))) as pool:
+            return [n for counts in pool.map(self._tokenize_chunk, chunks) for n in counts]
+
+    def truncate(self, texts: Sequence[str], counts: Sequence[int], max_tokens: int) -> Tuple[List[str], List[int]]:
+        """Cut every text above ``max_tokens`` until its exact count fits.
+
+        Each round shortens the oversize texts in proportion to their measured
+        token density and re-counts them together, so the cost is a few batched
+        count calls rather than one per text.
+        """
+        texts, counts = list(texts), list(counts)
+        max_tokens = max(1, max_tokens)
+        over = [i for i, n in enumerate(counts) if n > max_tokens]
+        for _ in range(_TRUNCATE_ROUNDS):
+            if not over:
+                break
+            for i in over:
+                keep = int(len(texts[i]) * max_tokens / counts[i] * 0.97)
+                texts[i] = texts[i][:max(1, min(keep, len(texts[i]) - 1))]
+            for i, n in zip(over, self.count([texts[i] for i in over])):
+                counts[i] = n
+            over = [i for i in over if counts[i] > max_tokens and len(texts[i]) > 1]
+        return texts, counts
+
+
+_TOKENIZERS: Dict[Tuple[str, str, str, Optional[int]], EmbeddingTokenizer] = {}
+_TOKENIZERS_LOCK = threading.Lock()
+
+
+def from_config(
+    embedding_cfg: Dict[str, Any],
+    *,
+    session: Optional[requests.Session] = None,
+) -> Optional[EmbeddingTokenizer]:
+    """Process-wide tokenizer for ``processing.embedding.tokenizer``, or ``None`` for the heuristic.
+
+    A tokenizer that cannot be loaded is logged and treated as ``None`` so
+    embedding falls back to ``chars_per_token`` estimates. A TEI tokenizer whose
+    ``/info`` failed keeps the defaults until a later call manages to load it.
+    """
+    tok_cfg = (embedding_cfg or {}).get("tokenizer") or {}
+    backend = tok_cfg.get("backend", "heuristic")
+    if backend == "heuristic":
+        return None
+    model_id = tok_cfg.get("model_id") or TEI_MODEL_ID
+    max_input_tokens = tok_cfg.get("max_input_tokens")
+    key = (backend, model_id, TEI_ORIGIN, max_input_tokens)
+    with _TOKENIZERS_LOCK:
+        tokenizer = _TOKENIZERS.get(key)
+        if tokenizer is None:
+            st = time.monotonic()
+            try:
+                tokenizer = EmbeddingTokenizer(
+                    backend,
+                    model_id=model_id,
+                    session=session,
+                    max_input_tokens=max_input_tokens,
+                )
+            except Exception as exc:  # noqa: BLE001 - fall back to the chars_per_token heuristic
+                logger.warning("embedding tokenizer unavailable backend=%s model=%s: %s", backend, model_id, exc)
+                return None
+            _TOKENIZERS[key] = tokenizer
+            logger.info(
+                "embedding tokenizer ready backend=%s model=%s max_input_tokens=%s load_ms=%d",
+                backend,
+                model_id,
+                tokenizer.max_input_tokens,
+                int((time.monotonic() - st) * 1000),
+            )
+            return tokenizer
+    tokenizer.refresh_info()
+    return tokenizer
@@ -0,0 +1,127 @@
+"""Persistent store of normalized Hacker News items for incremental fetches."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+HN_STORE_DIR_DEFAULT = os.getenv("HN_STORE_DIR", "/workspace/cache/hn")
+
+
+class HNItemStore:
+    """Cleaned HN items keyed by story id, with separate refresh clocks.
+
+    ``full_ttl_hours`` bounds how long a stored item (title, text, url) is trusted
+    before it is downloaded again in full; ``score_ttl_minutes`` bounds how stale
+    the mutable ``score`` may get before it is refreshed with a single-field
+    request. Items not seen in a top list for ``max_idle_days`` are pruned.
+
+    Ids the adapter dropped (not a story, invalid URL, empty text) are kept as
+    tombstones with ``item`` set to ``None`` and are not downloaded again until
+    ``full_ttl_hours`` passes.
+    """
+
+    def __init__(
+        self,
+        path,
+        *,
+        full_ttl_hours: float = 24.0,
+        score_ttl_minutes: float = 30.0,
+        max_idle_days: float = 7.0,
+    ) -> None:
+        self.path = Path(path)
+        self.full_ttl_seconds = max(0.0, float(full_ttl_hours)) * 3600
+        self.score_ttl_seconds = max(0.0, float(score_ttl_minutes)) * 60
+        self.max_idle_seconds = max(0.0, float(max_idle_days)) * 86400
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            "id INTEGER PRIMARY KEY, item TEXT NOT NULL, fetched REAL NOT NULL, "
+            "score_refreshed REAL NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, item_id: int) -> Optional[Dict[str, Any]]:
+        """Return ``{item, needs_score}`` for a trusted stored item, or ``None`` if it must be fetched.
+
+        ``item`` is ``None`` for a tombstone, which never needs a score refresh.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT item, fetched, score_refreshed FROM items WHERE id = ?", (item_id,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.full_ttl_seconds:
+                return None
+            self._conn.execute("UPDATE items SET last_seen = ? WHERE id = ?", (now, item_id))
+            self._conn.commit()
+        item = json.loads(row[0])
+        return {"item": item, "needs_score": item is not None and now - row[2] >= self.score_ttl_seconds}
+
+    def put(self, item_id: int, item: Optional[Dict[str, Any]]) -> None:
+        """Store a normalized item, or a tombstone when ``item`` is ``None``."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO items (id, item, fetched, score_refreshed, last_seen) VALUES (?, ?, ?, ?, ?)",
+                (item_id, json.dumps(item, ensure_ascii=False), now, now, now),
+            )
+            self._conn.commit()
+
+    def update_score(self, item_id: int, item: Dict[str, Any], score: Any) -> None:
+        item.setdefault("metadata", {})["score"] = score
+        with self._lock:
+            self._conn.execute(
+                "UPDATE items SET item = ?, score_refreshed = ? WHERE id = ?",
+                (json.dumps(item, ensure_ascii=False), time.time(), item_id),
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        """Drop items idle for longer than ``max_idle_days``; return how many were removed."""
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM items WHERE last_seen < ?", (time.time() - self.max_idle_seconds,)
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+
+_STORES: Dict[Tuple[str, float, float, float], HNItemStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def from_config(store_cfg: Optional[Dict[str, Any]]) -> Optional[HNItemStore]:
+    """Return the process-wide store for a ``source.hn_store`` block, or ``None``.
+
+    Stores are shared per file and TTL settings, so configs with different
+    TTLs over the same directory each get their own refresh clocks.
+    """
+    store_cfg = store_cfg or {}
+    if not store_cfg.get("enabled", False):
+        return None
+    key = (
+        str(Path(store_cfg.get("dir") or HN_STORE_DIR_DEFAULT) / "items.sqlite3"),
+        float(store_cfg.get("full_ttl_hours", 24)),
+        float(store_cfg.get("score_ttl_minutes", 30)),
+        float(store_cfg.get("max_idle_days", 7)),
+    )
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            path, full_ttl_hours, score_ttl_minutes, max_idle_days = key
+            store = _STORES[key] = HNItemStore(
+                path,
+                full_ttl_hours=full_ttl_hours,
+                score_ttl_minutes=score_ttl_minutes,
+                max_idle_days=max_idle_days,
+            )
+    return store
@@ -0,0 +1,154 @@
+"""Content-addressed on-disk cache for structured LLM responses."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from briefing import run_stats
+
+LLM_CACHE_DIR_DEFAULT = os.getenv("LLM_CACHE_DIR", "/workspace/cache/llm")
+
+
+def _env_bypass() -> bool:
+    return os.getenv("LLM_CACHE_BYPASS", "false").lower() in ("1", "true", "yes")
+
+
+def cache_key(
+    provider: str,
+    model: str,
+    temperature: float,
+    schema: dict,
+    prompt: str,
+    options: Optional[dict] = None,
+) -> str:
+    """Hash everything that determines a structured response.
+
+    ``options`` are the provider options (e.g. ``base_url``), so the same model
+    name served by different endpoints never shares entries.
+    """
+    fields: Dict[str, Any] = {
+        "provider": provider.lower(),
+        "model": model,
+        "temperature": float(temperature),
+        "schema": schema,
+        "prompt": prompt,
+        "options": options or {},
+    }
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed response store with TTL expiry and LRU size bound.
+
+    ``bypass`` skips lookups but still records fresh responses, which is how a
+    forced re-run refreshes stale entries; :meth:`get` can override it per call.
+    The database runs in WAL mode so parallel processes can share the file.
+    """
+
+    def __init__(self, path, *, ttl_hours: float = 168.0, max_entries: int = 5000, bypass: bool = False):
+        self.path = Path(path)
+        self.ttl_seconds = max(0.0, float(ttl_hours)) * 3600
+        self.max_entries = max(1, int(max_entries))
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, *, bypass: Optional[bool] = None) -> Optional[dict]:
+        if self.bypass if bypass is None else bypass:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                run_stats.record("llm_cache.misses")
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        run_stats.record("llm_cache.hits")
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_used ASC, rowid ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
+
+_CACHES: Dict[Tuple[str, float, int], ResponseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def bypass_from_config(cache_cfg: Optional[Dict[str, Any]]) -> bool:
+    """Whether a ``response_cache`` block (or ``LLM_CACHE_BYPASS``) asks to skip lookups."""
+    return bool((cache_cfg or {}).get("bypass", False)) or _env_bypass()
+
+
+def from_config(cache_cfg: Optional[Dict[str, Any]]) -> Optional[ResponseCache]:
+    """Return the process-wide cache for a ``response_cache`` config block, or ``None``.
+
+    Instances are shared per file and TTL/size settings. ``bypass`` is not part
+    of the instance: callers pass :func:`bypass_from_config` to each lookup, so
+    one config forcing a refresh does not affect others running in the process.
+    """
+    cache_cfg = cache_cfg or {}
+    if not cache_cfg.get("enabled", False):
+        return None
+    path = str(Path(cache_cfg.get("dir") or LLM_CACHE_DIR_DEFAULT) / "responses.sqlite3")
+    ttl_hours = float(cache_cfg.get("ttl_hours", 168))
+    max_entries = int(cache_cfg.get("max_entries", 5000))
+    with _CACHES_LOCK:
+        cache = _CACHES.get((path, ttl_hours, max_entries))
+        if cache is None:
+            cache = _CACHES[(path, ttl_hours, max_entries)] = ResponseCache(
+                path, ttl_hours=ttl_hours, max_entries=max_entries
+            )
+    return cache
+
+
+def response_cache_stats() -> Dict[str, float]:
+    """Aggregate hit/miss counters over every cache opened in this process."""
+    with _CACHES_LOCK:
+        hits = sum(c.hits for c in _CACHES.values())
+        misses = sum(c.misses for c in _CACHES.values())
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": (hits / total) if total else 0.0}
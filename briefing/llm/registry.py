@@ -4,7 +4,44 @@
 import os
 import json
 import time
-from .schema_adapter import to_gemini, to_openai
+import threading
+from typing import Any, Callable, Dict, Tuple
+from .cache import ResponseCache, cache_key
+from briefing import run_stats
+from briefing.schema_registry import provider_schema
+
+# Clients keep their HTTP connection pools alive, so they are shared across calls,
+# threads and stages instead of being rebuilt for every structured call.
+_CLIENTS: Dict[Tuple[str, ...], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+_CLIENT_STATS = {"created": 0, "reused": 0}
+
+def _options_key(options: dict = None) -> str:
+    return json.dumps(options or {}, sort_keys=True, default=str)
+
+def _pooled_client(key: Tuple[str, ...], factory: Callable[[], Any]) -> Any:
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = factory()
+            _CLIENTS[key] = client
+            _CLIENT_STATS["created"] += 1
+            run_stats.record("llm_clients.created")
+        else:
+            _CLIENT_STATS["reused"] += 1
+            run_stats.record("llm_clients.reused")
+        return client
+
+def client_pool_stats() -> Dict[str, int]:
+    """Return how many LLM clients were created vs. reused in this process."""
+    with _CLIENTS_LOCK:
+        return {**_CLIENT_STATS, "pooled": len(_CLIENTS)}
+
+def reset_client_pool() -> None:
+    """Drop pooled clients (e.g. after rotating API keys) and reset counters."""
+    with _CLIENTS_LOCK:
+        _CLIENTS.clear()
+        _CLIENT_STATS.update(created=0, reused=0)
 
 def call_openai(prompt: str, model: str, temperature: float, 
                 timeout: int, retries: int, schema: dict, 
@@ -18,14 +55,17 @@ def call_openai(prompt: str, model: str, temperature: float,
     
     options = options or {}
     base_url = options.get("base_url")
-    client = OpenAI(api_key=api_key, base_url=base_url) if base_url else OpenAI(api_key=api_key)
+    client = _pooled_client(
+        ("openai", api_key, base_url or "", _options_key(options)),
+        lambda: OpenAI(api_key=api_key, base_url=base_url) if base_url else OpenAI(api_key=api_key),
+    )
     
     response_format = {
         "type": "json_schema",
         "json_schema": {
             "name": schema.get("title", "Response"),
             "strict": True,
-            "schema": to_openai(schema)
+            "schema": provider_schema("openai", schema)
         }
     }
     
@@ -53,10 +93,13 @@ def call_gemini(prompt: str, model: str, temperature: float,
     if not api_key:
         raise RuntimeError("GOOGLE_API_KEY or GEMINI_API_KEY required")
     
-    client = genai.Client(api_key=api_key)
+    client = _pooled_client(
+        ("gemini", api_key, "", _options_key(options)),
+        lambda: genai.Client(api_key=api_key),
+    )
     config = {
         "response_mime_type": "application/json",
-        "response_schema": to_gemini(schema),
+        "response_schema": provider_schema("gemini", schema),
         "temperature": temperature
     }
     
@@ -75,17 +118,35 @@ def call_gemini(prompt: str, model: str, temperature: float,
 
 def call_with_schema(provider: str, prompt: str, model: str, schema: dict,
                     temperature: float = 0.2, timeout: int = 600, 
-                    retries: int = 0, options: dict = None) -> dict:
-    """Unified structured output interface."""
+                    retries: int = 0, options: dict = None,
+                    cache: ResponseCache = None, cache_bypass: bool = None) -> dict:
+    """Unified structured output interface.
+
+    When ``cache`` is given, identical (provider, model, temperature, schema, prompt,
+    options) requests are answered from it and fresh responses are written back.
+    ``cache_bypass`` skips the lookup for this call only (default: the cache's own setting).
+    """
     provider = provider.lower()
     
     if provider == "openai":
-        return call_openai(prompt, model, temperature, timeout, retries, schema, options)
+        call = call_openai
     elif provider == "gemini":
-        return call_gemini(prompt, model, temperature, timeout, retries, schema, options)
+        call = call_gemini
     else:
         raise ValueError(f"Unknown provider: {provider}")
 
+    key = None
+    if cache is not None:
+        key = cache_key(provider, model, temperature, schema, prompt, options)
+        cached = cache.get(key, bypass=cache_bypass)
+        if cached is not None:
+            return cached
+
+    result = call(prompt, model, temperature, timeout, retries, schema, options)
+    if key is not None:
+        cache.put(key, result)
+    return result
+
 # Keep legacy interface for backward compatibility with non-structured calls
 def call_with_options(provider: str, prompt: str, model: str, temperature: float = 0.2, timeout: int = 600, retries: int = 0, options: dict = None) -> str:
     """Legacy interface - use call_with_schema for structured outputs."""
@@ -1,5 +1,6 @@
 """Networking utilities for resilient HTTP access."""
 
-from .http import retry_session
+from .cache import HttpCache, http_cache_stats
+from .http import CachingSession, cached_session, retry_session
 
-__all__ = ["retry_session"]
+__all__ = ["CachingSession", "HttpCache", "cached_session", "http_cache_stats", "retry_session"]
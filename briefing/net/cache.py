@@ -0,0 +1,187 @@
+"""On-disk HTTP response cache with RFC 7234 freshness and revalidation."""
+
+from __future__ import annotations
+
+import email.utils
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from briefing import run_stats
+
+HTTP_CACHE_DIR_DEFAULT = os.getenv("HTTP_CACHE_DIR", "/workspace/cache/http")
+
+# Heuristic freshness for responses with only Last-Modified (RFC 7234 §4.2.2)
+_HEURISTIC_FRACTION = 0.1
+_HEURISTIC_MAX_SECONDS = 24 * 3600
+
+_MAX_AGE_RE = re.compile(r"(?:^|,)\s*max-age\s*=\s*\"?(\d+)\"?", re.IGNORECASE)
+
+
+def _cache_control(headers: Dict[str, str]) -> str:
+    return (headers.get("cache-control") or "").lower()
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers: Dict[str, str]) -> float:
+    """Seconds a response stays fresh, from max-age, Expires or Last-Modified."""
+    cc = _cache_control(headers)
+    if "no-cache" in cc:
+        return 0.0
+    m = _MAX_AGE_RE.search(cc)
+    if m:
+        return float(m.group(1))
+    date = _http_date(headers.get("date")) or time.time()
+    expires = headers.get("expires")
+    if expires is not None:
+        ts = _http_date(expires)
+        return max(0.0, ts - date) if ts is not None else 0.0
+    last_modified = _http_date(headers.get("last-modified"))
+    if last_modified is not None:
+        return min(_HEURISTIC_MAX_SECONDS, max(0.0, (date - last_modified) * _HEURISTIC_FRACTION))
+    return 0.0
+
+
+def is_storable(status_code: int, headers: Dict[str, str]) -> bool:
+    """Whether a GET response may be kept: 200, no ``no-store``, and reusable later."""
+    if status_code != 200:
+        return False
+    cc = _cache_control(headers)
+    if "no-store" in cc:
+        return False
+    vary = {v.strip().lower() for v in (headers.get("vary") or "").split(",") if v.strip()}
+    if vary - {"accept-encoding"}:
+        return False
+    has_validator = bool(headers.get("etag") or headers.get("last-modified"))
+    return has_validator or freshness_lifetime(headers) > 0
+
+
+class HttpCache:
+    """SQLite store of GET responses keyed by URL, bounded by LRU entry count.
+
+    Counters: ``hits`` (served locally), ``revalidated`` (304),
+    ``misses`` (full download) and ``bytes_saved`` (body bytes not transferred).
+    """
+
+    def __init__(self, path, *, max_entries: int = 20000):
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, headers TEXT NOT NULL, body BLOB NOT NULL, "
+            "stored REAL NOT NULL, age REAL NOT NULL, lifetime REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def lookup(self, url: str, *, min_fresh_seconds: float = 0.0) -> Optional[Dict[str, Any]]:
+        """Return ``{headers, body, fresh}`` for a stored response, or ``None``.
+
+        ``min_fresh_seconds`` treats the response as fresh for at least that long,
+        for upstreams that omit caching headers on effectively immutable resources.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body, stored, age, lifetime FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+        headers, body, stored, age, lifetime = row
+        current_age = age + max(0.0, now - stored)
+        return {
+            "headers": json.loads(headers),
+            "body": bytes(body),
+            "fresh": current_age < max(lifetime, min_fresh_seconds),
+        }
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes) -> None:
+        now = time.time()
+        try:
+            age = float(headers.get("age") or 0)
+        except ValueError:
+            age = 0.0
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, headers, body, stored, age, lifetime, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, json.dumps(headers), sqlite3.Binary(body), now, age, freshness_lifetime(headers), now),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM responses WHERE url IN "
+                    "(SELECT url FROM responses ORDER BY last_used ASC, rowid ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+            self._conn.commit()
+
+    def record(self, event: str, saved_bytes: int = 0) -> None:
+        with self._lock:
+            setattr(self, event, getattr(self, event) + 1)
+            self.bytes_saved += saved_bytes
+        run_stats.record(f"http_cache.{event}")
+        run_stats.record("http_cache.bytes_saved", saved_bytes)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.hits + self.revalidated + self.misses
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "bytes_saved": self.bytes_saved,
+                "hit_rate": ((self.hits + self.revalidated) / total) if total else 0.0,
+            }
+
+
+_CACHES: Dict[str, HttpCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def from_config(cache_cfg: Optional[Dict[str, Any]]) -> Optional[HttpCache]:
+    """Return the process-wide cache for a ``source.http_cache`` block, or ``None``."""
+    cache_cfg = cache_cfg or {}
+    if not cache_cfg.get("enabled", False):
+        return None
+    path = str(Path(cache_cfg.get("dir") or HTTP_CACHE_DIR_DEFAULT) / "responses.sqlite3")
+    with _CACHES_LOCK:
+        cache = _CACHES.get(path)
+        if cache is None:
+            cache = _CACHES[path] = HttpCache(path, max_entries=int(cache_cfg.get("max_entries", 20000)))
+    return cache
+
+
+def http_cache_stats() -> Dict[str, float]:
+    """Aggregate counters over every HTTP cache opened in this process."""
+    totals = {"hits": 0, "revalidated": 0, "misses": 0, "bytes_saved": 0}
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    for cache in caches:
+        for key, value in cache.stats().items():
+            if key in totals:
+                totals[key] += value
+    total = totals["hits"] + totals["revalidated"] + totals["misses"]
+    totals["hit_rate"] = ((totals["hits"] + totals["revalidated"]) / total) if total else 0.0
+    return totals
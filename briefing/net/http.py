@@ -1,22 +1,32 @@
-"""HTTP helpers providing resilient sessions with retries."""
+"""HTTP helpers providing resilient sessions with retries and response caching."""
 
 from __future__ import annotations
 
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
 import requests
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from urllib3.util.retry import Retry
 
+from .cache import HttpCache, from_config as cache_from_config, is_storable
+
 
 def retry_session(
     total: int = 3,
     backoff: float = 0.5,
     status_forcelist: tuple[int, ...] = (429, 500, 502, 503, 504),
     allowed_methods: frozenset[str] | None = None,
+    pool_maxsize: int = 10,
 ) -> requests.Session:
     """Create a requests session with retry configuration.
 
     Follows guidance from urllib3's Retry docs and Telegram/GitHub API rate-limit
-    recommendations by retrying on transient 429/5xx responses.
+    recommendations by retrying on transient 429/5xx responses. ``pool_maxsize``
+    should be at least the number of threads sharing the session so concurrent
+    requests to the same host reuse pooled connections instead of discarding them.
     """
 
     methods = allowed_methods or frozenset({"GET", "POST", "PUT"})
@@ -31,7 +41,125 @@ def retry_session(
         respect_retry_after_header=True,
         raise_on_status=False,
     )
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=max(1, pool_maxsize))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SHARED_POOL_MAXSIZE = 64
+# (retry total, pool_maxsize) -> adapter reused by every session asking for those settings
+_SHARED_ADAPTERS: Dict[Tuple[int, int], HTTPAdapter] = {}
+_SHARED_LOCK = threading.Lock()
+
+# Headers a 304 may carry that update the stored response (RFC 7234 §4.3.4)
+_REVALIDATION_HEADERS = ("cache-control", "date", "etag", "expires", "last-modified", "age")
+
+
+def _shared_adapter(total: int = 3, pool_maxsize: int = _SHARED_POOL_MAXSIZE) -> HTTPAdapter:
+    key = (int(total), max(1, int(pool_maxsize)))
+    with _SHARED_LOCK:
+        adapter = _SHARED_ADAPTERS.get(key)
+        if adapter is None:
+            adapter = _SHARED_ADAPTERS[key] = retry_session(total=key[0], pool_maxsize=key[1]).get_adapter("https://")
+        return adapter
+
+
+def _cached_response(url: str, entry: dict) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.url = url
+    resp._content = entry["body"]
+    resp.headers = CaseInsensitiveDict(entry["headers"])
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    resp.from_cache = True
+    return resp
+
+
+class CachingSession(requests.Session):
+    """Session that answers GETs from an :class:`HttpCache` and revalidates stale entries.
+
+    Fresh entries are returned without touching the network; stale ones are
+    revalidated with ``If-None-Match``/``If-Modified-Since`` and a 304 is turned
+    back into the stored 200 response. Responses carry ``from_cache`` when they
+    were served (fully or via 304) from the store.
+
+    ``min_fresh_seconds`` only applies to URLs accepted by ``min_fresh_for``
+    (none when it is ``None``), so listings and feeds keep their real freshness.
+    Those URLs are stored on any 200 response, even without validators or with
+    ``no-cache``, since the caller vouches that they are effectively immutable.
+    """
+
+    def __init__(
+        self,
+        cache: HttpCache | None = None,
+        *,
+        min_fresh_seconds: float = 0.0,
+        min_fresh_for: Optional[Callable[[str], bool]] = None,
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.min_fresh_seconds = max(0.0, float(min_fresh_seconds))
+        self.min_fresh_for = min_fresh_for
+
+    def request(self, method, url, *args, **kwargs):  # type: ignore[override]
+        if self.cache is None or method.upper() != "GET" or args or kwargs.get("params") or kwargs.get("stream"):
+            return super().request(method, url, *args, **kwargs)
+
+        min_fresh = self.min_fresh_seconds if self.min_fresh_for is not None and self.min_fresh_for(url) else 0.0
+        entry = self.cache.lookup(url, min_fresh_seconds=min_fresh)
+        if entry is not None and entry["fresh"]:
+            self.cache.record("hits", len(entry["body"]))
+            return _cached_response(url, entry)
+
+        if entry is not None:
+            headers = dict(kwargs.pop("headers", None) or {})
+            if entry["headers"].get("etag"):
+                headers["If-None-Match"] = entry["headers"]["etag"]
+            if entry["headers"].get("last-modified"):
+                headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+            kwargs["headers"] = headers
+
+        resp = super().request(method, url, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            merged = dict(entry["headers"])
+            merged.update({k.lower(): v for k, v in resp.headers.items() if k.lower() in _REVALIDATION_HEADERS})
+            self.cache.store(url, merged, entry["body"])
+            self.cache.record("revalidated", len(entry["body"]))
+            return _cached_response(url, {"headers": merged, "body": entry["body"]})
+
+        self.cache.record("misses")
+        headers = {k.lower(): v for k, v in resp.headers.items()}
+        if is_storable(resp.status_code, headers) or (min_fresh and resp.status_code == 200):
+            self.cache.store(url, headers, resp.content)
+        resp.from_cache = False
+        return resp
+
+
+def cached_session(
+    cache_cfg: Optional[Dict[str, Any]] = None,
+    *,
+    total: int = 3,
+    pool_maxsize: int = _SHARED_POOL_MAXSIZE,
+    min_fresh_for: Optional[Callable[[str], bool]] = None,
+) -> CachingSession:
+    """Session over a process-wide connection pool, with the cache from ``cache_cfg``.
+
+    Sessions asking for the same ``total`` retries and ``pool_maxsize`` (as in
+    :func:`retry_session`) mount the same :class:`HTTPAdapter`, so connections
+    stay pooled across adapters and across runs of a long-lived process.
+    ``cache_cfg`` is a ``source.http_cache`` block; when it is absent or disabled
+    the session simply does not cache. Its ``min_fresh_seconds`` is applied to
+    the URLs ``min_fresh_for`` accepts.
+    """
+
+    session = CachingSession(
+        cache_from_config(cache_cfg),
+        min_fresh_seconds=float((cache_cfg or {}).get("min_fresh_seconds", 0)),
+        min_fresh_for=min_fresh_for,
+    )
+    adapter = _shared_adapter(total, pool_maxsize)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     return session
@@ -5,12 +5,17 @@ import time
 import yaml
 import uuid
 import json
+import signal
+import threading
 import requests
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 from briefing.sources import twitter_list_adapter, rss_adapter, reddit_adapter, hackernews_adapter
-from briefing.pipeline import run_processing_pipeline
+from briefing.pipeline import run_processing_pipeline, run_streaming_pipeline, warm_rerankers
+from briefing import run_stats
+from briefing.seen_index import from_config as seen_index_from_config
+from briefing.scheduler import BriefingScheduler, schedule_briefing
 from briefing.summarizer import generate_summary
 from briefing.pipeline_multistep import compute_metrics, run_multistage_pipeline
 from briefing.publisher import maybe_publish_telegram, maybe_briefing_archive
@@ -44,6 +49,34 @@ def _fetch_items(source_cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
     else:
         raise ValueError(f"Unknown source type: {t}")
 
+def _iter_item_batches(source_cfg: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield items from the configured source in batches as they arrive."""
+    t = source_cfg["type"]
+    if t == "rss":
+        return rss_adapter.iter_batches(source_cfg)
+    elif t == "reddit":
+        return reddit_adapter.iter_batches(source_cfg)
+    elif t == "hackernews":
+        return hackernews_adapter.iter_batches(source_cfg)
+    # adapters without incremental delivery arrive as one batch
+    return iter([_fetch_items(source_cfg)])
+
+
+def _log_http_cache() -> None:
+    """Log the HTTP cache activity of the current run (see :func:`run_stats.collect`)."""
+    stats = run_stats.current()
+    if stats is None:
+        return
+    delta = {k: stats.get(f"http_cache.{k}") for k in ("hits", "revalidated", "misses", "bytes_saved")}
+    total = delta["hits"] + delta["revalidated"] + delta["misses"]
+    if total:
+        logger.info(
+            "http cache hits=%d revalidated=%d misses=%d hit_rate=%.2f bytes_saved=%d",
+            delta["hits"], delta["revalidated"], delta["misses"],
+            (delta["hits"] + delta["revalidated"]) / total, delta["bytes_saved"],
+        )
+
+
 def _apply_overrides(cfg: Dict[str, Any], overrides: Optional[Dict[str, Optional[bool]]]) -> None:
     if not overrides:
         return
@@ -55,6 +88,8 @@ def _apply_overrides(cfg: Dict[str, Any], overrides: Optional[Dict[str, Optional
         processing["agentic_section"] = overrides["agentic_section"]
     if overrides.get("brief_lite") is not None:
         processing["brief_lite"] = overrides["brief_lite"]
+    if overrides.get("resume") is not None:
+        cfg.setdefault("multistage", {})["resume"] = overrides["resume"]
 
 
 def _execute_pipeline(cfg: Dict[str, Any], run_id: str, overrides: Optional[Dict[str, Optional[bool]]] = None) -> None:
@@ -67,13 +102,38 @@ def _execute_pipeline(cfg: Dict[str, Any], run_id: str, overrides: Optional[Dict
 
     _wait_infra(source_type)
 
-    t0 = time.monotonic()
-    raw_items = _fetch_items(cfg["source"])
-    logger.info("fetched items=%d took_ms=%d", len(raw_items), int((time.monotonic()-t0)*1000))
+    if cfg["processing"].get("reranker_warmup"):
+        # Load the reranker while the source fetch is in flight
+        warm_rerankers([cfg["processing"]["reranker_model"]], background=True)
+
+    seen_index = seen_index_from_config(briefing_id, cfg["processing"])
+    if (cfg["processing"].get("streaming") or {}).get("enabled"):
+        t0 = time.monotonic()
+        timings: Dict[str, float] = {}
+        bundles = run_streaming_pipeline(
+            _iter_item_batches(cfg["source"]),
+            cfg["processing"],
+            seen_index=seen_index,
+            timings=timings,
+        )
+        logger.info(
+            "fetched+processed bundles=%d took_ms=%d fetch_ms=%d embed_ms=%d overlap_ms=%d",
+            len(bundles),
+            int((time.monotonic()-t0)*1000),
+            timings.get("fetch_ms", 0),
+            timings.get("embed_ms", 0),
+            timings.get("overlap_ms", 0),
+        )
+        _log_http_cache()
+    else:
+        t0 = time.monotonic()
+        raw_items = _fetch_items(cfg["source"])
+        logger.info("fetched items=%d took_ms=%d", len(raw_items), int((time.monotonic()-t0)*1000))
+        _log_http_cache()
 
-    t1 = time.monotonic()
-    bundles = run_processing_pipeline(raw_items, cfg["processing"])
-    logger.info("processed bundles=%d took_ms=%d", len(bundles), int((time.monotonic()-t1)*1000))
+        t1 = time.monotonic()
+        bundles = run_processing_pipeline(raw_items, cfg["processing"], seen_index=seen_index)
+        logger.info("processed bundles=%d took_ms=%d", len(bundles), int((time.monotonic()-t1)*1000))
 
     use_multi_stage = bool(cfg.get("processing", {}).get("multi_stage"))
 
@@ -113,6 +173,9 @@ def _execute_pipeline(cfg: Dict[str, Any], run_id: str, overrides: Optional[Dict
     generated_files = write_output(md, js, cfg["output"])
     logger.info("output written dir=%s", out_dir)
 
+    if seen_index is not None:
+        seen_index.commit(run_id)
+
     try:
         maybe_publish_telegram(md, cfg["output"])
     except Exception as e:
@@ -125,43 +188,11 @@ def _execute_pipeline(cfg: Dict[str, Any], run_id: str, overrides: Optional[Dict
 
     logger.info("OK: briefing generated and published.")
 
-def main():
-    """Main entry point for CLI usage."""
-    parser = argparse.ArgumentParser(description="Run a briefing generation task.")
-    parser.add_argument('--config', type=str, required=True, help="Path to the briefing config YAML file.")
-    parser.add_argument('--multi-stage', dest='multi_stage', action='store_true', help="Enable multi-stage LLM pipeline")
-    parser.add_argument('--single-stage', dest='multi_stage', action='store_false', help="Use legacy single-stage summarizer")
-    parser.add_argument('--agentic-section', dest='agentic_section', action='store_true', help="Force Agentic Focus section")
-    parser.add_argument('--no-agentic-section', dest='agentic_section', action='store_false', help="Disable Agentic Focus section")
-    parser.add_argument('--brief-lite', dest='brief_lite', action='store_true', help="Emit condensed brief if available")
-    parser.add_argument('--no-brief-lite', dest='brief_lite', action='store_false', help="Skip condensed brief")
-    parser.set_defaults(multi_stage=None, agentic_section=None, brief_lite=None)
-    args = parser.parse_args()
-
-    run_id = uuid.uuid4().hex[:8]
-    logger.info("=== run start id=%s ===", run_id)
-
-    try:
-        with open(args.config, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
-        validate_config(cfg)
-        overrides = {
-            "multi_stage": args.multi_stage,
-            "agentic_section": args.agentic_section,
-            "brief_lite": args.brief_lite,
-        }
-        _execute_pipeline(cfg, run_id, overrides)
-        
-    except Exception as e:
-        logger.error("Pipeline execution failed: %s", e)
-        raise
-    finally:
-        logger.info("=== run end id=%s ===", run_id)
-
-if __name__ == "__main__":
-    main()
-
-
+def _load_config(config_path) -> Dict[str, Any]:
+    with open(config_path, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+    validate_config(cfg)
+    return cfg
 
 def run_once(
     config_path: str,
@@ -169,24 +200,104 @@ def run_once(
     multi_stage: Optional[bool] = None,
     agentic_section: Optional[bool] = None,
     brief_lite: Optional[bool] = None,
+    resume: Optional[bool] = None,
 ) -> None:
     """Execute pipeline once with given config file path."""
     run_id = uuid.uuid4().hex[:8]
     logger.info("=== run start id=%s ===", run_id)
     
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
-        validate_config(cfg)
+        cfg = _load_config(config_path)
         overrides = {
             "multi_stage": multi_stage,
             "agentic_section": agentic_section,
             "brief_lite": brief_lite,
+            "resume": resume,
         }
-        _execute_pipeline(cfg, run_id, overrides)
+        with run_stats.collect():
+            _execute_pipeline(cfg, run_id, overrides)
         
     except Exception as e:
         logger.error("Pipeline execution failed: %s", e)
         raise
     finally:
         logger.info("=== run end id=%s ===", run_id)
+
+def run_daemon(
+    config_dir: str,
+    *,
+    max_parallel: int = 2,
+    stop: Optional[threading.Event] = None,
+    **overrides: Optional[bool],
+) -> None:
+    """Run every config in ``config_dir`` that declares a ``schedule``, in this process.
+
+    Configs are re-read and validated before every run, so edits apply without a
+    restart; adding or removing a schedule does need one. Files starting with
+    ``_`` (templates) are ignored.
+    """
+    briefings = []
+    models = set()
+    for path in sorted(Path(config_dir).glob("*.y*ml")):
+        if path.name.startswith("_"):
+            continue
+        try:
+            cfg = _load_config(path)
+        except Exception as e:
+            logger.error("daemon: skip invalid config %s: %s", path.name, e)
+            continue
+        if not cfg.get("schedule"):
+            logger.info("daemon: %s has no schedule, skipped", path.name)
+            continue
+        briefings.append(schedule_briefing(path, cfg["schedule"]))
+        models.add(cfg["processing"]["reranker_model"])
+
+    if not briefings:
+        raise ValueError(f"No scheduled briefing configs found in {config_dir}")
+
+    # Loaded once here and shared by every run in this process
+    warm_rerankers(sorted(models), background=True)
+
+    scheduler = BriefingScheduler(
+        briefings,
+        runner=lambda path: run_once(str(path), **overrides),
+        max_parallel=max_parallel,
+    )
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: stop.set())
+    scheduler.run_forever(stop)
+
+def main():
+    """Main entry point for CLI usage."""
+    parser = argparse.ArgumentParser(description="Run a briefing generation task.")
+    parser.add_argument('--config', type=str, help="Path to the briefing config YAML file.")
+    parser.add_argument('--daemon', action='store_true', help="Stay resident and run every scheduled config in --config-dir")
+    parser.add_argument('--config-dir', type=str, default="configs", help="Directory scanned for scheduled configs in daemon mode")
+    parser.add_argument('--max-parallel', type=int, default=2, help="Maximum briefings running at once in daemon mode")
+    parser.add_argument('--multi-stage', dest='multi_stage', action='store_true', help="Enable multi-stage LLM pipeline")
+    parser.add_argument('--single-stage', dest='multi_stage', action='store_false', help="Use legacy single-stage summarizer")
+    parser.add_argument('--agentic-section', dest='agentic_section', action='store_true', help="Force Agentic Focus section")
+    parser.add_argument('--no-agentic-section', dest='agentic_section', action='store_false', help="Disable Agentic Focus section")
+    parser.add_argument('--brief-lite', dest='brief_lite', action='store_true', help="Emit condensed brief if available")
+    parser.add_argument('--no-brief-lite', dest='brief_lite', action='store_false', help="Skip condensed brief")
+    parser.add_argument('--resume', dest='resume', action='store_true', help="Reuse multi-stage artifacts whose inputs are unchanged")
+    parser.set_defaults(multi_stage=None, agentic_section=None, brief_lite=None, resume=None)
+    args = parser.parse_args()
+
+    overrides = {
+        "multi_stage": args.multi_stage,
+        "agentic_section": args.agentic_section,
+        "brief_lite": args.brief_lite,
+        "resume": args.resume,
+    }
+    if args.daemon:
+        run_daemon(args.config_dir, max_parallel=args.max_parallel, **overrides)
+    elif args.config:
+        run_once(args.config, **overrides)
+    else:
+        parser.error("--config is required unless --daemon is given")
+
+if __name__ == "__main__":
+    main()
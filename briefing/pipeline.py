@@ -1,19 +1,34 @@
 
 import os
+import re
+import base64
 import time
 import json
 import math
+import threading
 import datetime as dt
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 import fasttext
-from typing import List, Dict, Any, Tuple, Optional
+from typing import Iterable, List, Dict, Any, Tuple, Optional
 from sklearn.metrics.pairwise import cosine_similarity
 import hdbscan
 from sentence_transformers import CrossEncoder
 
+try:
+    import orjson
+except ImportError:  # optional: only speeds up parsing float-list responses
+    orjson = None
+
 from briefing.utils import now_utc, get_logger, parse_datetime_safe
+from briefing.embedding_cache import EmbeddingCache, from_config as embedding_cache_from_config
+from briefing.embedding_tokenizer import TEI_MODEL_ID, EmbeddingTokenizer, from_config as embedding_tokenizer_from_config
+from briefing.embedding_limits import BatchLimitController, from_config as embedding_limits_from_config
+from briefing.ann import RandomProjectionLSH, greedy_keep_from_pairs, normalize_rows
+from briefing.seen_index import SeenItemsIndex
 
 TEI_ORIGIN = os.getenv("TEI_ORIGIN", "http://tei:3000")
 LID_MODEL_PATH = os.getenv("LID_MODEL_PATH", "/workspace/lid.176.bin")
@@ -45,78 +60,210 @@ def _parse_env_float(name: str, default: float) -> float:
 EMBED_MAX_BATCH_TOKENS_DEFAULT = max(1, _parse_env_int("EMBED_MAX_BATCH_TOKENS", 8192))
 EMBED_MAX_ITEM_CHARS_DEFAULT = max(0, _parse_env_int("EMBED_MAX_ITEM_CHARS", 6000))
 EMBED_CHARS_PER_TOKEN_DEFAULT = max(0.1, _parse_env_float("EMBED_CHAR_PER_TOKEN", 4.0))
+RERANK_BATCH_SIZE_DEFAULT = max(1, _parse_env_int("RERANK_BATCH_SIZE", 64))
+EMBED_CONCURRENCY_DEFAULT = max(1, _parse_env_int("EMBED_CONCURRENCY", 4))
+EMBED_ENCODING_DEFAULT = os.getenv("EMBED_ENCODING", "base64")
+TEI_POOL_MAXSIZE = 64
 
-def _normalize_text_encoding(text: str) -> str:
-    """Normalize text encoding to ensure valid UTF-8."""
-    original_text = text
-    
-    # Ensure text is a string
+# Incomplete \x / \u escapes lose their letter too, matching what TEI's JSON
+# parser choked on; every remaining backslash becomes a space.
+_INVALID_ESCAPE_RE = re.compile(r"\\(?:x(?![0-9a-fA-F]{2})|u(?![0-9a-fA-F]{4}))")
+_CONTROL_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]+")
+_EMBED_TEXT_TABLE = {c: None for c in range(32) if chr(c) not in "\n\r\t"}
+_EMBED_TEXT_TABLE[ord("\\")] = " "
+
+
+def _clean_text_for_embedding(text: Any) -> str:
+    """Clean text to prevent JSON parsing errors in TEI service.
+
+    Replaces unencodable code points (lone surrogates) with ``?``, turns broken
+    hex/unicode escapes and stray backslashes into spaces, drops control
+    characters other than ``\\n``, ``\\r`` and ``\\t``, and strips the result.
+    """
     if not isinstance(text, str):
-        logger.debug("Converting non-string input to string: %s", type(text).__name__)
         text = str(text)
-    
-    # Handle bytes input
-    if isinstance(text, bytes):
-        logger.debug("Converting bytes to UTF-8 string")
-        text = text.decode('utf-8', errors='replace')
-    
-    # Ensure proper UTF-8 encoding
-    text = text.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-    
-    if text != original_text and isinstance(original_text, str):
-        logger.debug("Text encoding normalized: %s characters changed", 
-                    sum(1 for a, b in zip(original_text[:100], text[:100]) if a != b))
-    
-    return text
+    if "\\" in text:
+        text = _INVALID_ESCAPE_RE.sub(" ", text)
+    if text.isascii():
+        # str.translate only has a fast path for ASCII input
+        return text.translate(_EMBED_TEXT_TABLE).strip()
+    try:
+        text.encode("utf-8")
+    except UnicodeEncodeError:
+        text = text.encode("utf-8", errors="replace").decode("utf-8")
+    return _CONTROL_CHARS_RE.sub("", text.replace("\\", " ")).strip()
 
-def _remove_invalid_escapes(text: str) -> str:
-    """Remove incomplete hex/unicode escape sequences that cause JSON parsing errors."""
-    import re
-    
-    original_text = text
-    changes = 0
-    
-    # Replace incomplete \x sequences (not followed by exactly 2 hex digits)
-    new_text = re.sub(r'\\x(?![0-9a-fA-F]{2})', ' ', text)
-    if new_text != text:
-        changes += len(re.findall(r'\\x(?![0-9a-fA-F]{2})', text))
-        text = new_text
-    
-    # Replace incomplete \u sequences (not followed by exactly 4 hex digits) 
-    new_text = re.sub(r'\\u(?![0-9a-fA-F]{4})', ' ', text)
-    if new_text != text:
-        changes += len(re.findall(r'\\u(?![0-9a-fA-F]{4})', text))
-        text = new_text
-    
-    # Replace literal backslashes that might cause issues
-    backslash_count = text.count('\\')
-    text = text.replace('\\', ' ')
-    if backslash_count > 0:
-        changes += backslash_count
-    
-    if changes > 0:
-        logger.debug("Removed %d invalid escape sequences from text", changes)
-    
-    return text
 
-def _filter_control_chars(text: str) -> str:
-    """Remove control characters except common whitespace."""
-    # Keep only printable characters and common whitespace
-    original_len = len(text)
-    filtered_text = ''.join(char for char in text if ord(char) >= 32 or char in '\n\r\t')
-    
-    removed_count = original_len - len(filtered_text)
-    if removed_count > 0:
-        logger.debug("Filtered %d control characters from text", removed_count)
-    
-    return filtered_text
+def _clean_texts_for_embedding(texts: Iterable[Any]) -> List[str]:
+    """Batch :func:`_clean_text_for_embedding`; callers keep the result for embedding and reranking."""
+    texts = list(texts)
+    cleaned = [_clean_text_for_embedding(text) for text in texts]
+    changed = sum(1 for orig, clean in zip(texts, cleaned) if orig != clean)
+    if changed:
+        logger.info("Cleaned %d texts for embedding processing", changed)
+    return cleaned
+
+_TEI_SESSION: Optional[requests.Session] = None
+_TEI_SESSION_LOCK = threading.Lock()
+# origins that rejected encoding_format=base64 (older TEI); they get float lists instead
+_TEI_NO_BASE64: set = set()
+# Throttled (429/503) responses pause every request but do not use up error retries
+_TEI_MAX_THROTTLE_RETRIES = 8
+_TEI_THROTTLE_MAX_DELAY = 30.0
+
+
+def _tei_session() -> requests.Session:
+    """Process-wide pooled session for TEI; retries are handled by :func:`_embed_texts`."""
+    global _TEI_SESSION
+    with _TEI_SESSION_LOCK:
+        if _TEI_SESSION is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TEI_POOL_MAXSIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _TEI_SESSION = session
+        return _TEI_SESSION
+
+
+class _TeiThrottle:
+    """Shared pause honoured by every in-flight TEI request after a 429/503."""
+
+    def __init__(self) -> None:
+        self.events = 0
+        self._until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._until = max(self._until, time.monotonic() + seconds)
+            self.events += 1
+
+
+def _retry_after_seconds(resp: requests.Response) -> Optional[float]:
+    try:
+        return max(0.0, float(resp.headers.get("Retry-After", "")))
+    except (TypeError, ValueError):
+        return None
+
+
+def _rejects_base64(resp: requests.Response) -> bool:
+    """Whether a 400/422 is TEI refusing ``encoding_format`` rather than the inputs.
+
+    Older TEI fails to deserialize the unknown field and names it in the error;
+    input validation errors (empty or oversize inputs) do not mention it.
+    """
+    try:
+        return resp.status_code in (400, 422) and b"encoding_format" in (resp.content or b"")
+    except (AttributeError, TypeError):
+        return False
+
+
+def _decode_embeddings(data: Dict[str, Any]) -> List[np.ndarray]:
+    """One float32 vector per input from a TEI/OpenAI embeddings response.
+
+    Base64 rows are little-endian float32 and are viewed in place over the
+    decoded bytes; float lists are converted in a single ``np.asarray`` call.
+    """
+    rows = [d["embedding"] for d in data["data"]] if "data" in data else data["embeddings"]
+    if rows and isinstance(rows[0], str):
+        return [np.frombuffer(base64.b64decode(row), dtype="<f4") for row in rows]
+    return list(np.asarray(rows, dtype=np.float32))
+
+
+def _post_embed_batch(
+    session: requests.Session,
+    payload: List[str],
+    throttle: _TeiThrottle,
+    max_retries: int = 3,
+    encoding: str = EMBED_ENCODING_DEFAULT,
+) -> Optional[Tuple[List[np.ndarray], float]]:
+    """POST one batch to TEI and decode it; ``None`` means 413 and the caller must shrink the batch.
+
+    Returns the vectors and the time spent parsing and decoding the body, in ms.
+    """
+    attempt = 0
+    throttled = 0
+    while True:
+        throttle.wait()
+        body: Dict[str, Any] = {"input": payload}
+        base64_requested = encoding == "base64" and TEI_ORIGIN not in _TEI_NO_BASE64
+        if base64_requested:
+            body["encoding_format"] = "base64"
+        try:
+            resp = session.post(f"{TEI_ORIGIN}/embeddings", json=body, timeout=60)
+            if resp.status_code == 413:
+                return None
+            if base64_requested and _rejects_base64(resp):
+                logger.warning("TEI rejected encoding_format=base64 (status=%d), using float lists", resp.status_code)
+                _TEI_NO_BASE64.add(TEI_ORIGIN)
+                continue
+            if resp.status_code in (429, 503) and throttled < _TEI_MAX_THROTTLE_RETRIES:
+                throttled += 1
+                delay = _retry_after_seconds(resp)
+                if delay is None:
+                    delay = 0.5 * 2 ** throttled
+                delay = min(_TEI_THROTTLE_MAX_DELAY, delay)
+                logger.warning(
+                    "TEI embedding throttled status=%d, pausing all requests for %.1fs", resp.status_code, delay
+                )
+                throttle.pause(delay)
+                continue
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as exc:
+            attempt += 1
+            if attempt >= max_retries:
+                logger.error("TEI embedding failed after %d attempts: %s", max_retries, exc)
+                raise
+            logger.warning("TEI embedding attempt %d failed, retrying: %s", attempt, exc)
+            time.sleep(2 ** (attempt - 1))
+            continue
+
+        st = time.perf_counter()
+        data = orjson.loads(resp.content) if orjson is not None else resp.json()
+        vectors = _decode_embeddings(data)
+        return vectors, (time.perf_counter() - st) * 1000
+
+
+def _heuristic_batch_plan(
+    texts: List[str],
+    counts: List[int],
+    chars_per_token: float,
+    max_batch_tokens: int,
+    item_limit: int,
+) -> Tuple[int, int]:
+    """Batches the ``chars_per_token`` estimate would pack, and how many of them TEI would reject.
+
+    Texts are cut to the heuristic's ``max_batch_tokens * chars_per_token`` chars
+    with their exact counts scaled to match. Used only to report what exact
+    token counts saved over the heuristic.
+    """
+    char_limit = max(1, int(max_batch_tokens * chars_per_token))
+    batches = overflows = 0
+    est_sum = true_sum = 0
+    oversize = False
+    for text, count in zip(texts, counts):
+        if len(text) > char_limit:
+            count = int(math.ceil(count * char_limit / len(text)))
+        est = max(1, int(math.ceil(min(len(text), char_limit) / chars_per_token)))
+        if est_sum and est_sum + est > max_batch_tokens:
+            batches += 1
+            overflows += int(oversize or true_sum > max_batch_tokens)
+            est_sum = true_sum = 0
+            oversize = False
+        est_sum += est
+        true_sum += count
+        oversize = oversize or count > item_limit
+    if est_sum:
+        batches += 1
+        overflows += int(oversize or true_sum > max_batch_tokens)
+    return batches, overflows
 
-def _clean_text_for_embedding(text: str) -> str:
-    """Clean text to prevent JSON parsing errors in TEI service."""
-    text = _normalize_text_encoding(text)
-    text = _remove_invalid_escapes(text)
-    text = _filter_control_chars(text)
-    return text.strip()
 
 def _embed_texts(
     texts: List[str],
@@ -124,31 +271,81 @@ def _embed_texts(
     max_batch_tokens: int,
     max_item_chars: int,
     chars_per_token: float,
+    cache: Optional[EmbeddingCache] = None,
+    sanitized: bool = False,
+    concurrency: int = EMBED_CONCURRENCY_DEFAULT,
+    tokenizer: Optional[EmbeddingTokenizer] = None,
+    limits: Optional[BatchLimitController] = None,
+    encoding: str = EMBED_ENCODING_DEFAULT,
 ) -> np.ndarray:
+    """Embed ``texts`` through TEI; pass ``sanitized=True`` if they already went through
+    :func:`_clean_texts_for_embedding`.
+
+    Token-bounded batches are assembled in order and up to ``concurrency`` of them
+    are kept in flight on the pooled TEI session. A 413 splits the batch (or trims
+    a single text) and re-queues it at the front; a 429/503 pauses every request.
+
+    With a ``tokenizer`` the batches are packed and oversize texts truncated by
+    exact token counts; ``chars_per_token`` is then only used for text re-trimmed
+    after a 413 (or if counting fails).
+
+    With ``limits`` the run starts from the batch budget learned by earlier runs
+    and adjusts it as batches are accepted or rejected; a rejected multi-item
+    batch is re-packed under the lowered budget instead of being sent item by item.
+
+    Vectors are requested as base64 (``encoding``) and copied straight into one
+    preallocated float32 result array as each batch arrives.
+    """
     st = time.monotonic()
+    if limits is not None:
+        max_batch_tokens = limits.limit
     max_batch_tokens = max(1, max_batch_tokens)
+    start_batch_tokens = max_batch_tokens
     chars_per_token = max(0.1, chars_per_token)
-
-    # Clean all texts before processing
-    cleaned_texts = [_clean_text_for_embedding(text) for text in texts]
-    cleaned_count = sum(1 for orig, clean in zip(texts, cleaned_texts) if orig != clean)
-    if cleaned_count > 0:
-        logger.info("Cleaned %d texts for embedding processing", cleaned_count)
+    concurrency = max(1, concurrency)
+    cleaned_texts = list(texts) if sanitized else _clean_texts_for_embedding(texts)
 
     max_single_chars = max(1, int(max_batch_tokens * chars_per_token))
     effective_char_limit = max_single_chars
-    if max_item_chars > 0:
+    if tokenizer is not None:
+        # exact counts bound each text below; max_item_chars is only a cheap pre-cut (0 = none)
+        effective_char_limit = max(0, max_item_chars)
+    elif max_item_chars > 0:
         effective_char_limit = min(max_item_chars, max_single_chars)
 
     processed_texts: List[Tuple[int, str, bool]] = []
     truncated_count = 0
     for idx, text in enumerate(cleaned_texts):
         truncated = text
-        if len(truncated) > effective_char_limit:
+        if effective_char_limit and len(truncated) > effective_char_limit:
             truncated = truncated[:effective_char_limit]
             truncated_count += 1
         processed_texts.append((idx, truncated, False))
 
+    out: Optional[np.ndarray] = None
+    filled = np.zeros(len(texts), dtype=bool)
+
+    def store(idx: int, vec: np.ndarray) -> None:
+        nonlocal out
+        if out is None:
+            out = np.empty((len(texts), vec.shape[-1]), dtype=np.float32)
+        out[idx] = vec
+        filled[idx] = True
+
+    cache_hits = 0
+    if cache is not None:
+        cached = cache.get_many([text for _, text, _ in processed_texts])
+        misses: List[Tuple[int, str, bool]] = []
+        for entry, emb in zip(processed_texts, cached):
+            if emb is None:
+                misses.append(entry)
+            else:
+                store(entry[0], emb)
+        cache_hits = len(processed_texts) - len(misses)
+        processed_texts = misses
+    # embeddings are cached under the text as first submitted, before any 413 trimming
+    cache_keys = {idx: text for idx, text, _ in processed_texts}
+
     if truncated_count > 0:
         logger.info(
             "Truncated %d texts for embedding processing (char_limit=%d)",
@@ -156,21 +353,59 @@ def _embed_texts(
             effective_char_limit,
         )
 
-    def approx_tokens(payload: str) -> int:
+    def heuristic_tokens(payload: str) -> int:
         return max(1, int(math.ceil(len(payload) / chars_per_token)))
 
+    token_counts: Dict[str, int] = {}
+    token_stats: Optional[Dict[str, Any]] = None
+    if tokenizer is not None and processed_texts:
+        tok_st = time.monotonic()
+        requests_before = tokenizer.requests
+        item_limit = min(max_batch_tokens, tokenizer.max_input_tokens or max_batch_tokens)
+        try:
+            payloads = [text for _, text, _ in processed_texts]
+            counts = tokenizer.count(payloads)
+            heuristic_batches, heuristic_413s = _heuristic_batch_plan(
+                payloads, counts, chars_per_token, max_batch_tokens, item_limit
+            )
+            token_truncated = sum(1 for n in counts if n > item_limit)
+            if token_truncated:
+                payloads, counts = tokenizer.truncate(payloads, counts, item_limit)
+        except Exception as exc:  # noqa: BLE001 - the heuristic still works, just less precisely
+            logger.warning("embedding token count failed, using chars_per_token: %s", exc)
+        else:
+            processed_texts = [(idx, text, False) for (idx, _, _), text in zip(processed_texts, payloads)]
+            token_counts = dict(zip(payloads, counts))
+            token_stats = {
+                "tokens": sum(counts),
+                "truncated": token_truncated,
+                "item_limit": item_limit,
+                "heuristic_batches": heuristic_batches,
+                "heuristic_413s": heuristic_413s,
+                "tokenize_ms": (time.monotonic() - tok_st) * 1000,
+                "tokenize_requests": tokenizer.requests - requests_before,
+            }
+
+    def approx_tokens(payload: str) -> int:
+        count = token_counts.get(payload)
+        return count if count is not None else heuristic_tokens(payload)
+
     # queue entries: (original_index, truncated_text, force_single)
     queue: deque[Tuple[int, str, bool]] = deque(processed_texts)
-    all_embs: List[Optional[np.ndarray]] = [None] * len(texts)
     batches_sent = 0
+    tokens_sent = 0
+    items_sent = 0
+    responses_413 = 0
+    decode_ms = 0.0
 
     def enqueue_front(items: List[Tuple[int, str, bool]]) -> None:
         for item in reversed(items):
             queue.appendleft(item)
 
-    while queue:
+    def take_batch() -> List[Tuple[int, str, bool]]:
         batch: List[Tuple[int, str, bool]] = []
         current_tokens = 0
+        batch_limit = limits.limit if limits is not None else max_batch_tokens
 
         while queue:
             idx, text, force_single = queue[0]
@@ -199,7 +434,7 @@ def _embed_texts(
                 queue.appendleft((idx, text[:new_length], True))
                 continue
 
-            if batch and (current_tokens + tokens > max_batch_tokens or force_single):
+            if batch and (current_tokens + tokens > batch_limit or force_single):
                 break
 
             queue.popleft()
@@ -207,122 +442,205 @@ def _embed_texts(
             current_tokens += tokens
             if force_single:
                 break
+        return batch
 
-        if not batch:
-            # No batch assembled; likely due to very small max_batch_tokens
-            continue
-
-        payload = [text for _, text, _ in batch]
-        batch_token_estimate = sum(approx_tokens(text) for text in payload)
-        logger.debug(
-            "Embedding batch size=%d approx_tokens=%d", len(batch), batch_token_estimate
+    def requeue_after_413(batch: List[Tuple[int, str, bool]], batch_token_estimate: int) -> None:
+        nonlocal responses_413
+        responses_413 += 1
+        logger.warning(
+            "TEI embedding 413 for batch size=%d approx_tokens=%d, reducing batch",
+            len(batch),
+            batch_token_estimate,
         )
+        if len(batch) > 1 and limits is not None:
+            limits.rejected(batch_token_estimate)
+            enqueue_front(batch)
+        elif len(batch) > 1:
+            mid = max(1, len(batch) // 2)
+            second_half = [(idx, text, True) for idx, text, _ in batch[mid:]]
+            first_half = [(idx, text, True) for idx, text, _ in batch[:mid]]
+            enqueue_front(second_half)
+            enqueue_front(first_half)
+        else:
+            idx, text, _ = batch[0]
+            new_length = max(1, int(len(text) * 0.7))
+            if new_length == len(text):
+                new_length = max(1, len(text) - 1)
+            if new_length <= 0:
+                raise RuntimeError(f"Unable to shrink text {idx} below TEI limit")
+            logger.warning(
+                "Further trimming text %d to %d chars after 413 (was %d)",
+                idx,
+                new_length,
+                len(text),
+            )
+            queue.appendleft((idx, text[:new_length], True))
+        if limits is None:
+            time.sleep(1)
 
-        max_retries = 3
-        sent = False
-
-        for attempt in range(max_retries):
-            try:
-                resp = requests.post(
-                    f"{TEI_ORIGIN}/embeddings", json={"input": payload}, timeout=60
+    session = _tei_session()
+    throttle = _TeiThrottle()
+    send_st = time.monotonic()
+    inflight: Dict[Future, Tuple[List[Tuple[int, str, bool]], int]] = {}
+    pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="tei-embed")
+    try:
+        while queue or inflight:
+            while queue and len(inflight) < concurrency:
+                batch = take_batch()
+                if not batch:
+                    # No batch assembled; likely due to very small max_batch_tokens
+                    continue
+                payload = [text for _, text, _ in batch]
+                batch_token_estimate = sum(approx_tokens(text) for text in payload)
+                logger.debug(
+                    "Embedding batch size=%d approx_tokens=%d", len(batch), batch_token_estimate
                 )
-            except requests.exceptions.RequestException as exc:
-                if attempt == max_retries - 1:
-                    logger.error("TEI embedding failed after %d attempts: %s", max_retries, exc)
-                    raise
-                logger.warning("TEI embedding attempt %d failed, retrying: %s", attempt + 1, exc)
-                time.sleep(2 ** attempt)
-                continue
+                future = pool.submit(_post_embed_batch, session, payload, throttle, encoding=encoding)
+                inflight[future] = (batch, batch_token_estimate)
 
-            if resp.status_code == 413:
-                logger.warning(
-                    "TEI embedding 413 for batch size=%d approx_tokens=%d, reducing batch",
-                    len(batch),
-                    batch_token_estimate,
-                )
-                if len(batch) > 1:
-                    mid = max(1, len(batch) // 2)
-                    second_half = [(idx, text, True) for idx, text, _ in batch[mid:]]
-                    first_half = [(idx, text, True) for idx, text, _ in batch[:mid]]
-                    enqueue_front(second_half)
-                    enqueue_front(first_half)
-                else:
-                    idx, text, _ = batch[0]
-                    new_length = max(1, int(len(text) * 0.7))
-                    if new_length == len(text):
-                        new_length = max(1, len(text) - 1)
-                    if new_length <= 0:
-                        raise RuntimeError(f"Unable to shrink text {idx} below TEI limit")
-                    logger.warning(
-                        "Further trimming text %d to %d chars after 413 (was %d)",
-                        idx,
-                        new_length,
-                        len(text),
-                    )
-                    queue.appendleft((idx, text[:new_length], True))
-                time.sleep(1)
-                sent = False
-                break
+            done, _ = wait(list(inflight), return_when=FIRST_COMPLETED)
+            for future in done:
+                batch, batch_token_estimate = inflight.pop(future)
+                result = future.result()
+                if result is None:
+                    # batch was re-queued due to 413; picked up by the next submission round
+                    requeue_after_413(batch, batch_token_estimate)
+                    continue
+                embs, batch_decode_ms = result
+                decode_ms += batch_decode_ms
+                for (original_idx, _, _), emb in zip(batch, embs):
+                    store(original_idx, emb)
+                if limits is not None:
+                    limits.accepted(batch_token_estimate)
+                batches_sent += 1
+                items_sent += len(batch)
+                tokens_sent += batch_token_estimate
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    send_s = max(time.monotonic() - send_st, 1e-9)
 
-            try:
-                resp.raise_for_status()
-            except requests.exceptions.HTTPError as exc:
-                if attempt == max_retries - 1:
-                    logger.error("TEI embedding failed after %d attempts: %s", max_retries, exc)
-                    raise
-                logger.warning("TEI embedding attempt %d failed, retrying: %s", attempt + 1, exc)
-                time.sleep(2 ** attempt)
-                continue
-
-            data = resp.json()
-            if "data" in data:
-                embs = [d["embedding"] for d in data["data"]]
-            else:
-                embs = data["embeddings"]
-
-            for (original_idx, _, _), emb in zip(batch, embs):
-                all_embs[original_idx] = emb
-
-            batches_sent += 1
-            sent = True
-            break
+    if limits is not None and (batches_sent or responses_413):
+        limits.save()
+        limit_stats = limits.stats()
+        logger.info(
+            "embed_limits key=%s start=%d limit=%d max_accepted=%d min_rejected=%s increases=%d decreases=%d",
+            limits.key,
+            start_batch_tokens,
+            limit_stats["limit"],
+            limit_stats["max_accepted"],
+            limit_stats["min_rejected"],
+            limit_stats["increases"],
+            limit_stats["decreases"],
+        )
 
-        if not sent:
-            # batch was re-queued due to 413; continue outer loop
-            continue
+    if token_stats is not None:
+        # lower bound: every heuristic overflow costs at least the rejected request
+        saved = (
+            token_stats["heuristic_batches"] + token_stats["heuristic_413s"]
+            - batches_sent - responses_413 - token_stats["tokenize_requests"]
+        )
+        logger.info(
+            "embed_tokens backend=%s texts=%d tokens=%d token_truncated=%d item_limit=%d tokenize_requests=%d "
+            "tokenize_ms=%d batches=%d responses_413=%d heuristic_batches=%d heuristic_413s=%d round_trips_saved=%d",
+            tokenizer.backend,
+            len(processed_texts),
+            token_stats["tokens"],
+            token_stats["truncated"],
+            token_stats["item_limit"],
+            token_stats["tokenize_requests"],
+            token_stats["tokenize_ms"],
+            batches_sent,
+            responses_413,
+            token_stats["heuristic_batches"],
+            token_stats["heuristic_413s"],
+            saved,
+        )
 
-    missing = [idx for idx, emb in enumerate(all_embs) if emb is None]
+    missing = np.flatnonzero(~filled).tolist()
     if missing:
         raise RuntimeError(f"Missing embeddings for indices: {missing}")
 
-    arr = np.array(all_embs, dtype=np.float32)
+    arr = out if out is not None else np.zeros((0, 0), dtype=np.float32)
+    if cache is not None and cache_keys:
+        # copies: the cache must not alias rows of the array handed to the caller
+        # persisted once per run by the caller, see _flush_embedding_cache
+        cache.put_many(list(cache_keys.values()), [arr[idx].copy() for idx in cache_keys])
+
     logger.info(
-        "embed_texts count=%d batches=%d took_ms=%d",
+        "embed_texts count=%d batches=%d cache_hits=%d cache_misses=%d concurrency=%d throttled=%d "
+        "responses_413=%d items_per_s=%.1f tokens_per_s=%.0f encoding=%s decode_ms=%.1f "
+        "result_mb=%.2f took_ms=%d",
         len(texts),
         batches_sent,
+        cache_hits,
+        len(texts) - cache_hits,
+        concurrency,
+        throttle.events,
+        responses_413,
+        items_sent / send_s if items_sent else 0.0,
+        tokens_sent / send_s if tokens_sent else 0.0,
+        "float" if encoding != "base64" or TEI_ORIGIN in _TEI_NO_BASE64 else "base64",
+        decode_ms,
+        arr.nbytes / (1024 * 1024),
         int((time.monotonic() - st) * 1000),
     )
     return arr
 
-def _near_duplicate_mask(embs: np.ndarray, threshold: float) -> List[bool]:
+def _near_duplicate_mask(embs: np.ndarray, threshold: float, block_size: int = 1024) -> List[bool]:
+    """Greedy near-duplicate mask: keep item i unless an earlier kept item is >= threshold similar.
+
+    Rows are L2-normalized once and compared in row tiles against the columns that
+    follow them, so peak memory is ``block_size x n`` instead of the full n x n matrix.
+    """
     n = embs.shape[0]
-    keep = [True] * n
-    duplicates_found = 0
-    sims = cosine_similarity(embs)
-    
-    for i in range(n):
-        if not keep[i]:
-            continue
-        for j in range(i + 1, n):
-            if keep[j] and sims[i, j] >= threshold:
-                keep[j] = False
-                duplicates_found += 1
-                logger.debug("Duplicate detected: item %d similar to %d (similarity=%.3f)", j, i, sims[i, j])
-    
-    logger.info("Near-duplicate detection: %d duplicates found out of %d items (threshold=%.2f)", 
+    keep = np.ones(n, dtype=bool)
+    if n == 0:
+        logger.info("Near-duplicate detection: 0 duplicates found out of 0 items (threshold=%.2f)", threshold)
+        return []
+
+    normed = normalize_rows(embs)
+    block_size = max(1, block_size)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        # similarities of this tile's rows against every column from the tile onwards
+        sims = normed[start:stop] @ normed[start:].T
+        for local, i in enumerate(range(start, stop)):
+            if not keep[i]:
+                continue
+            row = sims[local, i - start + 1:]
+            keep[i + 1:] &= row < threshold
+
+    duplicates_found = int(n - keep.sum())
+    logger.info("Near-duplicate detection: %d duplicates found out of %d items (threshold=%.2f)",
                 duplicates_found, n, threshold)
+    return keep.tolist()
+
+def _near_duplicate_mask_lsh(embs: np.ndarray, threshold: float, index: RandomProjectionLSH) -> List[bool]:
+    """Approximate greedy dedup: only LSH candidate pairs are scored exactly."""
+    pairs = index.candidate_pairs(normalize_rows(embs), threshold)
+    keep = greedy_keep_from_pairs(embs.shape[0], pairs)
+    logger.info(
+        "Near-duplicate detection (lsh): %d duplicates found out of %d items (threshold=%.2f, pairs=%d, tables=%d, bits=%d)",
+        len(keep) - sum(keep), len(keep), threshold, len(pairs), index.n_tables, index.n_bits,
+    )
     return keep
 
+def _dedup_mask(embs: np.ndarray, cfg: Dict[str, Any]) -> List[bool]:
+    """Pick the exact or LSH dedup backend from ``processing.dedup``; small n stays exact."""
+    threshold = cfg.get("sim_near_dup", 0.92)
+    dedup_cfg = cfg.get("dedup", {}) or {}
+    backend = dedup_cfg.get("backend", "exact")
+    exact_max_items = int(dedup_cfg.get("exact_max_items", 5000))
+    if backend == "lsh" and embs.shape[0] > exact_max_items:
+        index = RandomProjectionLSH(
+            n_tables=int(dedup_cfg.get("lsh_tables", 16)),
+            n_bits=int(dedup_cfg.get("lsh_bits", 10)),
+            seed=int(dedup_cfg.get("seed", 0)),
+        )
+        return _near_duplicate_mask_lsh(embs, threshold, index)
+    return _near_duplicate_mask(embs, threshold)
+
 def _cluster(embs: np.ndarray, min_cluster_size: int) -> np.ndarray:
     clusterer = hdbscan.HDBSCAN(min_cluster_size=min_cluster_size, metric='euclidean')
     labels = clusterer.fit_predict(embs)
@@ -349,27 +667,107 @@ def _top_k_by_centroid(embs: np.ndarray, idxs: List[int], k: int = 50) -> List[i
     pick = [idxs[i] for i in order[: min(k, len(idxs))]]
     return pick
 
+_RERANKERS: Dict[str, CrossEncoder] = {}
+_RERANKERS_LOCK = threading.Lock()
+
+
+def _model_param_mb(model: Any) -> float:
+    try:
+        params = model.model.parameters()
+        return sum(p.numel() * p.element_size() for p in params) / (1024 * 1024)
+    except Exception:  # noqa: BLE001 - size reporting is best-effort
+        return 0.0
+
+
+def get_reranker(bge_model: str) -> CrossEncoder:
+    """Return the process-wide CrossEncoder for ``bge_model``, loading it on first use.
+
+    Loads are serialized so concurrent callers (or a warm-up thread) never load the
+    same model twice; every later cluster, config and run in this process reuses it.
+    """
+    ce = _RERANKERS.get(bge_model)
+    if ce is not None:
+        return ce
+    with _RERANKERS_LOCK:
+        ce = _RERANKERS.get(bge_model)
+        if ce is None:
+            st = time.monotonic()
+            ce = CrossEncoder(bge_model)
+            _RERANKERS[bge_model] = ce
+            logger.info(
+                "reranker loaded model=%s load_ms=%d param_mb=%.1f",
+                bge_model,
+                int((time.monotonic() - st) * 1000),
+                _model_param_mb(ce),
+            )
+    return ce
+
+
+def warm_rerankers(models: List[str], *, background: bool = False) -> Optional[threading.Thread]:
+    """Preload reranker models, optionally on a daemon thread so loading overlaps I/O."""
+
+    def _load_all() -> None:
+        for name in models:
+            try:
+                get_reranker(name)
+            except Exception as exc:  # noqa: BLE001 - _rerank will retry and surface errors
+                logger.warning("reranker warm-up failed model=%s: %s", name, exc)
+
+    if not background:
+        _load_all()
+        return None
+    thread = threading.Thread(target=_load_all, name="reranker-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 def _rerank(bge_model: str, query: str, candidates: List[str]) -> List[int]:
-    st = time.monotonic()
-    ce = CrossEncoder(bge_model)
-    # Ensure all candidates are clean strings
-    clean_candidates = [_clean_text_for_embedding(c) for c in candidates]
-    pairs = [[_clean_text_for_embedding(query), c] for c in clean_candidates]
-    scores = ce.predict(pairs)
-    order = np.argsort(-scores)
-    logger.info("rerank candidates=%d took_ms=%d", len(candidates), int((time.monotonic()-st)*1000))
-    return order.tolist()
-
-def run_processing_pipeline(raw_items: List[Dict[str, Any]], cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
-    if not raw_items:
+    return _rerank_many(bge_model, [(query, candidates)])[0]
+
+def _rerank_many(
+    bge_model: str,
+    jobs: List[Tuple[str, List[str]]],
+    batch_size: int = RERANK_BATCH_SIZE_DEFAULT,
+    *,
+    sanitized: bool = False,
+) -> List[List[int]]:
+    """Rerank several (query, candidates) jobs in one CrossEncoder scoring pass.
+
+    Pairs from every job are scored together so the model sees full batches, then
+    the scores are split back per job and ordered exactly as a per-job call would.
+    With ``sanitized=True`` the texts are used as given (already cleaned for embedding).
+    """
+    if not jobs:
         return []
+    ce = get_reranker(bge_model)
+    st = time.monotonic()
+    clean = (lambda t: t) if sanitized else _clean_text_for_embedding
+    pairs: List[List[str]] = []
+    offsets: List[Tuple[int, int]] = []
+    for query, candidates in jobs:
+        clean_query = clean(query)
+        start = len(pairs)
+        pairs.extend([clean_query, clean(c)] for c in candidates)
+        offsets.append((start, len(pairs)))
 
-    horizon = now_utc().timestamp() - cfg["time_window_hours"] * 3600
+    scores = np.asarray(ce.predict(pairs, batch_size=max(1, batch_size))) if pairs else np.zeros(0)
+    orders = [np.argsort(-scores[start:end]).tolist() for start, end in offsets]
+    logger.info(
+        "rerank jobs=%d candidates=%d batch_size=%d infer_ms=%d",
+        len(jobs),
+        len(pairs),
+        batch_size,
+        int((time.monotonic() - st) * 1000),
+    )
+    return orders
+
+def _time_filter(items: List[Dict[str, Any]], horizon: float) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Split items into those inside the time window, counting too-old and invalid ones."""
     filtered = []
     items_too_old = 0
     items_invalid_ts = 0
-    
-    for it in raw_items:
+
+    for it in items:
         try:
             ts = it["timestamp"]
             if isinstance(ts, str):
@@ -388,13 +786,59 @@ def run_processing_pipeline(raw_items: List[Dict[str, Any]], cfg: Dict[str, Any]
             logger.warning("Failed to parse timestamp for item %s: %s", it.get("id"), str(e))
             items_invalid_ts += 1
             continue
-        
+
         if t >= horizon:
             filtered.append(it)
         else:
             items_too_old += 1
-            logger.debug("Item %s filtered: too old (age=%.1f hours)", 
+            logger.debug("Item %s filtered: too old (age=%.1f hours)",
                         it.get("id"), (now_utc().timestamp() - t) / 3600)
+
+    return filtered, items_too_old, items_invalid_ts
+
+
+def _embedding_kwargs(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    embedding_cfg = cfg.get("embedding", {})
+    max_batch_tokens = int(embedding_cfg.get("max_batch_tokens", EMBED_MAX_BATCH_TOKENS_DEFAULT))
+    chars_per_token = float(embedding_cfg.get("chars_per_token", EMBED_CHARS_PER_TOKEN_DEFAULT))
+    tokenizer = embedding_tokenizer_from_config(embedding_cfg, session=_tei_session())
+    # learned limits are only comparable under the same way of counting tokens
+    counting = tokenizer.backend if tokenizer is not None else f"chars_per_token={chars_per_token:g}"
+    return {
+        "max_batch_tokens": max_batch_tokens,
+        "max_item_chars": int(embedding_cfg.get("max_item_chars", EMBED_MAX_ITEM_CHARS_DEFAULT)),
+        "chars_per_token": chars_per_token,
+        "concurrency": int(embedding_cfg.get("concurrency", EMBED_CONCURRENCY_DEFAULT)),
+        "encoding": embedding_cfg.get("encoding", EMBED_ENCODING_DEFAULT),
+        "tokenizer": tokenizer,
+        "limits": embedding_limits_from_config(
+            embedding_cfg,
+            key=f"{TEI_ORIGIN}|{TEI_MODEL_ID}|{counting}",
+            max_batch_tokens=max_batch_tokens,
+        ),
+        "cache": embedding_cache_from_config(embedding_cfg),
+    }
+
+
+def _flush_embedding_cache(embed_kwargs: Dict[str, Any]) -> None:
+    # flushing merges and rewrites the on-disk index, so it happens once per run
+    # rather than after every _embed_texts call (the streaming pipeline makes many)
+    cache = embed_kwargs.get("cache")
+    if cache is not None:
+        cache.flush()
+
+
+def run_processing_pipeline(
+    raw_items: List[Dict[str, Any]],
+    cfg: Dict[str, Any],
+    *,
+    seen_index: Optional[SeenItemsIndex] = None,
+) -> List[Dict[str, Any]]:
+    if not raw_items:
+        return []
+
+    horizon = now_utc().timestamp() - cfg["time_window_hours"] * 3600
+    filtered, items_too_old, items_invalid_ts = _time_filter(raw_items, horizon)
     
     logger.info(
         "Time filter: kept %d items, filtered %d old items, dropped %d invalid timestamps (window=%d hours)",
@@ -406,24 +850,142 @@ def run_processing_pipeline(raw_items: List[Dict[str, Any]], cfg: Dict[str, Any]
         return []
 
     # lid = fasttext.load_model(LID_MODEL_PATH)
-    texts = [it["text"] for it in filtered]
+    texts = _clean_texts_for_embedding(it["text"] for it in filtered)
     # for tx in texts:
     #     lid.predict(tx.replace("\n", " ")[:1000])  # 标注语言（当前未做强过滤）
 
-    embedding_cfg = cfg.get("embedding", {})
-    max_batch_tokens = int(embedding_cfg.get("max_batch_tokens", EMBED_MAX_BATCH_TOKENS_DEFAULT))
-    max_item_chars = int(embedding_cfg.get("max_item_chars", EMBED_MAX_ITEM_CHARS_DEFAULT))
-    chars_per_token = float(embedding_cfg.get("chars_per_token", EMBED_CHARS_PER_TOKEN_DEFAULT))
+    embed_kwargs = _embedding_kwargs(cfg)
+    embs = _embed_texts(texts, sanitized=True, **embed_kwargs)
+    _flush_embedding_cache(embed_kwargs)
+    return _bundle_embedded(filtered, embs, cfg, texts=texts, seen_index=seen_index)
+
+
+def run_streaming_pipeline(
+    item_batches: Iterable[List[Dict[str, Any]]],
+    cfg: Dict[str, Any],
+    *,
+    seen_index: Optional[SeenItemsIndex] = None,
+    timings: Optional[Dict[str, float]] = None,
+) -> List[Dict[str, Any]]:
+    """Like :func:`run_processing_pipeline`, but embeds while the source is still fetching.
+
+    Each batch yielded by ``item_batches`` is time-filtered on arrival; kept items
+    are embedded in chunks of ``streaming.chunk_items`` on a single background
+    worker, one chunk at a time (each chunk keeps up to ``embedding.concurrency``
+    TEI requests in flight). Everything after embedding
+    needs the full item set and runs once the source is exhausted.
+
+    When ``timings`` is given it receives ``fetch_ms``, ``embed_ms`` (TEI busy
+    time), ``embed_tail_ms`` (embedding left after the fetch finished) and
+    ``overlap_ms`` (embedding hidden behind the fetch).
+    """
+    st = time.monotonic()
+    horizon = now_utc().timestamp() - cfg["time_window_hours"] * 3600
+    chunk_items = max(1, int((cfg.get("streaming") or {}).get("chunk_items", 64)))
+    embed_kwargs = _embedding_kwargs(cfg)
+
+    filtered: List[Dict[str, Any]] = []
+    texts: List[str] = []
+    pending: List[str] = []
+    futures = []
+    fetched = items_too_old = items_invalid_ts = 0
+    embed_busy_ms = [0.0]
+
+    def embed_chunk(texts: List[str]) -> np.ndarray:
+        t = time.monotonic()
+        try:
+            return _embed_texts(texts, sanitized=True, **embed_kwargs)
+        finally:
+            embed_busy_ms[0] += (time.monotonic() - t) * 1000
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed-stream")
+    try:
+        for batch in item_batches:
+            fetched += len(batch)
+            kept, old, invalid = _time_filter(batch, horizon)
+            items_too_old += old
+            items_invalid_ts += invalid
+            kept_texts = _clean_texts_for_embedding(it["text"] for it in kept)
+            filtered.extend(kept)
+            texts.extend(kept_texts)
+            pending.extend(kept_texts)
+            while len(pending) >= chunk_items:
+                chunk, pending = pending[:chunk_items], pending[chunk_items:]
+                futures.append(pool.submit(embed_chunk, chunk))
+        if pending:
+            futures.append(pool.submit(embed_chunk, pending))
+        fetch_done = time.monotonic()
+        parts = [f.result() for f in futures]
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+    _flush_embedding_cache(embed_kwargs)
 
-    embs = _embed_texts(
-        texts,
-        max_batch_tokens=max_batch_tokens,
-        max_item_chars=max_item_chars,
-        chars_per_token=chars_per_token,
+    fetch_ms = (fetch_done - st) * 1000
+    tail_ms = (time.monotonic() - fetch_done) * 1000
+    stats = {
+        "fetch_ms": fetch_ms,
+        "embed_ms": embed_busy_ms[0],
+        "embed_tail_ms": tail_ms,
+        "overlap_ms": max(0.0, embed_busy_ms[0] - tail_ms),
+    }
+    if timings is not None:
+        timings.update(stats)
+    logger.info(
+        "stream fetched=%d chunks=%d fetch_ms=%d embed_ms=%d embed_tail_ms=%d overlap_ms=%d",
+        fetched, len(futures), stats["fetch_ms"], stats["embed_ms"], stats["embed_tail_ms"], stats["overlap_ms"],
+    )
+    logger.info(
+        "Time filter: kept %d items, filtered %d old items, dropped %d invalid timestamps (window=%d hours)",
+        len(filtered), items_too_old, items_invalid_ts, cfg["time_window_hours"]
     )
 
-    mask = _near_duplicate_mask(embs, cfg.get("sim_near_dup", 0.92))
+    if not filtered:
+        logger.info("pipeline: no items after time_window filter")
+        return []
+
+    embs = np.concatenate(parts, axis=0)
+    return _bundle_embedded(filtered, embs, cfg, texts=texts, seen_index=seen_index)
+
+
+def _bundle_embedded(
+    filtered: List[Dict[str, Any]],
+    embs: np.ndarray,
+    cfg: Dict[str, Any],
+    *,
+    texts: Optional[List[str]] = None,
+    seen_index: Optional[SeenItemsIndex] = None,
+) -> List[Dict[str, Any]]:
+    """Seen-items filter, near-dup removal, clustering and reranking of embedded items.
+
+    ``texts`` are the sanitized item texts, parallel to ``filtered``, reused for reranking.
+    """
+    if texts is None:
+        texts = _clean_texts_for_embedding(it["text"] for it in filtered)
+    if seen_index is not None and len(seen_index):
+        seen = seen_index.seen_mask(filtered, embs)
+        seen_count = sum(seen)
+        if seen_index.mode == "demote":
+            for it, was_seen in zip(filtered, seen):
+                if was_seen:
+                    it.setdefault("metadata", {})["seen_before"] = True
+        elif seen_count:
+            fresh = [not s for s in seen]
+            filtered = [x for x, m in zip(filtered, fresh) if m]
+            texts = [x for x, m in zip(texts, fresh) if m]
+            embs = embs[fresh]
+        logger.info(
+            "Seen-items filter: %d of %d items covered by previous runs (mode=%s)",
+            seen_count, len(seen), seen_index.mode,
+        )
+        if not filtered:
+            logger.info("pipeline: all items already covered by previous runs")
+            return []
+
+    mask = _dedup_mask(embs, cfg)
     filtered2 = [x for x, m in zip(filtered, mask) if m]
+    texts2 = [x for x, m in zip(texts, mask) if m]
     embs2 = embs[mask]
 
     if len(filtered2) == 0:
@@ -440,14 +1002,28 @@ def run_processing_pipeline(raw_items: List[Dict[str, Any]], cfg: Dict[str, Any]
     max_candidates = int(cfg.get("max_candidates_per_cluster", 300))
     bge_model = cfg["reranker_model"]
 
+    rerank_batch_size = int(cfg.get("rerank_batch_size", RERANK_BATCH_SIZE_DEFAULT))
+
+    picks: List[Tuple[int, List[int]]] = []
+    rerank_jobs: List[Tuple[str, List[str]]] = []
     for lb, idxs in clusters.items():
         pick = _top_k_by_centroid(embs2, idxs, k=min(initial_topk, len(idxs)))
         pick = pick[:max_candidates]
         best_idx, _ = _cluster_centrality(embs2, idxs)
-        query_text = filtered2[best_idx]["text"]
-        cand_texts = [filtered2[i]["text"] for i in pick]
-        order = _rerank(bge_model, query_text, cand_texts)
+        query_text = texts2[best_idx]
+        cand_texts = [texts2[i] for i in pick]
+        picks.append((lb, pick))
+        rerank_jobs.append((query_text, cand_texts))
+
+    orders = _rerank_many(bge_model, rerank_jobs, batch_size=rerank_batch_size, sanitized=True)
+
+    emitted_rows: List[int] = []
+    for (lb, pick), order in zip(picks, orders):
+        emitted_rows.extend(pick[i] for i in order)
         ordered_items = [filtered2[pick[i]] for i in order]
+        if seen_index is not None and seen_index.mode == "demote":
+            # stable sort keeps rerank order within fresh and previously seen items
+            ordered_items.sort(key=lambda it: bool(it.get("metadata", {}).get("seen_before")))
 
         bundles.append({
             "topic_id": f"cluster-{lb}",
@@ -455,6 +1031,11 @@ def run_processing_pipeline(raw_items: List[Dict[str, Any]], cfg: Dict[str, Any]
             "items": ordered_items
         })
 
+    if seen_index is not None:
+        # only what reaches a bundle counts as covered; candidates cut by
+        # max_candidates_per_cluster stay eligible for later runs
+        seen_index.stage([filtered2[r] for r in emitted_rows], embs2[emitted_rows])
+
     bundles.sort(key=lambda b: len(b["items"]), reverse=True)
     logger.info("pipeline: bundles=%d", len(bundles))
     return bundles
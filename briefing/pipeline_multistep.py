@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
-import yaml
-from jinja2 import Environment
 from statistics import mean
 
+from briefing import run_stats
+from briefing.llm.cache import bypass_from_config, from_config as response_cache_from_config
 from briefing.llm.registry import call_with_schema
 from briefing.models import (
     Bullet,
@@ -26,6 +30,8 @@ from briefing.models import (
     Topic,
     TopicDraft,
 )
+from briefing.rendering.prompt_loader import render_prompt_file
+from briefing.schema_registry import load_schema
 from briefing.utils import get_logger, parse_datetime_safe, normalize_http_url
 from pydantic import ValidationError
 
@@ -34,11 +40,7 @@ logger = get_logger(__name__)
 PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
 SCHEMA_DIR = Path(__file__).resolve().parent / "schemas"
 
-with open(SCHEMA_DIR / "briefing.schema.json", "r", encoding="utf-8") as _fh:
-    FINAL_BRIEFING_SCHEMA = json.load(_fh)
-
-
-ENV = Environment(autoescape=False, trim_blocks=True, lstrip_blocks=True)
+FINAL_BRIEFING_SCHEMA = load_schema("briefing.schema.json")
 
 
 @dataclass
@@ -49,6 +51,38 @@ class LLMSettings:
     timeout: int
     retries: int
     options: Optional[Dict[str, Any]] = None
+    max_requests_per_minute: Optional[int] = None
+    response_cache: Optional[Dict[str, Any]] = None
+
+
+class _RateLimiter:
+    """Spaces calls evenly so that at most ``per_minute`` start in any minute."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.interval = 60.0 / max(1, per_minute)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_RATE_LIMITERS: Dict[Tuple[str, int], _RateLimiter] = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _rate_limiter(provider: str, per_minute: int) -> _RateLimiter:
+    key = (provider, per_minute)
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(key)
+        if limiter is None:
+            limiter = _RATE_LIMITERS[key] = _RateLimiter(per_minute)
+    return limiter
 
 
 DEFAULT_PROMPTS = {
@@ -76,6 +110,8 @@ class PipelineState:
     selections: Dict[str, ClusterSelection]
     topics: Dict[str, TopicDraft]
     artifact_root: Optional[Path] = None
+    # cache/pool/template counters of this run only (the shared objects count per process)
+    stats: run_stats.RunStats = field(default_factory=run_stats.RunStats)
 
 
 def _get_with_fallback(mapping: Dict[str, Any], key: str) -> Optional[Any]:
@@ -308,12 +344,7 @@ STAGE3_SCHEMA: Dict[str, Any] = {
 
 
 def _render_template(path: Path, **context: Any) -> str:
-    with open(path, "r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
-    sys_template = ENV.from_string(data.get("system", ""))
-    task_template = ENV.from_string(data.get("task", ""))
-    rendered = f"{sys_template.render(**context)}\n\n{task_template.render(**context)}".strip()
-    return rendered + "\n"
+    return render_prompt_file(path, **context)
 
 
 def _load_prompt_path(config: dict, stage_key: str) -> Path:
@@ -356,6 +387,7 @@ def _resolve_llm_settings(config: dict, stage_key: str) -> LLMSettings:
 
     provider_options = _lookup("provider_options", {}) or {}
     options = provider_options.get(provider)
+    rpm = _lookup("max_requests_per_minute")
 
     return LLMSettings(
         provider=provider,
@@ -364,7 +396,81 @@ def _resolve_llm_settings(config: dict, stage_key: str) -> LLMSettings:
         timeout=timeout,
         retries=retries,
         options=options,
+        max_requests_per_minute=int(rpm) if rpm else None,
+        response_cache=_lookup("response_cache"),
+    )
+
+
+def _call_llm(llm_settings: LLMSettings, prompt: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    if llm_settings.max_requests_per_minute:
+        _rate_limiter(llm_settings.provider, llm_settings.max_requests_per_minute).acquire()
+    return call_with_schema(
+        provider=llm_settings.provider,
+        prompt=prompt,
+        model=llm_settings.model,
+        schema=schema,
+        temperature=llm_settings.temperature,
+        timeout=llm_settings.timeout,
+        retries=llm_settings.retries,
+        options=llm_settings.options,
+        cache=response_cache_from_config(llm_settings.response_cache),
+        cache_bypass=bypass_from_config(llm_settings.response_cache),
+    )
+
+
+def _stage_fingerprint(prompt: str, llm_settings: LLMSettings, schema: Dict[str, Any]) -> str:
+    """Hash everything that determines a stage's LLM output.
+
+    The rendered prompt already embeds the stage input (bundle, facts or selection)
+    and the prompt template, so together with the model settings, provider options
+    (e.g. ``base_url``) and schema it identifies the call exactly.
+    """
+    payload = json.dumps(
+        {
+            "prompt": prompt,
+            "provider": llm_settings.provider,
+            "model": llm_settings.model,
+            "temperature": llm_settings.temperature,
+            "options": llm_settings.options or {},
+            "schema": schema,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _fingerprint_path(artifact_path: Path) -> Path:
+    return artifact_path.with_name(artifact_path.stem + ".sha256")
+
+
+def _resume_enabled(config: dict) -> bool:
+    return bool(config.get("multistage", {}).get("resume", False))
+
+
+def _load_resumable_artifact(artifact_path: Path, fingerprint: str, model_cls: Any) -> Optional[Any]:
+    """Return the stored stage output if its recorded fingerprint matches, else ``None``."""
+    fp_path = _fingerprint_path(artifact_path)
+    if not artifact_path.exists() or not fp_path.exists():
+        return None
+    if fp_path.read_text(encoding="utf-8").strip() != fingerprint:
+        return None
+    try:
+        return model_cls.model_validate_json(artifact_path.read_text(encoding="utf-8"))
+    except (OSError, ValidationError) as exc:
+        logger.warning("Ignoring unreadable artifact %s: %s", artifact_path, exc)
+        return None
+
+
+def _write_artifact(artifact_path: Path, obj: Any, fingerprint: Optional[str] = None) -> None:
+    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+    artifact_path.write_text(
+        json.dumps(obj.model_dump(mode="json"), ensure_ascii=False, indent=2),
+        encoding="utf-8",
     )
+    if fingerprint:
+        _fingerprint_path(artifact_path).write_text(fingerprint, encoding="utf-8")
 
 
 def run_stage1_extract(bundle: ClusterBundle, config: dict, *, briefing_title: str, artifact_dir: Optional[Path] = None) -> ClusterFacts:
@@ -386,6 +492,14 @@ def run_stage1_extract(bundle: ClusterBundle, config: dict, *, briefing_title: s
         briefing_title=briefing_title,
     )
 
+    fingerprint = _stage_fingerprint(prompt, llm_settings, STAGE1_SCHEMA)
+    artifact_path = Path(artifact_dir) / f"{bundle.cluster_id}_stage1.json" if artifact_dir else None
+    if artifact_path and _resume_enabled(config):
+        resumed = _load_resumable_artifact(artifact_path, fingerprint, ClusterFacts)
+        if resumed is not None:
+            logger.info("Stage1 extract resumed from artifact: cluster=%s", bundle.cluster_id)
+            return resumed
+
     logger.info(
         "Stage1 extract: cluster=%s provider=%s model=%s",
         bundle.cluster_id,
@@ -393,16 +507,7 @@ def run_stage1_extract(bundle: ClusterBundle, config: dict, *, briefing_title: s
         llm_settings.model,
     )
 
-    result = call_with_schema(
-        provider=llm_settings.provider,
-        prompt=prompt,
-        model=llm_settings.model,
-        schema=STAGE1_SCHEMA,
-        temperature=llm_settings.temperature,
-        timeout=llm_settings.timeout,
-        retries=llm_settings.retries,
-        options=llm_settings.options,
-    )
+    result = _call_llm(llm_settings, prompt, STAGE1_SCHEMA)
 
     result.setdefault("cluster_id", bundle.cluster_id)
     result.setdefault("facts", [])
@@ -410,13 +515,8 @@ def run_stage1_extract(bundle: ClusterBundle, config: dict, *, briefing_title: s
 
     cluster_facts = ClusterFacts.model_validate(result)
 
-    if artifact_dir:
-        artifact_path = Path(artifact_dir) / f"{bundle.cluster_id}_stage1.json"
-        artifact_path.parent.mkdir(parents=True, exist_ok=True)
-        artifact_path.write_text(
-            json.dumps(cluster_facts.model_dump(mode="json"), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+    if artifact_path:
+        _write_artifact(artifact_path, cluster_facts, fingerprint)
 
     logger.info(
         "Stage1 extract complete: cluster=%s facts=%d rejected=%d",
@@ -453,6 +553,14 @@ def run_stage2_score(
         briefing_title=briefing_title,
     )
 
+    fingerprint = _stage_fingerprint(prompt, llm_settings, STAGE2_SCHEMA)
+    artifact_path = Path(artifact_dir) / f"{cluster_facts.cluster_id}_stage2.json" if artifact_dir else None
+    if artifact_path and _resume_enabled(config):
+        resumed = _load_resumable_artifact(artifact_path, fingerprint, ClusterSelection)
+        if resumed is not None:
+            logger.info("Stage2 score resumed from artifact: cluster=%s", cluster_facts.cluster_id)
+            return resumed
+
     logger.info(
         "Stage2 score: cluster=%s provider=%s model=%s",
         cluster_facts.cluster_id,
@@ -460,16 +568,7 @@ def run_stage2_score(
         llm_settings.model,
     )
 
-    raw = call_with_schema(
-        provider=llm_settings.provider,
-        prompt=prompt,
-        model=llm_settings.model,
-        schema=STAGE2_SCHEMA,
-        temperature=llm_settings.temperature,
-        timeout=llm_settings.timeout,
-        retries=llm_settings.retries,
-        options=llm_settings.options,
-    )
+    raw = _call_llm(llm_settings, prompt, STAGE2_SCHEMA)
 
     raw.setdefault("cluster_id", cluster_facts.cluster_id)
     raw.setdefault("picked", [])
@@ -482,13 +581,8 @@ def run_stage2_score(
 
     cluster_selection = ClusterSelection.model_validate(raw)
 
-    if artifact_dir:
-        artifact_path = Path(artifact_dir) / f"{cluster_selection.cluster_id}_stage2.json"
-        artifact_path.parent.mkdir(parents=True, exist_ok=True)
-        artifact_path.write_text(
-            json.dumps(cluster_selection.model_dump(mode="json"), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+    if artifact_path:
+        _write_artifact(artifact_path, cluster_selection, fingerprint)
 
     logger.info(
         "Stage2 score complete: cluster=%s picked=%d dropped=%d",
@@ -525,6 +619,15 @@ def run_stage3_compose(
         briefing_title=briefing_title,
     )
 
+    fingerprint = _stage_fingerprint(prompt, llm_settings, STAGE3_SCHEMA)
+    artifact_path = Path(artifact_dir) / f"{cluster_selection.cluster_id}_stage3.json" if artifact_dir else None
+    max_bullet_count = _max_bullets(config)
+    if artifact_path and _resume_enabled(config):
+        resumed = _load_resumable_artifact(artifact_path, fingerprint, TopicDraft)
+        if resumed is not None:
+            logger.info("Stage3 compose resumed from artifact: cluster=%s", cluster_selection.cluster_id)
+            return resumed.model_copy(update={"bullets": resumed.bullets[:max_bullet_count]})
+
     logger.info(
         "Stage3 compose: cluster=%s provider=%s model=%s",
         cluster_selection.cluster_id,
@@ -532,16 +635,7 @@ def run_stage3_compose(
         llm_settings.model,
     )
 
-    raw = call_with_schema(
-        provider=llm_settings.provider,
-        prompt=prompt,
-        model=llm_settings.model,
-        schema=STAGE3_SCHEMA,
-        temperature=llm_settings.temperature,
-        timeout=llm_settings.timeout,
-        retries=llm_settings.retries,
-        options=llm_settings.options,
-    )
+    raw = _call_llm(llm_settings, prompt, STAGE3_SCHEMA)
 
     raw.setdefault("topic_id", f"cluster-{cluster_selection.cluster_id}")
     raw.setdefault("bullets", [])
@@ -552,17 +646,11 @@ def run_stage3_compose(
 
     topic_draft = TopicDraft.model_validate(raw)
 
-    max_bullet_count = _max_bullets(config)
     if len(topic_draft.bullets) > max_bullet_count:
         topic_draft = topic_draft.model_copy(update={"bullets": topic_draft.bullets[:max_bullet_count]})
 
-    if artifact_dir:
-        artifact_path = Path(artifact_dir) / f"{cluster_selection.cluster_id}_stage3.json"
-        artifact_path.parent.mkdir(parents=True, exist_ok=True)
-        artifact_path.write_text(
-            json.dumps(topic_draft.model_dump(mode="json"), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+    if artifact_path:
+        _write_artifact(artifact_path, topic_draft, fingerprint)
 
     logger.info(
         "Stage3 compose complete: cluster=%s bullets=%d",
@@ -744,18 +832,71 @@ def run_stage4_finalize(
     briefing = Briefing.model_validate(briefing_payload)
 
     if artifact_dir:
-        artifact_path = Path(artifact_dir) / "stage4_briefing.json"
-        artifact_path.parent.mkdir(parents=True, exist_ok=True)
-        artifact_path.write_text(
-            json.dumps(briefing.model_dump(mode="json"), ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        _write_artifact(Path(artifact_dir) / "stage4_briefing.json", briefing)
 
     logger.info("Stage4 finalize complete: topics=%d", len(briefing.topics))
 
     return briefing
 
 
+ClusterResult = Tuple[Optional[ClusterFacts], Optional[ClusterSelection], Optional[TopicDraft]]
+
+
+def _max_concurrency(config: dict) -> int:
+    try:
+        value = int(config.get("multistage", {}).get("max_concurrency", 1))
+    except (TypeError, ValueError):
+        value = 1
+    return max(1, value)
+
+
+def _run_cluster_stages(
+    bundle: ClusterBundle,
+    config: dict,
+    *,
+    briefing_title: str,
+    artifact_dir: Optional[Path] = None,
+) -> ClusterResult:
+    """Run stage1 → stage2 → stage3 for one cluster; failures are logged, never raised."""
+
+    facts: Optional[ClusterFacts] = None
+    selection: Optional[ClusterSelection] = None
+    try:
+        facts = run_stage1_extract(
+            bundle,
+            config,
+            briefing_title=briefing_title,
+            artifact_dir=artifact_dir,
+        )
+
+        selection = run_stage2_score(
+            facts,
+            config,
+            briefing_title=briefing_title,
+            artifact_dir=artifact_dir,
+        )
+
+        if not selection.picked:
+            logger.info("Cluster %s skipped after scoring (no high-value facts)", bundle.cluster_id)
+            return facts, selection, None
+
+        topic = run_stage3_compose(
+            selection,
+            config,
+            briefing_title=briefing_title,
+            artifact_dir=artifact_dir,
+        )
+
+        if not topic.bullets:
+            logger.info("Cluster %s skipped after composition (empty bullets)", bundle.cluster_id)
+            return facts, selection, None
+
+        return facts, selection, topic
+    except Exception:  # noqa: BLE001
+        logger.exception("Cluster %s failed in multi-stage pipeline", bundle.cluster_id)
+        return facts, selection, None
+
+
 def run_multistage_pipeline(
     bundles: list[Any],
     config: dict,
@@ -789,6 +930,7 @@ def run_multistage_pipeline(
     selections_map: Dict[str, ClusterSelection] = {}
     topics_map: Dict[str, TopicDraft] = {}
     ordered_ids: list[str] = []
+    stats = run_stats.RunStats()
 
     for raw_bundle in bundles:
         try:
@@ -802,58 +944,43 @@ def run_multistage_pipeline(
 
         bundle_map[bundle.cluster_id] = bundle
         ordered_ids.append(bundle.cluster_id)
+
+    def run_cluster(cluster_id: str) -> ClusterResult:
+        bundle = bundle_map[cluster_id]
         cluster_dir = None
         if artifact_root:
-            cluster_dir = artifact_root / _safe_dir_name(bundle.cluster_id)
-
-        try:
-            facts = run_stage1_extract(
-                bundle,
-                config,
-                briefing_title=briefing_title,
-                artifact_dir=cluster_dir,
-            )
-            facts_map[bundle.cluster_id] = facts
-
-            selection = run_stage2_score(
-                facts,
-                config,
-                briefing_title=briefing_title,
-                artifact_dir=cluster_dir,
-            )
-            selections_map[bundle.cluster_id] = selection
-
-            if not selection.picked:
-                logger.info("Cluster %s skipped after scoring (no high-value facts)", bundle.cluster_id)
-                continue
-
-            topic = run_stage3_compose(
-                selection,
-                config,
-                briefing_title=briefing_title,
-                artifact_dir=cluster_dir,
-            )
-
-            if not topic.bullets:
-                logger.info("Cluster %s skipped after composition (empty bullets)", bundle.cluster_id)
-                continue
+            cluster_dir = artifact_root / _safe_dir_name(cluster_id)
+        with run_stats.collect(stats):
+            return _run_cluster_stages(bundle, config, briefing_title=briefing_title, artifact_dir=cluster_dir)
+
+    max_concurrency = _max_concurrency(config)
+    if max_concurrency > 1 and len(ordered_ids) > 1:
+        logger.info("Multi-stage clusters=%d max_concurrency=%d", len(ordered_ids), max_concurrency)
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="multistage") as pool:
+            results = list(pool.map(run_cluster, ordered_ids))
+    else:
+        results = [run_cluster(cid) for cid in ordered_ids]
 
-            topics_map[bundle.cluster_id] = topic
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Cluster %s failed in multi-stage pipeline", bundle.cluster_id)
-            continue
+    for cluster_id, (facts, selection, topic) in zip(ordered_ids, results):
+        if facts is not None:
+            facts_map[cluster_id] = facts
+        if selection is not None:
+            selections_map[cluster_id] = selection
+        if topic is not None:
+            topics_map[cluster_id] = topic
 
     ordered_topics = [topics_map[cid] for cid in ordered_ids if cid in topics_map]
 
-    briefing = run_stage4_finalize(
-        ordered_topics,
-        selections_map,
-        bundle_map,
-        config,
-        briefing_title=briefing_title,
-        briefing_date=briefing_date,
-        artifact_dir=artifact_root,
-    )
+    with run_stats.collect(stats):
+        briefing = run_stage4_finalize(
+            ordered_topics,
+            selections_map,
+            bundle_map,
+            config,
+            briefing_title=briefing_title,
+            briefing_date=briefing_date,
+            artifact_dir=artifact_root,
+        )
 
     state = PipelineState(
         bundles=bundle_map,
@@ -861,6 +988,7 @@ def run_multistage_pipeline(
         selections=selections_map,
         topics=topics_map,
         artifact_root=artifact_root,
+        stats=stats,
     )
 
     return briefing, state
@@ -893,6 +1021,10 @@ def compute_metrics(state: PipelineState, briefing: Briefing, config: Optional[d
     agentic_topics = sum(1 for topic in state.topics.values() if topic.annotations.get("agentic"))
     strategic_topics = sum(1 for topic in state.topics.values() if topic.annotations.get("strategic"))
 
+    counts = state.stats.snapshot()
+    cache_hits = counts.get("llm_cache.hits", 0)
+    cache_lookups = cache_hits + counts.get("llm_cache.misses", 0)
+
     return {
         "clusters_total": len(state.bundles),
         "topics_final": len(briefing.topics),
@@ -905,4 +1037,10 @@ def compute_metrics(state: PipelineState, briefing: Briefing, config: Optional[d
         "agentic_topics": agentic_topics,
         "strategic_topics": strategic_topics,
         "json_repair_rate": 0.0,
+        "llm_clients_created": counts.get("llm_clients.created", 0),
+        "llm_client_reuses": counts.get("llm_clients.reused", 0),
+        "llm_cache_hits": cache_hits,
+        "llm_cache_hit_rate": (cache_hits / cache_lookups) if cache_lookups else 0.0,
+        "prompt_template_compiles": counts.get("prompt_templates.compiles", 0),
+        "prompt_render_ms": round(counts.get("prompt_templates.render_ms", 0.0), 1),
     }
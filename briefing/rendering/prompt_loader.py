@@ -1,17 +1,67 @@
 
 # briefing/rendering/prompt_loader.py
-import json, yaml
-from jinja2 import Environment
+import json, os, threading, time
+from typing import Any, Dict, Tuple
 
-def render_prompt(briefing_title: str, bundles, prompt_file: str) -> str:
-    with open(prompt_file, "r", encoding="utf-8") as f:
+import yaml
+from jinja2 import Environment, Template
+
+from briefing import run_stats
+
+ENV = Environment(autoescape=False, trim_blocks=True, lstrip_blocks=True)
+
+# path -> ((mtime_ns, size), system_template, task_template)
+_TEMPLATES: Dict[str, Tuple[Tuple[int, int], Template, Template]] = {}
+_TEMPLATES_LOCK = threading.Lock()
+_STATS = {"compiles": 0, "hits": 0, "renders": 0, "render_ms": 0.0}
+
+
+def load_prompt_templates(prompt_file) -> Tuple[Template, Template]:
+    """Return compiled (system, task) templates for a prompt YAML file.
+
+    Files are parsed and compiled once per process and recompiled only when their
+    mtime or size changes, so prompt edits still apply to a long-running worker.
+    """
+    path = os.path.abspath(os.fspath(prompt_file))
+    st = os.stat(path)
+    version = (st.st_mtime_ns, st.st_size)
+    with _TEMPLATES_LOCK:
+        cached = _TEMPLATES.get(path)
+        if cached and cached[0] == version:
+            _STATS["hits"] += 1
+            run_stats.record("prompt_templates.hits")
+            return cached[1], cached[2]
+    with open(path, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f) or {}
-    env = Environment(autoescape=False, trim_blocks=True, lstrip_blocks=True)
-    bundles_json = json.dumps(bundles, ensure_ascii=False, indent=2)
-    sys_t = env.from_string(data.get("system", ""))
-    task_t = env.from_string(data.get("task", ""))
-    sys_part = sys_t.render(briefing_title=briefing_title, bundles_json=bundles_json)
-    task_part = task_t.render(briefing_title=briefing_title, bundles_json=bundles_json)
-    return (sys_part + "\n\n" + task_part).strip() + "\n"
+    sys_t = ENV.from_string(data.get("system", ""))
+    task_t = ENV.from_string(data.get("task", ""))
+    with _TEMPLATES_LOCK:
+        _TEMPLATES[path] = (version, sys_t, task_t)
+        _STATS["compiles"] += 1
+    run_stats.record("prompt_templates.compiles")
+    return sys_t, task_t
+
+
+def render_prompt_file(prompt_file, **context: Any) -> str:
+    """Render the system and task parts of a prompt file with ``context``."""
+    sys_t, task_t = load_prompt_templates(prompt_file)
+    st = time.perf_counter()
+    rendered = f"{sys_t.render(**context)}\n\n{task_t.render(**context)}".strip() + "\n"
+    render_ms = (time.perf_counter() - st) * 1000
+    with _TEMPLATES_LOCK:
+        _STATS["renders"] += 1
+        _STATS["render_ms"] += render_ms
+    run_stats.record("prompt_templates.renders")
+    run_stats.record("prompt_templates.render_ms", render_ms)
+    return rendered
+
 
+def template_stats() -> Dict[str, float]:
+    """Compile/hit counts and cumulative render time for prompt templates."""
+    with _TEMPLATES_LOCK:
+        return dict(_STATS)
 
+
+def render_prompt(briefing_title: str, bundles, prompt_file: str) -> str:
+    bundles_json = json.dumps(bundles, ensure_ascii=False, indent=2)
+    return render_prompt_file(prompt_file, briefing_title=briefing_title, bundles_json=bundles_json)
@@ -0,0 +1,79 @@
+"""Per-run counters for process-wide caches and pools.
+
+HTTP/LLM caches, LLM clients and prompt templates are shared by every briefing in
+the process, so their own counters mix runs when the daemon runs several at once.
+Code touching them also calls :func:`record`, which adds to the run active in the
+current context (see :func:`collect`) and is a no-op outside a run.
+"""
+
+import contextvars
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class RunStats:
+    """Thread-safe named counters for one briefing run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, float] = {}
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + value
+
+    def get(self, name: str, default: float = 0) -> float:
+        with self._lock:
+            return self._counts.get(name, default)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._counts)
+
+
+_CURRENT: contextvars.ContextVar[Optional[RunStats]] = contextvars.ContextVar("briefing_run_stats", default=None)
+
+
+def current() -> Optional[RunStats]:
+    """Return the stats of the run active in this context, if any."""
+    return _CURRENT.get()
+
+
+def record(name: str, value: float = 1) -> None:
+    """Add ``value`` to counter ``name`` of the active run, if any."""
+    stats = _CURRENT.get()
+    if stats is not None:
+        stats.add(name, value)
+
+
+@contextmanager
+def collect(stats: Optional[RunStats] = None) -> Iterator[RunStats]:
+    """Make ``stats`` (or a fresh :class:`RunStats`) the active run in this context."""
+    stats = stats if stats is not None else RunStats()
+    token = _CURRENT.set(stats)
+    try:
+        yield stats
+    finally:
+        _CURRENT.reset(token)
+
+
+def propagate(fn: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``fn`` so pool workers record into the caller's run.
+
+    Worker threads do not inherit context variables, so wrap callables before
+    handing them to a :class:`~concurrent.futures.ThreadPoolExecutor`.
+    """
+    stats = _CURRENT.get()
+    if stats is None:
+        return fn
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with collect(stats):
+            return fn(*args, **kwargs)
+
+    return wrapper
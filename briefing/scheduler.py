@@ -0,0 +1,189 @@
+"""In-process scheduler that runs several briefings on cron schedules.
+
+One long-lived process keeps imported libraries, loaded rerankers, pooled HTTP
+and LLM clients and on-disk cache handles warm between runs, instead of paying
+for them again in a fresh process per briefing.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from briefing.utils import get_logger
+
+logger = get_logger(__name__)
+
+# (minimum, maximum) per cron field: minute hour day-of-month month day-of-week
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(expr: str, lo: int, hi: int) -> Set[int]:
+    values: Set[int] = set()
+    for part in expr.split(","):
+        step = 1
+        if "/" in part:
+            part, step_s = part.split("/", 1)
+            step = int(step_s)
+            if step < 1:
+                raise ValueError(f"invalid cron step: {expr!r}")
+        if part == "*":
+            start, stop = lo, hi
+        elif "-" in part:
+            a, b = part.split("-", 1)
+            start, stop = int(a), int(b)
+        else:
+            start = int(part)
+            stop = hi if step > 1 else start
+        if start < lo or stop > hi or start > stop:
+            raise ValueError(f"cron value out of range {lo}-{hi}: {expr!r}")
+        values.update(range(start, stop + 1, step))
+    return values
+
+
+class CronSchedule:
+    """Standard five-field cron expression (``minute hour dom month dow``).
+
+    Supports ``*``, numbers, ranges, lists and ``/step``; day-of-week 0 and 7 are
+    Sunday. As in cron, when both day fields are restricted a day matches if
+    either of them does.
+    """
+
+    def __init__(self, expr: str) -> None:
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression needs 5 fields: {expr!r}")
+        self.expr = expr
+        parsed = [_parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, _FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, dows = parsed
+        self.weekdays = {d % 7 for d in dows}
+        self._dom_any = fields[2] == "*"
+        self._dow_any = fields[4] == "*"
+
+    def _day_matches(self, day: dt.datetime) -> bool:
+        dom_ok = day.day in self.days
+        dow_ok = (day.weekday() + 1) % 7 in self.weekdays
+        if self._dom_any or self._dow_any:
+            return dom_ok and dow_ok
+        return dom_ok or dow_ok
+
+    def next_after(self, after: dt.datetime) -> dt.datetime:
+        """First matching minute strictly after ``after``."""
+        t = after.replace(second=0, microsecond=0) + dt.timedelta(minutes=1)
+        limit = t + dt.timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + dt.timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + dt.timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + dt.timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += dt.timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"cron expression never fires: {self.expr!r}")
+
+
+@dataclass
+class ScheduledBriefing:
+    config_path: Path
+    schedule: CronSchedule
+    next_run: dt.datetime
+    running: bool = False
+    runs: int = 0
+    failures: int = 0
+
+
+@dataclass
+class BriefingScheduler:
+    """Run ``runner(config_path)`` for each briefing whenever its schedule fires.
+
+    At most ``max_parallel`` briefings run at once and a briefing never overlaps
+    with its own previous run (a fire while it is still running is skipped).
+    Exceptions from one run are logged and counted without affecting others.
+    """
+
+    briefings: List[ScheduledBriefing]
+    runner: Callable[[Path], None]
+    max_parallel: int = 2
+    clock: Callable[[], dt.datetime] = dt.datetime.now
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    _pool: Optional[ThreadPoolExecutor] = field(default=None, init=False)
+
+    def _run(self, job: ScheduledBriefing) -> None:
+        st = time.monotonic()
+        try:
+            self.runner(job.config_path)
+            ok = True
+        except Exception as exc:
+            logger.error("scheduler: briefing %s failed: %s", job.config_path.name, exc)
+            ok = False
+        with self._lock:
+            job.running = False
+            job.runs += 1
+            job.failures += 0 if ok else 1
+        logger.info(
+            "scheduler: finished config=%s ok=%s took_ms=%d next_run=%s",
+            job.config_path.name, ok, int((time.monotonic() - st) * 1000), job.next_run.isoformat(),
+        )
+
+    def tick(self) -> List[Future]:
+        """Submit every briefing that is due and advance its next fire time."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=max(1, self.max_parallel), thread_name_prefix="briefing")
+        now = self.clock()
+        submitted: List[Future] = []
+        for job in self.briefings:
+            with self._lock:
+                if job.next_run > now:
+                    continue
+                job.next_run = job.schedule.next_after(now)
+                if job.running:
+                    logger.warning("scheduler: skip %s, previous run still in progress", job.config_path.name)
+                    continue
+                job.running = True
+            logger.info("scheduler: start config=%s", job.config_path.name)
+            submitted.append(self._pool.submit(self._run, job))
+        return submitted
+
+    def seconds_until_next(self) -> float:
+        with self._lock:
+            nxt = min(job.next_run for job in self.briefings)
+        return max(0.0, (nxt - self.clock()).total_seconds())
+
+    def run_forever(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        logger.info(
+            "scheduler: started briefings=%d max_parallel=%d",
+            len(self.briefings), self.max_parallel,
+        )
+        try:
+            while not stop.is_set():
+                self.tick()
+                # wake at least once a minute so clock jumps are picked up
+                stop.wait(min(60.0, self.seconds_until_next()) or 1.0)
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+            logger.info("scheduler: stopped")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                job.config_path.name: {"runs": job.runs, "failures": job.failures}
+                for job in self.briefings
+            }
+
+
+def schedule_briefing(config_path: Path, expr: str, *, now: Optional[dt.datetime] = None) -> ScheduledBriefing:
+    """Build a :class:`ScheduledBriefing` whose first run is the next fire after ``now``."""
+    cron = CronSchedule(expr)
+    job = ScheduledBriefing(Path(config_path), cron, cron.next_after(now or dt.datetime.now()))
+    logger.info("scheduler: %s schedule=%r next_run=%s", job.config_path.name, expr, job.next_run.isoformat())
+    return job
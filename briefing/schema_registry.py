@@ -0,0 +1,113 @@
+"""Process-wide registry of JSON schemas, their validators and LLM dialects.
+
+Schemas are loaded from ``briefing/schemas`` once, checked against the
+metaschema once, and converted to the Gemini/OpenAI structured-output dialects
+once per distinct content. Everything is keyed by a content hash, so an edited
+schema (or a different in-memory dict) gets its own entry while repeated calls
+with the same schema are dictionary lookups. Returned dicts are shared and must
+be treated as read-only.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from jsonschema import Draft202012Validator
+
+from briefing.llm.schema_adapter import to_gemini, to_openai
+
+SCHEMA_DIR = Path(__file__).resolve().parent / "schemas"
+
+_CONVERTERS: Dict[str, Callable[[dict], dict]] = {
+    "gemini": to_gemini,
+    "openai": to_openai,
+}
+
+_LOCK = threading.Lock()
+_FILES: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+_VALIDATORS: Dict[str, Draft202012Validator] = {}
+_DIALECTS: Dict[Tuple[str, str], dict] = {}
+_STATS = {"loads": 0, "validators_built": 0, "conversions": 0, "hits": 0}
+
+
+def schema_digest(schema: dict) -> str:
+    """Stable content hash of a schema dict.
+
+    Key order is part of the content: the Gemini conversion derives
+    ``propertyOrdering`` from it.
+    """
+    payload = json.dumps(schema, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_schema(name: str) -> dict:
+    """Return the parsed schema ``briefing/schemas/<name>``.
+
+    The file is re-read only when its mtime or size changes.
+    """
+    path = SCHEMA_DIR / name
+    st = path.stat()
+    version = (st.st_mtime_ns, st.st_size)
+    with _LOCK:
+        cached = _FILES.get(name)
+        if cached and cached[0] == version:
+            _STATS["hits"] += 1
+            return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    with _LOCK:
+        _FILES[name] = (version, schema)
+        _STATS["loads"] += 1
+    return schema
+
+
+def validator_for(schema: dict) -> Draft202012Validator:
+    """Return a Draft 2020-12 validator for ``schema``, built and checked once."""
+    key = schema_digest(schema)
+    with _LOCK:
+        validator = _VALIDATORS.get(key)
+        if validator is not None:
+            _STATS["hits"] += 1
+            return validator
+    Draft202012Validator.check_schema(schema)
+    validator = Draft202012Validator(schema)
+    with _LOCK:
+        _VALIDATORS[key] = validator
+        _STATS["validators_built"] += 1
+    return validator
+
+
+def provider_schema(provider: str, schema: dict) -> dict:
+    """Return ``schema`` converted to the structured-output dialect of ``provider``."""
+    provider = provider.lower()
+    convert = _CONVERTERS.get(provider)
+    if convert is None:
+        raise ValueError(f"Unknown provider: {provider}")
+    key = (provider, schema_digest(schema))
+    with _LOCK:
+        converted = _DIALECTS.get(key)
+        if converted is not None:
+            _STATS["hits"] += 1
+            return converted
+    converted = convert(schema)
+    with _LOCK:
+        _DIALECTS[key] = converted
+        _STATS["conversions"] += 1
+    return converted
+
+
+def registry_stats() -> Dict[str, Any]:
+    """Counters for schema loads, validator builds, conversions and cache hits."""
+    with _LOCK:
+        return dict(_STATS)
+
+
+def reset_registry() -> None:
+    """Forget every cached schema, validator and conversion."""
+    with _LOCK:
+        _FILES.clear()
+        _VALIDATORS.clear()
+        _DIALECTS.clear()
+        _STATS.update(loads=0, validators_built=0, conversions=0, hits=0)
@@ -0,0 +1,126 @@
+"""Rolling per-briefing index of previously published items for cross-run dedup."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from briefing.ann import normalize_rows
+from briefing.utils import get_logger
+
+logger = get_logger(__name__)
+
+SEEN_ITEMS_DIR_DEFAULT = os.getenv("SEEN_ITEMS_DIR", "/workspace/cache/seen")
+
+
+class SeenItemsIndex:
+    """URLs and embeddings of items from the last ``max_runs`` published runs.
+
+    Each published run is stored as one ``run-<ts>-<run_id>.npz`` file under
+    ``<root>/<briefing_id>/``; only the newest ``max_runs`` files are kept. Items
+    are staged during processing and persisted by :meth:`commit` once the run's
+    output has actually been written, so failed runs never suppress content.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        briefing_id: str,
+        *,
+        max_runs: int = 24,
+        sim_threshold: float = 0.92,
+        mode: str = "drop",
+    ) -> None:
+        self.dir = Path(root) / briefing_id
+        self.max_runs = max(1, int(max_runs))
+        self.sim_threshold = float(sim_threshold)
+        self.mode = mode
+        self._urls: set[str] = set()
+        self._embs: Optional[np.ndarray] = None
+        self._staged_urls: List[str] = []
+        self._staged_embs: List[np.ndarray] = []
+        self._load()
+
+    def _run_files(self) -> List[Path]:
+        if not self.dir.exists():
+            return []
+        return sorted(self.dir.glob("run-*.npz"))
+
+    def _load(self) -> None:
+        blocks: List[np.ndarray] = []
+        for path in self._run_files()[-self.max_runs:]:
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    self._urls.update(data["urls"].tolist())
+                    if data["embs"].size:
+                        blocks.append(data["embs"].astype(np.float32))
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("seen index: skip unreadable %s: %s", path.name, exc)
+        dims = {b.shape[1] for b in blocks}
+        if len(dims) > 1:
+            latest = blocks[-1].shape[1]
+            blocks = [b for b in blocks if b.shape[1] == latest]
+        if blocks:
+            self._embs = normalize_rows(np.concatenate(blocks, axis=0))
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def seen_mask(self, items: List[Dict[str, Any]], embs: np.ndarray) -> List[bool]:
+        """Return ``True`` for items already covered by a previous run (URL or embedding match)."""
+
+        seen = [bool(it.get("url")) and it.get("url") in self._urls for it in items]
+        if self._embs is not None and len(items) and embs.shape[1] == self._embs.shape[1]:
+            max_sims = (normalize_rows(embs) @ self._embs.T).max(axis=1)
+            seen = [s or bool(m >= self.sim_threshold) for s, m in zip(seen, max_sims)]
+        return seen
+
+    def stage(self, items: List[Dict[str, Any]], embs: np.ndarray) -> None:
+        """Remember items processed in this run until :meth:`commit`."""
+
+        for it, emb in zip(items, embs):
+            self._staged_urls.append(str(it.get("url") or ""))
+            self._staged_embs.append(np.asarray(emb, dtype=np.float32))
+
+    def commit(self, run_id: str) -> Optional[Path]:
+        """Persist staged items as a new run and prune runs beyond ``max_runs``."""
+
+        if not self._staged_urls:
+            return None
+        self.dir.mkdir(parents=True, exist_ok=True)
+        path = self.dir / f"run-{int(time.time())}-{run_id}.npz"
+        np.savez(
+            path,
+            urls=np.array(self._staged_urls, dtype=str),
+            embs=np.stack(self._staged_embs),
+        )
+        stale = self._run_files()[:-self.max_runs]
+        for old in stale:
+            old.unlink(missing_ok=True)
+        logger.info(
+            "seen index: recorded items=%d run=%s pruned_runs=%d",
+            len(self._staged_urls),
+            run_id,
+            len(stale),
+        )
+        self._staged_urls, self._staged_embs = [], []
+        return path
+
+
+def from_config(briefing_id: str, processing_cfg: Dict[str, Any]) -> Optional[SeenItemsIndex]:
+    """Build a :class:`SeenItemsIndex` from ``processing.seen_items`` or return ``None``."""
+
+    seen_cfg = (processing_cfg or {}).get("seen_items") or {}
+    if not seen_cfg.get("enabled", False):
+        return None
+    return SeenItemsIndex(
+        seen_cfg.get("dir") or SEEN_ITEMS_DIR_DEFAULT,
+        briefing_id,
+        max_runs=int(seen_cfg.get("max_runs", 24)),
+        sim_threshold=float(seen_cfg.get("sim_threshold", processing_cfg.get("sim_near_dup", 0.92))),
+        mode=seen_cfg.get("mode", "drop"),
+    )
@@ -1,15 +1,26 @@
 
+import re
 import time
 import datetime as dt
 import requests
-from typing import List, Dict, Any
-from briefing.utils import clean_text, get_logger, normalize_http_url
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+from briefing.hn_item_store import HNItemStore, from_config as item_store_from_config
+from briefing import run_stats
+from briefing.net import cached_session
+from briefing.utils import clean_text, get_logger, normalize_http_url, latency_summary
 
 logger = get_logger(__name__)
 
 BASE = "https://hacker-news.firebaseio.com/v0"
+DEFAULT_CONCURRENCY = 8
+# full item documents only; listings and item/<id>/score.json must stay live
+_ITEM_URL_RE = re.compile(r"/item/\d+\.json$")
 
-def _story_ids(story_type: str) -> List[int]:
+def _is_item_url(url: str) -> bool:
+    return bool(_ITEM_URL_RE.search(url))
+
+def _story_ids(story_type: str, session: Optional[requests.Session] = None) -> List[int]:
     if story_type == "new":
         path = "newstories"
     elif story_type == "best":
@@ -17,53 +28,147 @@ def _story_ids(story_type: str) -> List[int]:
     else:
         path = "topstories"
     url = f"{BASE}/{path}.json"
-    r = requests.get(url, timeout=20)
+    r = (session or requests).get(url, timeout=20)
     r.raise_for_status()
     return r.json() or []
 
-def _get_item(item_id: int) -> dict:
+def _get_item(item_id: int, session: Optional[requests.Session] = None) -> dict:
     url = f"{BASE}/item/{item_id}.json"
-    r = requests.get(url, timeout=20)
+    r = (session or requests).get(url, timeout=20)
     r.raise_for_status()
     return r.json() or {}
 
-def fetch(source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _get_item_field(item_id: int, field: str, session: Optional[requests.Session] = None) -> Any:
+    """Fetch a single field of an item (Firebase child path), e.g. its current score."""
+    url = f"{BASE}/item/{item_id}/{field}.json"
+    r = (session or requests).get(url, timeout=20)
+    r.raise_for_status()
+    return r.json()
+
+def _to_item(sid: int, js: dict) -> Optional[Dict[str, Any]]:
+    if not js or js.get("type") != "story":
+        return None
+    title = js.get("title") or ""
+    text = js.get("text") or ""
+    # URL processing with validation
+    raw_url = js.get("url") or f"https://news.ycombinator.com/item?id={sid}"
+    url = normalize_http_url(raw_url)
+    if not url:
+        logger.warning("hackernews_adapter: drop item %s due to invalid url", sid)
+        return None
+
+    author = js.get("by") or "Unknown"
+    created = js.get("time", int(time.time()))
+    ts = dt.datetime.utcfromtimestamp(created).replace(tzinfo=dt.timezone.utc)
+
+    content = clean_text(f"{title}\n\n{text}")
+    if not content:
+        logger.warning("hackernews_adapter: drop item %s due to empty content after cleaning", sid)
+        return None
+
+    return {
+        "id": str(sid),
+        "text": content,
+        "url": url,
+        "author": author,
+        "timestamp": ts.isoformat(),
+        "metadata": {"source": "hackernews", "score": js.get("score")}
+    }
+
+def _iter_items_concurrently(
+    ids: List[int],
+    session: requests.Session,
+    concurrency: int,
+    store: Optional[HNItemStore] = None,
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]]]]:
+    """Yield normalized items (``None`` when dropped) with bounded concurrency, preserving ``ids`` order.
+
+    Items are yielded as soon as they and every earlier id have resolved, so a
+    consumer can start working before the slowest request finishes. Transient
+    429/5xx responses are retried by the session; items that still fail are
+    logged and yielded as ``None`` so one bad story never aborts the run.
+
+    With a ``store``, ids it still trusts are served from it and only get their
+    score refreshed once it is stale; everything else is fetched and stored.
+    Dropped ids are stored as tombstones so they are not fetched every run.
+    """
+
+    latencies_ms: List[float] = []
+    failures = 0
+    outcomes = {"fetched": 0, "reused": 0, "score_refreshed": 0, "tombstoned": 0}
+
+    def fetch_one(sid: int) -> Tuple[int, Optional[Dict[str, Any]], float, bool, str]:
+        st = time.monotonic()
+        outcome = "fetched"
+        try:
+            cached = store.get(sid) if store is not None else None
+            if cached is not None:
+                item = cached["item"]
+                outcome = "reused" if item is not None else "tombstoned"
+                if cached["needs_score"]:
+                    try:
+                        store.update_score(sid, item, _get_item_field(sid, "score", session))
+                        outcome = "score_refreshed"
+                    except (requests.RequestException, ValueError) as exc:
+                        logger.warning("hackernews_adapter: score refresh %s failed, keeping stored: %s", sid, exc)
+            else:
+                js = _get_item(sid, session)
+                item = _to_item(sid, js)
+                # an empty body is an item not yet propagated, not a drop
+                if store is not None and (item is not None or js):
+                    store.put(sid, item)
+            ok = True
+        except (requests.RequestException, ValueError) as exc:
+            logger.warning("hackernews_adapter: fetch item %s failed: %s", sid, exc)
+            item, ok = None, False
+        return sid, item, (time.monotonic() - st) * 1000, ok, outcome
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for sid, item, took_ms, ok, outcome in pool.map(run_stats.propagate(fetch_one), ids):
+            if outcome not in ("reused", "tombstoned"):
+                latencies_ms.append(took_ms)
+            failures += 0 if ok else 1
+            outcomes[outcome] += 1 if ok else 0
+            yield sid, item
+
+    pruned = store.prune() if store is not None else 0
+    stats = latency_summary(latencies_ms)
+    logger.info(
+        "hackernews_adapter item_fetch count=%d failed=%d fetched=%d reused=%d score_refreshed=%d tombstoned=%d "
+        "pruned=%d concurrency=%d p50_ms=%d p95_ms=%d max_ms=%d",
+        len(ids), failures, outcomes["fetched"], outcomes["reused"], outcomes["score_refreshed"],
+        outcomes["tombstoned"], pruned,
+        concurrency, stats["p50"], stats["p95"], stats["max"],
+    )
+
+def iter_batches(source_config: Dict[str, Any], batch_size: int = 16) -> Iterator[List[Dict[str, Any]]]:
+    """Yield normalized items in source order, ``batch_size`` at a time, while fetching continues."""
     story_type = source_config.get("hn_story_type", "top")
     limit = int(source_config.get("hn_limit", 50))
-    ids = _story_ids(story_type)[:limit]
+    concurrency = max(1, int(source_config.get("hn_concurrency", DEFAULT_CONCURRENCY)))
+    batch_size = max(1, int(batch_size))
 
-    items: List[Dict[str, Any]] = []
-    for sid in ids:
-        js = _get_item(sid)
-        if not js or js.get("type") != "story":
-            continue
-        title = js.get("title") or ""
-        text = js.get("text") or ""
-        # URL processing with validation
-        raw_url = js.get("url") or f"https://news.ycombinator.com/item?id={sid}"
-        url = normalize_http_url(raw_url)
-        if not url:
-            logger.warning("hackernews_adapter: drop item %s due to invalid url", sid)
-            continue
-
-        author = js.get("by") or "Unknown"
-        created = js.get("time", int(time.time()))
-        ts = dt.datetime.utcfromtimestamp(created).replace(tzinfo=dt.timezone.utc)
+    session = cached_session(
+        source_config.get("http_cache"), pool_maxsize=concurrency, min_fresh_for=_is_item_url
+    )
+    store = item_store_from_config(source_config.get("hn_store"))
+    ids = _story_ids(story_type, session)[:limit]
 
-        content = clean_text(f"{title}\n\n{text}")
-        if not content:
-            logger.warning("hackernews_adapter: drop item %s due to empty content after cleaning", sid)
+    total = 0
+    batch: List[Dict[str, Any]] = []
+    for sid, item in _iter_items_concurrently(ids, session, concurrency, store):
+        if item is None:
             continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            total += len(batch)
+            yield batch
+            batch = []
+    if batch:
+        total += len(batch)
+        yield batch
 
-        items.append({
-            "id": str(sid),
-            "text": content,
-            "url": url,
-            "author": author,
-            "timestamp": ts.isoformat(),
-            "metadata": {"source": "hackernews", "score": js.get("score")}
-        })
-
-    logger.info("hackernews_adapter fetched_items=%d type=%s", len(items), story_type)
-    return items
+    logger.info("hackernews_adapter fetched_items=%d type=%s", total, story_type)
 
+def fetch(source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [it for batch in iter_batches(source_config) for it in batch]
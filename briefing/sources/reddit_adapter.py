@@ -1,16 +1,22 @@
-
 import os
+import time
+import threading
 import datetime as dt
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import praw
 
-from briefing.utils import clean_text, get_logger
+from briefing.utils import clean_text, get_logger, latency_summary
 
 CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
 CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 USER_AGENT = os.getenv("REDDIT_USER_AGENT", "ai-briefing/1.0")
 logger = get_logger(__name__)
 
+# Reddit allows ~100 OAuth requests/minute and one listing of <=100 posts is a
+# single request, so a handful of parallel listings stays well inside the budget.
+DEFAULT_CONCURRENCY = 4
+
 def _client():
     if not (CLIENT_ID and CLIENT_SECRET and USER_AGENT):
         raise RuntimeError("Reddit credentials missing. Please set REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT")
@@ -20,38 +26,81 @@ def _client():
         user_agent=USER_AGENT
     )
 
-def fetch(source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+def _fetch_subreddit(reddit, sub: str, sort_by: str, time_window: str, limit: int) -> List[Dict[str, Any]]:
+    sr = reddit.subreddit(sub)
+    if sort_by == "new":
+        posts = sr.new(limit=limit)
+    elif sort_by == "hot":
+        posts = sr.hot(limit=limit)
+    elif sort_by == "rising":
+        posts = sr.rising(limit=limit)
+    else:
+        posts = sr.top(time_filter=time_window, limit=limit)
+
+    items: List[Dict[str, Any]] = []
+    for p in posts:
+        text = clean_text(f"{p.title}\n\n{p.selftext or ''}")
+        created = dt.datetime.utcfromtimestamp(p.created_utc).replace(tzinfo=dt.timezone.utc)
+        items.append({
+            "id": p.id,
+            "text": text,
+            "url": f"https://www.reddit.com{p.permalink}",
+            "author": str(p.author) if p.author else "Unknown",
+            "timestamp": created.isoformat(),
+            "metadata": {"source": "reddit", "subreddit": sub}
+        })
+    return items
+
+def iter_batches(source_config: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield each subreddit's posts, in ``subreddits`` order, while later listings are still loading.
+
+    Listings are pulled in parallel (``reddit_concurrency``). PRAW is not
+    thread-safe, so every worker thread authenticates its own client once and
+    reuses it for the subreddits it picks up. As before, a failing listing fails
+    the fetch: its error is re-raised once the listings before it are yielded.
+    """
     subreddits = source_config.get("subreddits", [])
     sort_by = source_config.get("sort_by", "top")
     time_window = source_config.get("time_window", "day")
     limit = int(source_config.get("limit_per_subreddit", 20))
+    concurrency = max(1, int(source_config.get("reddit_concurrency", DEFAULT_CONCURRENCY)))
 
-    reddit = _client()
-    items: List[Dict[str, Any]] = []
+    local = threading.local()
+    latencies_ms: List[float] = []
+    total = 0
 
-    for sub in subreddits:
-        sr = reddit.subreddit(sub)
-        if sort_by == "new":
-            posts = sr.new(limit=limit)
-        elif sort_by == "hot":
-            posts = sr.hot(limit=limit)
-        elif sort_by == "rising":
-            posts = sr.rising(limit=limit)
-        else:
-            posts = sr.top(time_filter=time_window, limit=limit)
-
-        for p in posts:
-            text = clean_text(f"{p.title}\n\n{p.selftext or ''}")
-            created = dt.datetime.utcfromtimestamp(p.created_utc).replace(tzinfo=dt.timezone.utc)
-            items.append({
-                "id": p.id,
-                "text": text,
-                "url": f"https://www.reddit.com{p.permalink}",
-                "author": str(p.author) if p.author else "Unknown",
-                "timestamp": created.isoformat(),
-                "metadata": {"source": "reddit", "subreddit": sub}
-            })
-
-    logger.info("reddit_adapter fetched_items=%d subs=%s", len(items), ",".join(subreddits))
-    return items
+    def fetch_one(sub: str) -> Tuple[str, List[Dict[str, Any]], float, Optional[Exception]]:
+        st = time.monotonic()
+        try:
+            if getattr(local, "reddit", None) is None:
+                local.reddit = _client()
+            items, error = _fetch_subreddit(local.reddit, sub, sort_by, time_window, limit), None
+        except Exception as exc:
+            items, error = [], exc
+        return sub, items, (time.monotonic() - st) * 1000, error
+
+    pool = ThreadPoolExecutor(max_workers=min(concurrency, max(1, len(subreddits))))
+    try:
+        for sub, items, took_ms, error in pool.map(fetch_one, subreddits):
+            if error is not None:
+                logger.error(
+                    "reddit_adapter: subreddit=r/%s sort=%s failed: %s: %s", sub, sort_by, type(error).__name__, error
+                )
+                raise error
+            latencies_ms.append(took_ms)
+            total += len(items)
+            logger.info("reddit_adapter subreddit=%s items=%d took_ms=%d", sub, len(items), took_ms)
+            if items:
+                yield items
+    finally:
+        # listings not started yet are not worth waiting for once the fetch failed
+        pool.shutdown(wait=True, cancel_futures=True)
 
+    stats = latency_summary(latencies_ms)
+    logger.info(
+        "reddit_adapter fetched_items=%d subs=%s concurrency=%d p50_ms=%d p95_ms=%d max_ms=%d",
+        total, ",".join(subreddits), concurrency, stats["p50"], stats["p95"], stats["max"],
+    )
+
+def fetch(source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [it for batch in iter_batches(source_config) for it in batch]
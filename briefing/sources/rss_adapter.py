@@ -1,10 +1,19 @@
 
+import time
 import feedparser
-from typing import List, Dict, Any, Optional
-from briefing.utils import clean_text, parse_datetime_safe, get_logger, normalize_http_url
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Any, Optional, Tuple
+from briefing import run_stats
+from briefing.net import cached_session
+from briefing.utils import clean_texts, parse_datetime_safe, get_logger, normalize_http_url, latency_summary
 
 logger = get_logger(__name__)
 
+DEFAULT_CONCURRENCY = 8
+DEFAULT_FEED_TIMEOUT = 20.0
+USER_AGENT = feedparser.USER_AGENT
+
 def _extract_entry_url(e: Any) -> Optional[str]:
     # Try standard link
     link = None
@@ -60,44 +69,87 @@ def _extract_entry_url(e: Any) -> Optional[str]:
             return nu
     return None
 
-def fetch(source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
-    urls = source_config.get("urls", [])
+def _download(url: str, session: requests.Session, timeout: float) -> Tuple[bytes, Dict[str, str]]:
+    resp = session.get(url, timeout=timeout, headers={"User-Agent": USER_AGENT})
+    resp.raise_for_status()
+    return resp.content, {k.lower(): v for k, v in resp.headers.items()}
+
+def _entries_to_items(entries: List[Any]) -> List[Dict[str, Any]]:
     items: List[Dict[str, Any]] = []
+    texts = clean_texts([e.get("summary") or e.get("title") or "" for e in entries])
+    for e, text in zip(entries, texts):
+        if not text:
+            continue
+
+        ts = parse_datetime_safe(
+            e.get("date_published")
+            or e.get("dateModified")
+            or e.get("date_modified")
+            or e.get("published")
+            or e.get("updated")
+            or ""
+        )
 
-    for url in urls:
-        feed = feedparser.parse(url)
-        for e in feed.entries:
-            raw = e.get("summary") or e.get("title") or ""
-            text = clean_text(raw)
-            if not text:
-                continue
-
-            ts = parse_datetime_safe(
-                e.get("date_published")
-                or e.get("dateModified")
-                or e.get("date_modified")
-                or e.get("published")
-                or e.get("updated")
-                or ""
-            )
-
-            if ts is None:
-                logger.warning("rss_adapter: drop item %s due to missing/invalid timestamp", e.get("id") or e.get("link"))
-                continue
-
-            url_val = _extract_entry_url(e)
-            if not url_val:
-                logger.warning("rss_adapter: drop item %s due to missing/invalid link", e.get("id") or e.get("title"))
-                continue
-
-            items.append({
-                "id": e.get("id") or e.get("link") or e.get("title"),
-                "text": text,
-                "url": url_val,
-                "author": getattr(e, "author", "Unknown"),
-                "timestamp": ts.isoformat(),
-                "metadata": {"source": "rss"}
-            })
-
-    logger.info("rss_adapter fetched_items=%d", len(items))
+        if ts is None:
+            logger.warning("rss_adapter: drop item %s due to missing/invalid timestamp", e.get("id") or e.get("link"))
+            continue
+
+        url_val = _extract_entry_url(e)
+        if not url_val:
+            logger.warning("rss_adapter: drop item %s due to missing/invalid link", e.get("id") or e.get("title"))
+            continue
+
+        items.append({
+            "id": e.get("id") or e.get("link") or e.get("title"),
+            "text": text,
+            "url": url_val,
+            "author": getattr(e, "author", "Unknown"),
+            "timestamp": ts.isoformat(),
+            "metadata": {"source": "rss"}
+        })
     return items
+
+def iter_batches(source_config: Dict[str, Any]) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the normalized items of each feed, in ``urls`` order, while other feeds still load.
+
+    Feeds are downloaded through one pooled session with a per-feed timeout
+    (``feed_timeout`` seconds) and parsed by the same worker right after, so a
+    slow or dead feed only delays itself. Failed feeds are logged and skipped.
+    """
+    urls = source_config.get("urls", [])
+    concurrency = max(1, int(source_config.get("rss_concurrency", DEFAULT_CONCURRENCY)))
+    timeout = float(source_config.get("feed_timeout", DEFAULT_FEED_TIMEOUT))
+    # one retry: a slow feed already has its own timeout and must not hold a worker
+    session = cached_session(source_config.get("http_cache"), total=1, pool_maxsize=concurrency)
+
+    latencies_ms: List[float] = []
+    failures = 0
+    total = 0
+
+    def fetch_one(url: str) -> Tuple[List[Dict[str, Any]], float, bool]:
+        st = time.monotonic()
+        try:
+            content, headers = _download(url, session, timeout)
+            feed = feedparser.parse(content, response_headers=headers)
+            items, ok = _entries_to_items(feed.entries), True
+        except Exception as exc:
+            logger.warning("rss_adapter: fetch %s failed: %s", url, exc)
+            items, ok = [], False
+        return items, (time.monotonic() - st) * 1000, ok
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, max(1, len(urls)))) as pool:
+        for items, took_ms, ok in pool.map(run_stats.propagate(fetch_one), urls):
+            latencies_ms.append(took_ms)
+            failures += 0 if ok else 1
+            total += len(items)
+            if items:
+                yield items
+
+    stats = latency_summary(latencies_ms)
+    logger.info(
+        "rss_adapter fetched_items=%d feeds=%d failed=%d concurrency=%d p50_ms=%d p95_ms=%d max_ms=%d",
+        total, len(urls), failures, concurrency, stats["p50"], stats["p95"], stats["max"],
+    )
+
+def fetch(source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [it for batch in iter_batches(source_config) for it in batch]
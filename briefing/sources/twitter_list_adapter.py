@@ -1,9 +1,9 @@
 
 import os
-import requests
 from typing import List, Dict, Any
 
-from briefing.utils import clean_text, parse_datetime_safe, get_logger, normalize_http_url
+from briefing.net import cached_session
+from briefing.utils import clean_texts, parse_datetime_safe, get_logger, normalize_http_url
 
 RSSHUB_ORIGIN = os.getenv("RSSHUB_ORIGIN", "http://rsshub:1200")
 logger = get_logger(__name__)
@@ -11,14 +11,14 @@ logger = get_logger(__name__)
 def fetch(source_config: Dict[str, Any]) -> List[Dict[str, Any]]:
     list_id = source_config["id"]
     url = f"{RSSHUB_ORIGIN}/twitter/list/{list_id}?format=json"
-    resp = requests.get(url, timeout=30)
+    resp = cached_session(source_config.get("http_cache")).get(url, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     items = []
 
-    for entry in data.get("items", []):
-        raw_text = entry.get("description") or entry.get("title") or ""
-        text = clean_text(raw_text)
+    entries = data.get("items", [])
+    texts = clean_texts([entry.get("description") or entry.get("title") or "" for entry in entries])
+    for entry, text in zip(entries, texts):
         if not text:
             continue
 
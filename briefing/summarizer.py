@@ -1,11 +1,11 @@
-import os
-import json
 import datetime as dt
 from typing import List, Dict, Any, Optional, Tuple
 
 from briefing.utils import get_logger
 from briefing.llm.registry import call_with_schema
+from briefing.llm.cache import bypass_from_config, from_config as response_cache_from_config
 from briefing.rendering.markdown import render_md
+from briefing.schema_registry import load_schema
 
 logger = get_logger(__name__)
 
@@ -28,9 +28,7 @@ def generate_summary(bundles: List[Dict[str, Any]],
         return None, None
     
     # Load schema
-    schema_path = os.path.join(os.path.dirname(__file__), "schemas", "briefing.schema.json")
-    with open(schema_path) as f:
-        schema = json.load(f)
+    schema = load_schema("briefing.schema.json")
     
     # Get config
     summ = config.get("summarization", {})
@@ -43,6 +41,8 @@ def generate_summary(bundles: List[Dict[str, Any]],
     else:
         raise ValueError(f"Unknown provider: {provider}")
     
+    response_cache = response_cache_from_config(summ.get("response_cache"))
+
     # Call LLM with schema
     obj = call_with_schema(
         provider=provider,
@@ -52,8 +52,12 @@ def generate_summary(bundles: List[Dict[str, Any]],
         temperature=float(summ.get("temperature", 0.2)),
         timeout=int(summ.get("timeout", 600)),
         retries=int(summ.get("retries", 0)),
-        options=summ.get("provider_options", {}).get(provider)
+        options=summ.get("provider_options", {}).get(provider),
+        cache=response_cache,
+        cache_bypass=bypass_from_config(summ.get("response_cache")),
     )
+    if response_cache is not None:
+        logger.info("LLM response cache stats=%s", response_cache.stats())
     
     # Check if empty
     if not obj.get("topics"):
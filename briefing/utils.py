@@ -1,19 +1,29 @@
 
 import os
 import re
+import math
 import json
+import threading
+import contextlib
+import multiprocessing
 import html2text
+from html2text.utils import escape_md_section
 import requests
 import datetime as dt
 import logging
 from logging.handlers import TimedRotatingFileHandler
-from jsonschema import validate, Draft202012Validator
-from jsonschema.exceptions import ValidationError
+from jsonschema.exceptions import best_match
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from email.utils import parsedate_to_datetime
-from typing import Optional, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Any, Dict, Iterable, List
 from pydantic import TypeAdapter, HttpUrl
 
+try:
+    import fcntl
+except ImportError:  # non-POSIX: stores fall back to their in-process locks only
+    fcntl = None
+
 # ---------- Time helpers ----------
 
 def now_utc():
@@ -63,17 +73,81 @@ def parse_datetime_safe(raw: str) -> Optional[dt.datetime]:
 
     return None
 
+def latency_summary(samples_ms: Iterable[float]) -> Dict[str, int]:
+    """Summarize latency samples (milliseconds) as nearest-rank p50/p95/max."""
+
+    ordered = sorted(samples_ms)
+    if not ordered:
+        return {"p50": 0, "p95": 0, "max": 0}
+
+    def pick(pct: float) -> int:
+        rank = max(1, int(math.ceil(pct / 100.0 * len(ordered))))
+        return int(ordered[rank - 1])
+
+    return {"p50": pick(50), "p95": pick(95), "max": int(ordered[-1])}
+
 # ---------- Text helpers ----------
 
+_MARKUP_RE = re.compile(r"[<&]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+CLEAN_TEXT_PROCESSES = int(os.getenv("CLEAN_TEXT_PROCESSES", "0") or 0)
+CLEAN_TEXT_POOL_MIN_ITEMS = int(os.getenv("CLEAN_TEXT_POOL_MIN_ITEMS", "500") or 500)
+
+_CLEAN_POOL: Optional[ProcessPoolExecutor] = None
+_CLEAN_POOL_WORKERS = 0
+_CLEAN_POOL_LOCK = threading.Lock()
+
+
 def clean_text(html_or_text: str) -> str:
+    raw = html_or_text or ""
+    if not _MARKUP_RE.search(raw):
+        # Without tags or entities html2text only escapes Markdown list/backslash
+        # markers and collapses whitespace, so skip the parser entirely.
+        return _WHITESPACE_RE.sub(" ", escape_md_section(raw, snob=False)).strip()
+    # HTML2Text keeps per-document state, so each document needs a fresh instance
     h = html2text.HTML2Text()
     h.ignore_links = False
     h.ignore_images = True
     h.body_width = 0
-    text = h.handle(html_or_text or "")
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = h.handle(raw)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
     return text.strip()
 
+
+def _clean_pool(processes: int) -> ProcessPoolExecutor:
+    global _CLEAN_POOL, _CLEAN_POOL_WORKERS
+    with _CLEAN_POOL_LOCK:
+        if _CLEAN_POOL is None or _CLEAN_POOL_WORKERS != processes:
+            if _CLEAN_POOL is not None:
+                _CLEAN_POOL.shutdown(wait=False)
+            # spawn: adapters call this from worker threads, where fork is unsafe
+            _CLEAN_POOL = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            _CLEAN_POOL_WORKERS = processes
+        return _CLEAN_POOL
+
+
+def clean_texts(texts: Iterable[str], *, processes: Optional[int] = None) -> List[str]:
+    """Batch :func:`clean_text`, preserving order.
+
+    Markup-free texts are always cleaned inline. When ``processes`` (default
+    ``CLEAN_TEXT_PROCESSES``) is above 1 and at least ``CLEAN_TEXT_POOL_MIN_ITEMS``
+    texts contain markup, those are converted on a persistent process pool.
+    """
+    texts = [t or "" for t in texts]
+    processes = CLEAN_TEXT_PROCESSES if processes is None else processes
+    markup = [i for i, t in enumerate(texts) if _MARKUP_RE.search(t)]
+    if processes <= 1 or len(markup) < CLEAN_TEXT_POOL_MIN_ITEMS:
+        return [clean_text(t) for t in texts]
+
+    out = [clean_text(t) if not _MARKUP_RE.search(t) else "" for t in texts]
+    chunksize = max(1, len(markup) // (processes * 4))
+    converted = _clean_pool(processes).map(clean_text, [texts[i] for i in markup], chunksize=chunksize)
+    for i, text in zip(markup, converted):
+        out[i] = text
+    return out
+
 # ---------- URL helpers ----------
 
 _HTTP_URL_ADAPTER = TypeAdapter(HttpUrl)
@@ -109,14 +183,33 @@ def load_file(path: str) -> str:
         return f.read()
 
 def validate_config(cfg: dict):
-    here = os.path.dirname(os.path.abspath(__file__))
-    schema_path = os.path.join(here, "schemas", "config.schema.json")
-    schema = json.loads(load_file(schema_path))
-    try:
-        validate(instance=cfg, schema=schema, cls=Draft202012Validator)
-    except ValidationError as e:
+    from briefing.schema_registry import load_schema, validator_for
+
+    validator = validator_for(load_schema("config.schema.json"))
+    e = best_match(validator.iter_errors(cfg))
+    if e is not None:
         raise ValueError(f"Config validation error: {e.message} at {list(e.path)}") from e
 
+# ---------- File locking ----------
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Hold an exclusive advisory lock on ``path`` (created if missing).
+
+    Serializes writers of on-disk stores across processes, e.g. parallel
+    scheduled runs sharing one cache directory. Not re-entrant.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a+b") as fh:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
 # ---------- Output writer ----------
 
 def write_output(human_md: str, json_obj: dict, out_cfg: dict):
@@ -2,27 +2,37 @@
 #!/usr/bin/env python3
 import argparse
 
-from briefing.orchestrator import run_once
+from briefing.orchestrator import run_daemon, run_once
 
 
 def main():
     parser = argparse.ArgumentParser(description="AI-Briefing CLI")
-    parser.add_argument("--config", required=True, help="Path to YAML config")
+    parser.add_argument("--config", help="Path to YAML config")
+    parser.add_argument("--daemon", action="store_true", help="Stay resident and run every scheduled config in --config-dir")
+    parser.add_argument("--config-dir", default="configs", help="Directory scanned for scheduled configs in daemon mode")
+    parser.add_argument("--max-parallel", type=int, default=2, help="Maximum briefings running at once in daemon mode")
     parser.add_argument("--multi-stage", dest="multi_stage", action="store_true", help="Enable multi-stage LLM pipeline")
     parser.add_argument("--single-stage", dest="multi_stage", action="store_false", help="Force legacy single-stage summarization")
     parser.add_argument("--agentic-section", dest="agentic_section", action="store_true", help="Force Agentic Focus section output when possible")
     parser.add_argument("--no-agentic-section", dest="agentic_section", action="store_false", help="Disable Agentic Focus section even if configured")
     parser.add_argument("--brief-lite", dest="brief_lite", action="store_true", help="Emit additional condensed brief if supported")
     parser.add_argument("--no-brief-lite", dest="brief_lite", action="store_false", help="Skip condensed brief generation")
-    parser.set_defaults(multi_stage=None, agentic_section=None, brief_lite=None)
+    parser.add_argument("--resume", dest="resume", action="store_true", help="Reuse multi-stage artifacts whose inputs are unchanged")
+    parser.set_defaults(multi_stage=None, agentic_section=None, brief_lite=None, resume=None)
     args = parser.parse_args()
 
-    run_once(
-        args.config,
+    overrides = dict(
         multi_stage=args.multi_stage,
         agentic_section=args.agentic_section,
         brief_lite=args.brief_lite,
+        resume=args.resume,
     )
+    if args.daemon:
+        run_daemon(args.config_dir, max_parallel=args.max_parallel, **overrides)
+    elif args.config:
+        run_once(args.config, **overrides)
+    else:
+        parser.error("--config is required unless --daemon is given")
 
 
 if __name__ == "__main__":
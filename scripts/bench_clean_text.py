@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Benchmark utils.clean_text/clean_texts against the legacy html2text-per-call path.
+
+Usage: python scripts/bench_clean_text.py [--repeat 50] [--processes 4]
+
+Inputs are the ``title`` and ``content_html`` fields of every ``samples/*.json``
+fixture plus HN-style ``"{title}\\n\\n"`` strings, so both the markup-free fast
+path and the full HTML conversion are exercised. Output is asserted identical
+to the legacy implementation before any timing is reported.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import html2text
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_DIR", "/tmp/ai-briefing-bench-logs")
+
+from briefing.utils import clean_text, clean_texts  # noqa: E402
+
+
+def legacy_clean_text(html_or_text: str) -> str:
+    h = html2text.HTML2Text()
+    h.ignore_links = False
+    h.ignore_images = True
+    h.body_width = 0
+    text = h.handle(html_or_text or "")
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def load_inputs() -> list[str]:
+    texts: list[str] = []
+    for path in sorted((ROOT / "samples").glob("*.json")):
+        for entry in json.loads(path.read_text(encoding="utf-8")).get("items", []):
+            title = entry.get("title") or ""
+            texts += [title, f"{title}\n\n", entry.get("content_html") or ""]
+    return texts
+
+
+def timed(fn) -> float:
+    st = time.perf_counter()
+    fn()
+    return (time.perf_counter() - st) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--processes", type=int, default=0, help="Also time clean_texts on a process pool")
+    args = ap.parse_args()
+
+    texts = load_inputs()
+    expected = [legacy_clean_text(t) for t in texts]
+    mismatches = sum(a != b for a, b in zip(expected, (clean_text(t) for t in texts)))
+    mismatches += sum(a != b for a, b in zip(expected, clean_texts(texts)))
+    if mismatches:
+        sys.exit(f"{mismatches} outputs differ from the legacy implementation")
+
+    workload = texts * args.repeat
+    n_plain = sum(1 for t in texts if not re.search(r"[<&]", t)) * args.repeat
+    print(f"inputs={len(workload)} markup_free={n_plain} identical=True")
+    legacy_ms = timed(lambda: [legacy_clean_text(t) for t in workload])
+    print(f"{'legacy':>22} {legacy_ms:>9.1f} ms")
+    for name, fn in (
+        ("clean_text", lambda: [clean_text(t) for t in workload]),
+        ("clean_texts", lambda: clean_texts(workload, processes=1)),
+    ):
+        ms = timed(fn)
+        print(f"{name:>22} {ms:>9.1f} ms {legacy_ms / ms:>6.1f}x")
+    if args.processes > 1:
+        clean_texts(texts * 10, processes=args.processes)  # warm the pool
+        if clean_texts(workload, processes=args.processes) != expected * args.repeat:
+            sys.exit("process-pool output differs from the legacy implementation")
+        ms = timed(lambda: clean_texts(workload, processes=args.processes))
+        print(f"{f'clean_texts(p={args.processes})':>22} {ms:>9.1f} ms {legacy_ms / ms:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark decoding TEI embedding responses: float-list JSON vs base64 float32.
+
+Usage: python scripts/bench_embed_decode.py [--items 20000] [--dim 1024] [--batch 32]
+
+Builds response bodies the way TEI's OpenAI route returns them and decodes every
+batch the legacy way (``resp.json()`` float lists gathered into one list, then
+``np.array``) and through ``_decode_embeddings`` into a preallocated float32
+array, with and without base64. Decode time and tracemalloc peak are reported;
+the peak excludes the response bodies, which exist in both paths.
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_DIR", "/tmp/ai-briefing-bench-logs")
+
+import briefing.pipeline as pipeline  # noqa: E402
+from briefing.pipeline import _decode_embeddings  # noqa: E402
+
+
+def make_bodies(items: int, dim: int, batch: int, encoding: str) -> list[bytes]:
+    rng = np.random.default_rng(0)
+    bodies = []
+    for start in range(0, items, batch):
+        vectors = rng.standard_normal((min(batch, items - start), dim), dtype=np.float32)
+        if encoding == "base64":
+            rows = [base64.b64encode(v.astype("<f4").tobytes()).decode() for v in vectors]
+        else:
+            rows = vectors.tolist()
+        bodies.append(json.dumps({"data": [{"embedding": row} for row in rows]}).encode())
+    return bodies
+
+
+def legacy(bodies: list[bytes]) -> np.ndarray:
+    all_embs = []
+    for body in bodies:
+        all_embs.extend(d["embedding"] for d in json.loads(body)["data"])
+    return np.array(all_embs, dtype=np.float32)
+
+
+def preallocated(bodies: list[bytes], items: int, dim: int) -> np.ndarray:
+    out = np.empty((items, dim), dtype=np.float32)
+    row = 0
+    for body in bodies:
+        data = pipeline.orjson.loads(body) if pipeline.orjson is not None else json.loads(body)
+        for vec in _decode_embeddings(data):
+            out[row] = vec
+            row += 1
+    return out
+
+
+def measure(fn, *args):
+    # timed and traced separately: tracemalloc slows allocation-heavy code several times over
+    st = time.perf_counter()
+    result = fn(*args)
+    took_ms = (time.perf_counter() - st) * 1000
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, took_ms, peak / (1024 * 1024)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=20000)
+    ap.add_argument("--dim", type=int, default=1024)
+    ap.add_argument("--batch", type=int, default=32)
+    args = ap.parse_args()
+
+    float_bodies = make_bodies(args.items, args.dim, args.batch, "float")
+    b64_bodies = make_bodies(args.items, args.dim, args.batch, "base64")
+    expected, legacy_ms, legacy_mb = measure(legacy, float_bodies)
+    runs = [("legacy", legacy_ms, legacy_mb, sum(map(len, float_bodies)))]
+    for name, bodies in (("float", float_bodies), ("base64", b64_bodies)):
+        result, took_ms, peak_mb = measure(preallocated, bodies, args.items, args.dim)
+        assert np.array_equal(result, expected)
+        runs.append((name, took_ms, peak_mb, sum(map(len, bodies))))
+
+    print(f"items={args.items} dim={args.dim} batch={args.batch} result_mb={expected.nbytes / 2**20:.1f} "
+          f"orjson={pipeline.orjson is not None}")
+    for name, took_ms, peak_mb, body_bytes in runs:
+        print(f"{name:>8} {took_ms:>9.1f} ms {legacy_ms / took_ms:>6.1f}x "
+              f"peak={peak_mb:>8.1f} MB body={body_bytes / 2**20:>7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
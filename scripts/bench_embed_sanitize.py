@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark the single-pass embedding sanitizer against the legacy three-pass chain.
+
+Usage: python scripts/bench_embed_sanitize.py [--items 2000] [--chars 6000] [--fuzz 20000]
+
+Texts imitate long Reddit self-posts and HN comments: prose with code snippets,
+Windows paths, ``\\x``/``\\u`` escapes (complete and broken), CJK, emoji, control
+characters and the odd lone surrogate. ``--fuzz`` short random strings drawn from
+the same alphabet are compared too; any mismatch aborts before timing.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_DIR", "/tmp/ai-briefing-bench-logs")
+
+from briefing.pipeline import _clean_text_for_embedding, _clean_texts_for_embedding  # noqa: E402
+
+
+def legacy_clean_text_for_embedding(text) -> str:
+    if not isinstance(text, str):
+        text = str(text)
+    text = text.encode("utf-8", errors="replace").decode("utf-8", errors="replace")
+    text = re.sub(r"\\x(?![0-9a-fA-F]{2})", " ", text)
+    text = re.sub(r"\\u(?![0-9a-fA-F]{4})", " ", text)
+    text = text.replace("\\", " ")
+    text = "".join(char for char in text if ord(char) >= 32 or char in "\n\r\t")
+    return text.strip()
+
+
+FRAGMENTS = [
+    "Show HN: I built a tiny database in Rust. ",
+    "The regex was r'\\d+\\s*' and it worked. ",
+    "Path is C:\\Users\\dev\\project\\x86\\build. ",
+    "Escapes like \\x41 and \\u00e9 are fine, \\xZZ and \\u12 are not. ",
+    "中文推文内容，测试一下嵌入。",
+    "emoji 🚀🔥 ",
+    "tab\tseparated\r\nline ",
+    "\x00\x07\x1b[0m ",
+    "\\",
+    "\ud800",
+    "    ",
+    "ascii only prose about compilers and caches. ",
+]
+ALPHABET = "ax\\uU0f9Z \n\t\r\x00\x1f\x7f中\ud83d🚀"
+
+
+def make_texts(n: int, chars: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        parts, size = [], 0
+        target = rng.randint(chars // 4, chars)
+        while size < target:
+            frag = rng.choice(FRAGMENTS)
+            parts.append(frag)
+            size += len(frag)
+        out.append("".join(parts))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--items", type=int, default=2000)
+    ap.add_argument("--chars", type=int, default=6000)
+    ap.add_argument("--fuzz", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    fuzz = ["".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12))) for _ in range(args.fuzz)]
+    texts = make_texts(args.items, args.chars, args.seed)
+    for text in fuzz + texts:
+        if _clean_text_for_embedding(text) != legacy_clean_text_for_embedding(text):
+            sys.exit(f"output differs from the legacy implementation for {text!r:.200}")
+
+    st = time.perf_counter()
+    legacy = [legacy_clean_text_for_embedding(t) for t in texts]
+    legacy_ms = (time.perf_counter() - st) * 1000
+    st = time.perf_counter()
+    fast = _clean_texts_for_embedding(texts)
+    fast_ms = (time.perf_counter() - st) * 1000
+    assert fast == legacy
+
+    total_chars = sum(map(len, texts))
+    print(f"items={len(texts)} chars={total_chars} fuzz={len(fuzz)} identical=True")
+    print(f"{'legacy':>10} {legacy_ms:>9.1f} ms")
+    print(f"{'sanitizer':>10} {fast_ms:>9.1f} ms {legacy_ms / fast_ms:>6.1f}x")
+    # the pipeline used to run the chain again for every rerank query and candidate
+    print(f"{'pipeline':>10} legacy={legacy_ms * 2:.1f} ms (embed + rerank) now={fast_ms:.1f} ms (once)")
+
+
+if __name__ == "__main__":
+    main()
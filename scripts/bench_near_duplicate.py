@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark tiled near-duplicate detection against the legacy O(n^2) loop.
+
+Usage: python scripts/bench_near_duplicate.py [--sizes 1000 5000 20000] [--dim 384] [--lsh]
+
+With ``--lsh`` the random-projection LSH backend is timed as well and its pair
+recall / dropped-item recall against the exact path is reported, which is what
+``processing.dedup.lsh_tables``/``lsh_bits`` should be tuned against.
+
+The legacy implementation materializes the full n x n matrix, so it is skipped
+above ``--legacy-max`` items (20k x 20k float32 alone is 1.6 GB).
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_DIR", "/tmp/ai-briefing-bench-logs")
+
+from briefing.ann import RandomProjectionLSH, lsh_recall  # noqa: E402
+from briefing.pipeline import _near_duplicate_mask, _near_duplicate_mask_lsh  # noqa: E402
+
+
+def legacy_mask(embs: np.ndarray, threshold: float) -> list[bool]:
+    n = embs.shape[0]
+    keep = [True] * n
+    sims = cosine_similarity(embs)
+    for i in range(n):
+        if not keep[i]:
+            continue
+        for j in range(i + 1, n):
+            if keep[j] and sims[i, j] >= threshold:
+                keep[j] = False
+    return keep
+
+
+def make_embeddings(n: int, dim: int, dup_ratio: float, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(n, dim)).astype(np.float32)
+    n_dups = int(n * dup_ratio)
+    src = rng.integers(0, n, size=n_dups)
+    dst = rng.integers(0, n, size=n_dups)
+    base[dst] = base[src] + rng.normal(scale=0.05, size=(n_dups, dim)).astype(np.float32)
+    return base
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--threshold", type=float, default=0.92)
+    ap.add_argument("--dup-ratio", type=float, default=0.1)
+    ap.add_argument("--legacy-max", type=int, default=5000)
+    ap.add_argument("--lsh", action="store_true", help="Also benchmark the LSH backend and report recall")
+    ap.add_argument("--lsh-tables", type=int, default=16)
+    ap.add_argument("--lsh-bits", type=int, default=10)
+    args = ap.parse_args()
+    index = RandomProjectionLSH(n_tables=args.lsh_tables, n_bits=args.lsh_bits)
+
+    print(f"{'n':>7} {'tiled_ms':>10} {'legacy_ms':>10} {'speedup':>8} {'dups':>6} match")
+    for n in args.sizes:
+        embs = make_embeddings(n, args.dim, args.dup_ratio, seed=n)
+
+        st = time.perf_counter()
+        tiled = _near_duplicate_mask(embs, args.threshold)
+        tiled_ms = (time.perf_counter() - st) * 1000
+        dups = n - sum(tiled)
+
+        if n <= args.legacy_max:
+            st = time.perf_counter()
+            legacy = legacy_mask(embs, args.threshold)
+            legacy_ms = (time.perf_counter() - st) * 1000
+            print(f"{n:>7} {tiled_ms:>10.1f} {legacy_ms:>10.1f} {legacy_ms / tiled_ms:>7.1f}x {dups:>6} {tiled == legacy}")
+        else:
+            print(f"{n:>7} {tiled_ms:>10.1f} {'skipped':>10} {'-':>8} {dups:>6} -")
+
+        if args.lsh:
+            st = time.perf_counter()
+            _near_duplicate_mask_lsh(embs, args.threshold, index)
+            lsh_ms = (time.perf_counter() - st) * 1000
+            recall = lsh_recall(embs, args.threshold, index)
+            print(
+                f"{'':>7} lsh_ms={lsh_ms:.1f} pair_recall={recall['pair_recall']:.4f} "
+                f"dropped_recall={recall['dropped_recall']:.4f} mask_agreement={recall['mask_agreement']:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
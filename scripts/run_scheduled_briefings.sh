@@ -4,6 +4,9 @@ set -euo pipefail
 REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 cd "$REPO_ROOT"
 
+# One-shot runner for an external cron. `make daemon` runs the same two
+# configs on their `schedule` in one resident process and keeps models warm.
+
 log_section() {
     local title="$1"
     printf '\n======================================\n%s\n======================================\n' "$title"
@@ -34,7 +34,8 @@ def test_rss_adapter_uses_links_alternate(monkeypatch):
                 }
             ]
 
-    monkeypatch.setattr(rss_adapter.feedparser, "parse", lambda url: FakeFeed())
+    monkeypatch.setattr(rss_adapter, "_download", lambda url, session, timeout: (b"", {}))
+    monkeypatch.setattr(rss_adapter.feedparser, "parse", lambda data, **kw: FakeFeed())
 
     out = rss_adapter.fetch({"urls": ["http://dummy"]})
     assert len(out) == 1
@@ -55,7 +56,8 @@ def test_rss_adapter_uses_origlink(monkeypatch):
                 }
             ]
 
-    monkeypatch.setattr(rss_adapter.feedparser, "parse", lambda url: FakeFeed())
+    monkeypatch.setattr(rss_adapter, "_download", lambda url, session, timeout: (b"", {}))
+    monkeypatch.setattr(rss_adapter.feedparser, "parse", lambda data, **kw: FakeFeed())
 
     out = rss_adapter.fetch({"urls": ["http://dummy"]})
     assert len(out) == 1
@@ -75,7 +77,8 @@ def test_rss_adapter_uses_id_when_urlish(monkeypatch):
                 }
             ]
 
-    monkeypatch.setattr(rss_adapter.feedparser, "parse", lambda url: FakeFeed())
+    monkeypatch.setattr(rss_adapter, "_download", lambda url, session, timeout: (b"", {}))
+    monkeypatch.setattr(rss_adapter.feedparser, "parse", lambda data, **kw: FakeFeed())
 
     out = rss_adapter.fetch({"urls": ["http://dummy"]})
     assert len(out) == 1
@@ -97,9 +100,9 @@ def test_twitter_list_adapter_fallback_to_link(monkeypatch):
     }
 
     monkeypatch.setattr(
-        twitter_list_adapter.requests,
-        "get",
-        lambda url, timeout=30: _fake_response(payload),
+        twitter_list_adapter,
+        "cached_session",
+        lambda cache_cfg=None: types.SimpleNamespace(get=lambda url, timeout=30: _fake_response(payload)),
     )
 
     out = twitter_list_adapter.fetch({"id": "list1"})
@@ -122,10 +125,186 @@ def test_twitter_list_adapter_drops_invalid_url(monkeypatch):
     }
 
     monkeypatch.setattr(
-        twitter_list_adapter.requests,
-        "get",
-        lambda url, timeout=30: _fake_response(payload),
+        twitter_list_adapter,
+        "cached_session",
+        lambda cache_cfg=None: types.SimpleNamespace(get=lambda url, timeout=30: _fake_response(payload)),
     )
 
     out = twitter_list_adapter.fetch({"id": "list1"})
     assert len(out) == 0
+
+
+def test_hackernews_adapter_concurrent_fetch_keeps_order_and_isolates_failures(monkeypatch):
+    import time as _time
+
+    import requests
+
+    from briefing.sources import hackernews_adapter
+
+    ids = [101, 102, 103, 104]
+
+    def fake_get_item(item_id, session=None):
+        # Later ids finish first to prove ordering does not depend on completion order
+        _time.sleep(0.01 * (len(ids) - ids.index(item_id)))
+        if item_id == 103:
+            raise requests.exceptions.ConnectionError("boom")
+        return {
+            "type": "story",
+            "title": f"Story {item_id}",
+            "url": f"https://example.com/{item_id}",
+            "by": "alice",
+            "time": 1725192000,
+        }
+
+    monkeypatch.setattr(hackernews_adapter, "_story_ids", lambda story_type, session=None: ids)
+    monkeypatch.setattr(hackernews_adapter, "_get_item", fake_get_item)
+
+    out = hackernews_adapter.fetch({"hn_limit": 10, "hn_concurrency": 4})
+    assert [item["id"] for item in out] == ["101", "102", "104"]
+
+
+def test_reddit_adapter_fetches_subreddits_concurrently_in_order(monkeypatch):
+    import threading
+    import time as _time
+
+    from briefing.sources import reddit_adapter
+
+    # every listing waits until all three are in flight, so a serial fetch times out
+    barrier = [threading.Barrier(3, timeout=5)]
+    limits = []
+
+    class FakeSubreddit:
+        def __init__(self, name):
+            self.name = name
+
+        def top(self, time_filter, limit):
+            limits.append(limit)
+            if barrier[0] is not None:
+                barrier[0].wait()
+            # the first listing finishes last, yet is still yielded first
+            _time.sleep(0.05 if self.name == "a" else 0.01)
+            if self.name == "broken":
+                raise RuntimeError("403")
+            return [
+                types.SimpleNamespace(
+                    id=f"{self.name}{i}",
+                    title=f"{self.name} post {i}",
+                    selftext="",
+                    created_utc=1725192000,
+                    permalink=f"/r/{self.name}/{i}",
+                    author="bob",
+                )
+                for i in range(limit)
+            ]
+
+    clients = []
+
+    class FakeReddit:
+        def __init__(self):
+            self.thread = threading.get_ident()
+            clients.append(self)
+
+        def subreddit(self, name):
+            # PRAW is not thread-safe: a client must only be used by the thread that built it
+            assert threading.get_ident() == self.thread
+            return FakeSubreddit(name)
+
+    monkeypatch.setattr(reddit_adapter, "_client", FakeReddit)
+
+    out = reddit_adapter.fetch({"subreddits": ["a", "b", "c"], "limit_per_subreddit": 2, "reddit_concurrency": 3})
+    assert [item["id"] for item in out] == ["a0", "a1", "b0", "b1", "c0", "c1"]
+    # one client per worker thread
+    assert len(clients) == 3
+    assert len({c.thread for c in clients}) == 3
+    assert limits == [2, 2, 2]
+
+    # any failing subreddit still fails the fetch, as with the serial adapter
+    barrier[0] = None
+    with pytest.raises(RuntimeError, match="403"):
+        reddit_adapter.fetch({"subreddits": ["a", "broken", "b"], "reddit_concurrency": 3})
+
+
+def test_rss_adapter_downloads_feeds_concurrently_in_config_order(monkeypatch):
+    import threading
+    import time as _time
+
+    import requests
+
+    from briefing.sources import rss_adapter
+
+    urls = ["http://slow", "http://dead", "http://fast", "http://slow"]
+    # every download blocks until all four are in flight, so a serial fetch cannot pass
+    in_flight = threading.Barrier(len(urls), timeout=5)
+
+    def fake_download(url, session, timeout):
+        in_flight.wait()
+        if url == "http://slow":
+            # finish after the later feeds to prove results keep config order
+            _time.sleep(0.05)
+        if url == "http://dead":
+            raise requests.exceptions.Timeout("feed timed out")
+        return url.encode(), {}
+
+    class FakeFeed:
+        def __init__(self, name):
+            self.entries = [{"title": name, "link": f"{name}/post", "published": "2024-09-01T12:00:00Z"}]
+
+    monkeypatch.setattr(rss_adapter, "_download", fake_download)
+    monkeypatch.setattr(rss_adapter.feedparser, "parse", lambda data, **kw: FakeFeed(data.decode()))
+
+    out = rss_adapter.fetch({"urls": urls, "rss_concurrency": 4})
+
+    assert not in_flight.broken
+    assert [item["id"] for item in out] == ["http://slow/post", "http://fast/post", "http://slow/post"]
+
+
+def test_hackernews_adapter_reuses_stored_items_and_refreshes_scores(monkeypatch, tmp_path):
+    from briefing import hn_item_store
+    from briefing.sources import hackernews_adapter
+
+    requested = []
+
+    def fake_get_item(item_id, session=None):
+        requested.append(("item", item_id))
+        if item_id == 9:
+            return {"type": "job", "title": "Hiring"}
+        return {"type": "story", "title": f"Story {item_id}", "url": f"https://example.com/{item_id}",
+                "by": "alice", "time": 1725192000, "score": 1}
+
+    def fake_get_item_field(item_id, field, session=None):
+        requested.append((field, item_id))
+        return 42
+
+    ids = [1, 9, 2]
+    monkeypatch.setattr(hackernews_adapter, "_story_ids", lambda story_type, session=None: ids)
+    monkeypatch.setattr(hackernews_adapter, "_get_item", fake_get_item)
+    monkeypatch.setattr(hackernews_adapter, "_get_item_field", fake_get_item_field)
+    monkeypatch.setattr(hn_item_store, "_STORES", {})
+
+    cfg = {"hn_store": {"enabled": True, "dir": str(tmp_path), "score_ttl_minutes": 30}}
+    first = hackernews_adapter.fetch(cfg)
+    assert sorted(requested) == [("item", 1), ("item", 2), ("item", 9)]
+
+    requested.clear()
+    ids.append(3)
+    second = hackernews_adapter.fetch(cfg)
+    # the dropped job posting is remembered as a tombstone, not fetched again
+    assert requested == [("item", 3)]
+    assert [it["id"] for it in second] == ["1", "2", "3"]
+    assert second[0] == first[0]
+
+    requested.clear()
+    # a config with other TTLs over the same directory gets its own store instance
+    cfg = {"hn_store": dict(cfg["hn_store"], score_ttl_minutes=0)}
+    third = hackernews_adapter.fetch(cfg)
+    assert sorted(requested) == [("score", 1), ("score", 2), ("score", 3)]
+    assert [it["metadata"]["score"] for it in third] == [42, 42, 42]
+
+
+def test_hackernews_min_fresh_applies_to_item_documents_only():
+    from briefing.sources import hackernews_adapter
+
+    base = hackernews_adapter.BASE
+    assert hackernews_adapter._is_item_url(f"{base}/item/8863.json")
+    assert not hackernews_adapter._is_item_url(f"{base}/item/8863/score.json")
+    assert not hackernews_adapter._is_item_url(f"{base}/topstories.json")
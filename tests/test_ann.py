@@ -0,0 +1,37 @@
+"""Tests for the LSH near-duplicate backend."""
+
+import os
+
+import numpy as np
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing.ann import RandomProjectionLSH, greedy_keep_from_pairs, lsh_recall, normalize_rows
+
+
+def _embeddings_with_dups(n=400, dim=32, seed=3):
+    rng = np.random.default_rng(seed)
+    embs = rng.normal(size=(n, dim)).astype(np.float32)
+    for src, dst in [(0, 17), (5, 250), (250, 399), (42, 43)]:
+        embs[dst] = embs[src] + rng.normal(scale=0.01, size=dim).astype(np.float32)
+    return embs
+
+
+def test_candidate_pairs_are_verified_and_ordered():
+    embs = _embeddings_with_dups()
+    pairs = RandomProjectionLSH(n_tables=16, n_bits=8).candidate_pairs(normalize_rows(embs), 0.95)
+    assert {(0, 17), (5, 250), (250, 399), (42, 43)} <= set(map(tuple, pairs.tolist()))
+    assert all(i < j for i, j in pairs.tolist())
+
+
+def test_greedy_keep_from_pairs_matches_chain_semantics():
+    # 1 is dropped by 0, so 1 must not drop 2 even though (1, 2) is a pair
+    keep = greedy_keep_from_pairs(4, np.array([[0, 1], [1, 2], [2, 3]]))
+    assert keep == [True, False, True, False]
+
+
+def test_lsh_recall_reports_full_recall_on_clear_duplicates():
+    stats = lsh_recall(_embeddings_with_dups(), 0.95, RandomProjectionLSH(n_tables=16, n_bits=8))
+    assert stats["true_pairs"] >= 4
+    assert stats["pair_recall"] == 1.0
+    assert stats["mask_agreement"] == 1.0
@@ -0,0 +1,109 @@
+"""Tests for the persistent embedding cache."""
+
+import os
+import time
+
+import numpy as np
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing.embedding_cache import EmbeddingCache, from_config
+
+
+def test_roundtrip_across_instances(tmp_path):
+    cache = EmbeddingCache(tmp_path, model_id="m1")
+    assert cache.get_many(["alpha", "beta"]) == [None, None]
+    cache.put_many(["alpha", "beta"], [[1.0, 2.0], [3.0, 4.0]])
+    cache.flush()
+
+    reopened = EmbeddingCache(tmp_path, model_id="m1")
+    alpha, missing, beta = reopened.get_many(["alpha", "gamma", "beta"])
+    assert alpha.tolist() == [1.0, 2.0]
+    assert beta.tolist() == [3.0, 4.0]
+    assert missing is None
+    assert (reopened.hits, reopened.misses) == (2, 1)
+
+
+def test_model_id_is_part_of_key(tmp_path):
+    cache = EmbeddingCache(tmp_path, model_id="m1")
+    cache.put_many(["alpha"], [[1.0]])
+    cache.flush()
+
+    other = EmbeddingCache(tmp_path, model_id="m2")
+    assert other.get_many(["alpha"]) == [None]
+
+
+def test_lru_eviction_compacts_store(tmp_path):
+    cache = EmbeddingCache(tmp_path, model_id="m1", max_entries=2)
+    cache.put_many(["a", "b"], [[1.0], [2.0]])
+    cache.flush()
+    time.sleep(0.01)
+    cache.get_many(["a"])  # touch "a" so "b" is least recently used
+    cache.put_many(["c"], [[3.0]])
+    cache.flush()
+
+    reopened = EmbeddingCache(tmp_path, model_id="m1", max_entries=2)
+    a, b, c = reopened.get_many(["a", "b", "c"])
+    assert b is None
+    assert a.tolist() == [1.0] and c.tolist() == [3.0]
+    assert os.path.getsize(tmp_path / "vectors.f32") == 2 * np.dtype(np.float32).itemsize
+
+
+def test_ttl_expiry(tmp_path):
+    cache = EmbeddingCache(tmp_path, model_id="m1", ttl_hours=1)
+    cache.put_many(["a"], [[1.0]])
+    cache.flush()
+    cache._entries[cache.key("a")][1] -= 7200
+
+    assert cache.get_many(["a"]) == [None]
+
+
+def test_trailing_bytes_from_interrupted_append_are_truncated(tmp_path):
+    cache = EmbeddingCache(tmp_path, model_id="m1")
+    cache.put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+    cache.flush()
+    # an append that crashed before the index was rewritten
+    with open(tmp_path / "vectors.f32", "ab") as fh:
+        fh.write(b"\x00" * 6)
+
+    reopened = EmbeddingCache(tmp_path, model_id="m1")
+    assert os.path.getsize(tmp_path / "vectors.f32") == 4 * 4
+    reopened.put_many(["c"], [[5.0, 6.0]])
+    reopened.flush()
+
+    a, b, c = EmbeddingCache(tmp_path, model_id="m1").get_many(["a", "b", "c"])
+    assert (a.tolist(), b.tolist(), c.tolist()) == ([1.0, 2.0], [3.0, 4.0], [5.0, 6.0])
+
+
+def test_instances_sharing_a_directory_merge_on_flush(tmp_path):
+    import threading
+
+    first = EmbeddingCache(tmp_path, model_id="m1")
+    second = EmbeddingCache(tmp_path, model_id="m1")
+    first.put_many([f"a{i}" for i in range(50)], [[float(i)] for i in range(50)])
+    second.put_many([f"b{i}" for i in range(50)], [[float(-i)] for i in range(50)])
+    threads = [threading.Thread(target=c.flush) for c in (first, second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    reopened = EmbeddingCache(tmp_path, model_id="m1")
+    vectors = reopened.get_many([f"a{i}" for i in range(50)] + [f"b{i}" for i in range(50)])
+    assert [v.tolist() for v in vectors] == [[float(i)] for i in range(50)] + [[float(-i)] for i in range(50)]
+    assert os.path.getsize(tmp_path / "vectors.f32") == 100 * 4
+
+
+def test_from_config_disabled_by_default(tmp_path):
+    assert from_config({}) is None
+    assert from_config({"cache": {"enabled": True, "dir": str(tmp_path)}}) is not None
+
+
+def test_from_config_reuses_one_instance_per_settings(tmp_path, monkeypatch):
+    from briefing import embedding_cache
+
+    monkeypatch.setattr(embedding_cache, "_CACHES", {})
+    cfg = {"cache": {"enabled": True, "dir": str(tmp_path)}}
+    cache = from_config(cfg)
+    assert from_config({"cache": dict(cfg["cache"])}) is cache
+    assert from_config({"cache": dict(cfg["cache"], ttl_hours=1)}) is not cache
@@ -0,0 +1,120 @@
+"""Tests for the self-tuning embedding batch limits."""
+
+import json
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+import briefing.pipeline as pipeline
+from briefing.embedding_limits import BatchLimitController
+from briefing.utils import validate_config
+
+
+def test_aimd_growth_shrink_and_bisect(tmp_path):
+    c = BatchLimitController(tmp_path / "limits.json", "k", initial=1000, step_fraction=0.1)
+    assert (c.limit, c.step) == (1000, 100)
+
+    c.rejected(1000)
+    assert (c.limit, c.min_rejected) == (750, 1000)
+
+    # a full batch grows the limit, but only half-way towards the smallest rejection
+    c.accepted(700)
+    assert (c.limit, c.max_accepted) == (850, 700)
+    # a batch far below the limit says nothing about the server's ceiling
+    c.accepted(300)
+    assert c.limit == 850
+
+    # shrinking never goes below a size the server already accepted
+    c.rejected(900)
+    assert (c.limit, c.min_rejected) == (700, 900)
+
+    for _ in range(20):
+        c.accepted(c.limit)
+    assert c.limit == 899
+    assert c.stats()["decreases"] == 2
+
+
+def test_limits_round_trip_and_forget_window(tmp_path):
+    path = tmp_path / "limits.json"
+    c = BatchLimitController(path, "tei|model|tei", initial=8192)
+    c.rejected(8000)
+    c.accepted(5000)
+    c.save()
+
+    reloaded = BatchLimitController(path, "tei|model|tei", initial=8192)
+    assert (reloaded.limit, reloaded.max_accepted, reloaded.min_rejected) == (c.limit, 5000, 8000)
+    assert BatchLimitController(path, "other", initial=8192).limit == 8192
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["tei|model|tei"]["updated"] -= 2 * 3600
+    path.write_text(json.dumps(data), encoding="utf-8")
+    stale = BatchLimitController(path, "tei|model|tei", initial=8192, forget_hours=1)
+    # the learned limit is still the starting point, but the bracket is re-probed
+    assert (stale.limit, stale.max_accepted, stale.min_rejected) == (c.limit, 0, None)
+
+
+def test_embed_texts_repacks_rejected_batch_under_lowered_limit(monkeypatch, tmp_path):
+    sent, sleeps = [], []
+
+    class _Resp:
+        def __init__(self, status_code, payload=()):
+            self.status_code = status_code
+            self.headers = {}
+            self._payload = payload
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"data": [{"embedding": [float(t[0] == "x"), float(len(t))]} for t in self._payload]}
+
+        @property
+        def content(self):
+            return json.dumps(self.json()).encode()
+
+    def fake_post(url, json=None, timeout=None):
+        payload = json["input"]
+        sent.append(len(payload))
+        if sum(map(len, payload)) > 70:
+            return _Resp(413)
+        return _Resp(200, payload)
+
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: SimpleNamespace(post=fake_post))
+    monkeypatch.setattr(pipeline.time, "sleep", sleeps.append)
+    limits = BatchLimitController(tmp_path / "limits.json", "k", initial=100)
+
+    texts = ["x" * 30] * 5
+    embs = pipeline._embed_texts(
+        texts, max_batch_tokens=100, max_item_chars=0, chars_per_token=1.0, concurrency=1, limits=limits
+    )
+
+    assert embs.shape == (5, 2)
+    # one rejection, then pairs re-packed under the lowered limit instead of singles
+    assert sent == [3, 2, 2, 1]
+    assert limits.min_rejected == 90 and limits.limit < 90
+    assert sleeps == []
+    saved = json.loads((tmp_path / "limits.json").read_text(encoding="utf-8"))
+    assert saved["k"]["limit"] == limits.limit
+
+
+def test_adaptive_limits_config_validates():
+    validate_config({
+        "briefing_id": "test",
+        "briefing_title": "Test Briefing",
+        "source": {"type": "hackernews", "hn_story_type": "top", "hn_limit": 50},
+        "processing": {
+            "time_window_hours": 24,
+            "min_cluster_size": 3,
+            "sim_near_dup": 0.9,
+            "reranker_model": "BAAI/bge-reranker-v2-m3",
+            "embedding": {"adaptive_limits": {"enabled": True, "ceiling_tokens": 16384, "forget_hours": 24}},
+        },
+        "summarization": {
+            "llm_provider": "gemini",
+            "gemini_model": "gemini-2.5-flash",
+            "prompt_file": "prompts/daily_briefing_multisource.yaml",
+            "target_item_count": 10,
+        },
+        "output": {"dir": "out/test", "formats": ["md"]},
+    })
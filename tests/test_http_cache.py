@@ -0,0 +1,132 @@
+"""Tests for the caching HTTP session in briefing.net."""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing.net import cache as http_cache
+from briefing.net import cached_session
+
+
+@pytest.fixture
+def server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append((self.path, self.headers.get("If-None-Match")))
+            if self.path == "/etag" and self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            body = f"body of {self.path}".encode()
+            self.send_response(200)
+            if self.path == "/etag":
+                self.send_header("ETag", '"v1"')
+                self.send_header("Cache-Control", "no-cache")
+            elif self.path == "/fresh":
+                self.send_header("Cache-Control", "max-age=600")
+            elif self.path == "/nostore":
+                self.send_header("Cache-Control", "no-store")
+            elif self.path == "/bare-nocache":
+                # like Firebase item documents: no validator, no lifetime
+                self.send_header("Cache-Control", "no-cache")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}", hits
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_cached_session_hits_revalidates_and_respects_no_store(server, tmp_path, monkeypatch):
+    base, hits = server
+    monkeypatch.setattr(http_cache, "_CACHES", {})
+    session = cached_session({"enabled": True, "dir": str(tmp_path)})
+
+    for path in ("/etag", "/fresh", "/nostore"):
+        first = session.get(base + path, timeout=5)
+        second = session.get(base + path, timeout=5)
+        assert first.text == second.text == f"body of {path}"
+        assert first.from_cache is False
+
+    assert hits == [
+        ("/etag", None),
+        ("/etag", '"v1"'),
+        ("/fresh", None),
+        ("/nostore", None),
+        ("/nostore", None),
+    ]
+    stats = session.cache.stats()
+    assert (stats["hits"], stats["revalidated"], stats["misses"]) == (1, 1, 4)
+    assert stats["bytes_saved"] == len("body of /etag") + len("body of /fresh")
+
+
+def test_min_fresh_seconds_serves_validator_only_responses_locally(server, tmp_path, monkeypatch):
+    base, hits = server
+    monkeypatch.setattr(http_cache, "_CACHES", {})
+    cache_cfg = {"enabled": True, "dir": str(tmp_path), "min_fresh_seconds": 300}
+    session = cached_session(cache_cfg, min_fresh_for=lambda url: url.endswith("/etag"))
+
+    session.get(base + "/etag", timeout=5)
+    assert session.get(base + "/etag", timeout=5).from_cache is True
+    assert len(hits) == 1
+
+    # URLs outside the predicate keep their real freshness and are revalidated
+    listing = cached_session(cache_cfg, min_fresh_for=lambda url: False)
+    assert listing.get(base + "/etag", timeout=5).from_cache is True
+    assert hits[1:] == [("/etag", '"v1"')]
+
+
+def test_min_fresh_urls_are_stored_without_validators(server, tmp_path, monkeypatch):
+    base, hits = server
+    monkeypatch.setattr(http_cache, "_CACHES", {})
+    cache_cfg = {"enabled": True, "dir": str(tmp_path), "min_fresh_seconds": 300}
+    session = cached_session(cache_cfg, min_fresh_for=lambda url: url.endswith("/bare-nocache"))
+
+    first = session.get(base + "/bare-nocache", timeout=5)
+    second = session.get(base + "/bare-nocache", timeout=5)
+    assert "etag" not in first.headers and first.headers["Cache-Control"] == "no-cache"
+    assert (first.from_cache, second.from_cache) == (False, True)
+    assert second.text == "body of /bare-nocache"
+
+    # without the predicate the same response is not storable at all
+    plain = cached_session(cache_cfg, min_fresh_for=lambda url: False)
+    plain.get(base + "/bare", timeout=5)
+    assert plain.get(base + "/bare", timeout=5).from_cache is False
+    assert [path for path, _ in hits] == ["/bare-nocache", "/bare", "/bare"]
+
+
+def test_cached_session_shares_adapters_per_retry_and_pool_settings():
+    feeds = cached_session(total=1, pool_maxsize=4)
+    adapter = feeds.get_adapter("https://example.com")
+    assert adapter.max_retries.total == 1
+    assert adapter._pool_maxsize == 4
+    assert cached_session(total=1, pool_maxsize=4).get_adapter("https://example.com") is adapter
+    assert cached_session().get_adapter("https://example.com") is not adapter
+
+
+def test_freshness_lifetime_rules():
+    assert http_cache.freshness_lifetime({"cache-control": "public, max-age=120"}) == 120
+    assert http_cache.freshness_lifetime({"cache-control": "no-cache, max-age=120"}) == 0
+    assert http_cache.freshness_lifetime({
+        "date": "Mon, 01 Jan 2024 00:00:00 GMT",
+        "expires": "Mon, 01 Jan 2024 00:10:00 GMT",
+    }) == 600
+    assert http_cache.freshness_lifetime({
+        "date": "Mon, 01 Jan 2024 10:00:00 GMT",
+        "last-modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }) == 3600
+    assert not http_cache.is_storable(200, {"vary": "Cookie", "etag": '"x"'})
@@ -0,0 +1,139 @@
+"""Tests for the LLM client registry."""
+
+import os
+import threading
+
+import pytest
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing.llm import registry
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    registry.reset_client_pool()
+    yield
+    registry.reset_client_pool()
+
+
+def _install_fake_openai(monkeypatch):
+    import openai
+
+    created = []
+
+    class FakeOpenAI:
+        def __init__(self, api_key=None, base_url=None):
+            created.append((api_key, base_url))
+            self.responses = self
+
+        def with_options(self, timeout=None):
+            return self
+
+        def create(self, **kwargs):
+            class R:
+                output_text = '{"ok": true}'
+
+            return R()
+
+    monkeypatch.setattr(openai, "OpenAI", FakeOpenAI)
+    return created
+
+
+def test_openai_client_reused_across_calls_and_threads(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    created = _install_fake_openai(monkeypatch)
+    schema = {"title": "R", "type": "object"}
+
+    threads = [
+        threading.Thread(target=registry.call_with_schema, args=("openai", "p", "m", schema))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert registry.call_with_schema("openai", "p", "m", schema) == {"ok": True}
+    assert created == [("sk-test", None)]
+    assert registry.client_pool_stats() == {"created": 1, "reused": 8, "pooled": 1}
+
+
+def test_distinct_base_urls_get_distinct_clients(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    created = _install_fake_openai(monkeypatch)
+    schema = {"title": "R", "type": "object"}
+
+    registry.call_with_schema("openai", "p", "m", schema, options={"base_url": "https://a"})
+    registry.call_with_schema("openai", "p", "m", schema, options={"base_url": "https://b"})
+    registry.call_with_schema("openai", "p", "m", schema, options={"base_url": "https://a"})
+
+    assert created == [("sk-test", "https://a"), ("sk-test", "https://b")]
+
+
+def test_response_cache_serves_identical_requests(monkeypatch, tmp_path):
+    from briefing.llm.cache import ResponseCache
+
+    calls = []
+    monkeypatch.setattr(registry, "call_openai", lambda *args: calls.append(args) or {"n": len(calls)})
+    cache = ResponseCache(tmp_path / "r.sqlite3")
+    schema = {"title": "R", "type": "object"}
+
+    first = registry.call_with_schema("openai", "p", "m", schema, cache=cache)
+    second = registry.call_with_schema("openai", "p", "m", schema, cache=cache)
+    other = registry.call_with_schema("openai", "p", "m", schema, temperature=0.7, cache=cache)
+
+    assert first == second == {"n": 1}
+    assert other == {"n": 2}
+    assert cache.stats() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+    # a fresh instance over the same file still hits; bypass forces a refresh
+    reopened = ResponseCache(tmp_path / "r.sqlite3", bypass=True)
+    assert registry.call_with_schema("openai", "p", "m", schema, cache=reopened) == {"n": 3}
+    reopened.bypass = False
+    assert registry.call_with_schema("openai", "p", "m", schema, cache=reopened) == {"n": 3}
+
+
+def test_response_cache_keys_options_and_bypasses_per_call(monkeypatch, tmp_path):
+    from briefing.llm import cache as llm_cache
+
+    calls = []
+    monkeypatch.setattr(registry, "call_openai", lambda *args: calls.append(args) or {"n": len(calls)})
+    monkeypatch.setattr(llm_cache, "_CACHES", {})
+    monkeypatch.delenv("LLM_CACHE_BYPASS", raising=False)
+    schema = {"title": "R", "type": "object"}
+    cfg = {"enabled": True, "dir": str(tmp_path)}
+    forced = dict(cfg, bypass=True)
+
+    cache = llm_cache.from_config(cfg)
+    assert llm_cache.from_config(forced) is cache
+    assert llm_cache.from_config(dict(cfg, ttl_hours=1)) is not cache
+
+    def call(cache_cfg, **kwargs):
+        return registry.call_with_schema(
+            "openai", "p", "m", schema,
+            cache=llm_cache.from_config(cache_cfg),
+            cache_bypass=llm_cache.bypass_from_config(cache_cfg),
+            **kwargs,
+        )
+
+    assert call(cfg, options={"base_url": "https://a"}) == {"n": 1}
+    # another endpoint serving the same model name is a different response
+    assert call(cfg, options={"base_url": "https://b"}) == {"n": 2}
+    # a forced refresh for one config leaves the shared instance untouched for others
+    assert call(forced, options={"base_url": "https://a"}) == {"n": 3}
+    assert cache.bypass is False
+    assert call(cfg, options={"base_url": "https://a"}) == {"n": 3}
+
+
+def test_response_cache_ttl_and_size_bound(tmp_path):
+    from briefing.llm.cache import ResponseCache
+
+    cache = ResponseCache(tmp_path / "r.sqlite3", ttl_hours=1, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"k": key})
+    assert cache.get("a") is None
+    assert cache.get("c") == {"k": "c"}
+
+    cache._conn.execute("UPDATE responses SET created = created - 7200 WHERE key = 'c'")
+    assert cache.get("c") is None
@@ -1,10 +1,13 @@
 
 """Tests for the processing pipeline."""
 
+import json
 import os
+import re
 import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from types import SimpleNamespace
 
 import numpy as np
 import pytest
@@ -16,7 +19,7 @@ _TEST_LOG_DIR.mkdir(parents=True, exist_ok=True)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from briefing.pipeline import _near_duplicate_mask, _cluster, run_processing_pipeline
-from briefing.utils import clean_text, validate_config
+from briefing.utils import clean_text, clean_texts, validate_config
 
 
 class TestDeduplication:
@@ -58,6 +61,42 @@ class TestDeduplication:
         mask = _near_duplicate_mask(embs, threshold=0.9)
         assert mask == [True, True, True]  # All should be kept
 
+    def test_near_duplicate_mask_tiled_matches_greedy_reference(self):
+        """Tiled dedup keeps exactly the items the greedy full-matrix loop keeps."""
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        rng = np.random.default_rng(7)
+        embs = rng.normal(size=(60, 8)).astype(np.float32)
+        embs[10] = embs[3] + 0.01
+        embs[25] = embs[10] + 0.01
+        embs[59] = embs[0]
+
+        sims = cosine_similarity(embs)
+        expected = [True] * len(embs)
+        for i in range(len(embs)):
+            if expected[i]:
+                for j in range(i + 1, len(embs)):
+                    if expected[j] and sims[i, j] >= 0.9:
+                        expected[j] = False
+
+        for block_size in (1, 7, 64):
+            assert _near_duplicate_mask(embs, threshold=0.9, block_size=block_size) == expected
+
+    def test_dedup_mask_uses_exact_path_below_threshold(self, monkeypatch):
+        """The LSH backend only kicks in above processing.dedup.exact_max_items."""
+        import briefing.pipeline as pipeline
+
+        embs = np.eye(4)
+        calls = []
+        monkeypatch.setattr(pipeline, "_near_duplicate_mask", lambda e, t: calls.append("exact") or [True] * len(e))
+        monkeypatch.setattr(pipeline, "_near_duplicate_mask_lsh", lambda e, t, index: calls.append("lsh") or [True] * len(e))
+
+        pipeline._dedup_mask(embs, {"dedup": {"backend": "lsh", "exact_max_items": 10}})
+        pipeline._dedup_mask(embs, {"dedup": {"backend": "lsh", "exact_max_items": 2}})
+        pipeline._dedup_mask(embs, {})
+
+        assert calls == ["exact", "lsh", "exact"]
+
 
 class TestClustering:
     """Test clustering functionality."""
@@ -84,6 +123,58 @@ class TestClustering:
         unique_labels.discard(-1)
         assert len(unique_labels) >= 1  # At least one cluster formed
 
+    def test_rerank_loads_cross_encoder_once(self, monkeypatch):
+        """Reranker models are loaded once per process and shared across calls."""
+        import briefing.pipeline as pipeline
+
+        loads = []
+
+        class FakeCrossEncoder:
+            def __init__(self, name):
+                loads.append(name)
+
+            def predict(self, pairs, batch_size=32):
+                return np.array([len(candidate) for _, candidate in pairs], dtype=float)
+
+        monkeypatch.setattr(pipeline, "CrossEncoder", FakeCrossEncoder)
+        monkeypatch.setattr(pipeline, "_RERANKERS", {})
+
+        assert pipeline._rerank("model-a", "q", ["a", "ccc", "bb"]) == [1, 2, 0]
+        assert pipeline._rerank("model-a", "q", ["x", "yy"]) == [1, 0]
+        pipeline.warm_rerankers(["model-a", "model-b"])
+
+        assert loads == ["model-a", "model-b"]
+
+    def test_rerank_many_matches_per_cluster_order(self, monkeypatch):
+        """Batched reranking scores all clusters in one pass with identical ordering."""
+        import briefing.pipeline as pipeline
+
+        predict_calls = []
+
+        class FakeCrossEncoder:
+            def __init__(self, name):
+                pass
+
+            def predict(self, pairs, batch_size=32):
+                predict_calls.append((len(pairs), batch_size))
+                return np.array([(len(q) * 7 + len(c) * 3) % 11 for q, c in pairs], dtype=float)
+
+        monkeypatch.setattr(pipeline, "CrossEncoder", FakeCrossEncoder)
+        monkeypatch.setattr(pipeline, "_RERANKERS", {})
+
+        jobs = [
+            ("query one", ["a", "bbbb", "cc", "ddddddd"]),
+            ("q2", ["xx", "y"]),
+            ("third query", ["long candidate text", "mid text", "s"]),
+        ]
+
+        per_cluster = [pipeline._rerank("m", query, candidates) for query, candidates in jobs]
+        predict_calls.clear()
+        batched = pipeline._rerank_many("m", jobs, batch_size=16)
+
+        assert batched == per_cluster
+        assert predict_calls == [(9, 16)]
+
 
 class TestTextCleaning:
     """Test text cleaning functionality."""
@@ -105,6 +196,85 @@ class TestTextCleaning:
         assert "Line 1" in cleaned
         assert "Line 2" in cleaned
 
+    def test_fast_path_matches_html2text(self):
+        """Markup-free input skips the parser but yields html2text's output."""
+        import html2text
+
+        def reference(raw):
+            h = html2text.HTML2Text()
+            h.ignore_links = False
+            h.ignore_images = True
+            h.body_width = 0
+            return re.sub(r"\n{3,}", "\n\n", h.handle(raw)).strip()
+
+        samples = [
+            "Show HN: 1. thing\n\n",
+            "- dash   list\n+ plus\t tabs",
+            "back\\slash * star _under_ `tick` [x](y) #hash",
+            "  \u3000全角 空格\n\n\n\nnext  ",
+            "12. numbered\r\nline",
+            "",
+        ]
+        fixture = Path(__file__).resolve().parent.parent / "samples"
+        for path in fixture.glob("*.json"):
+            for entry in json.loads(path.read_text(encoding="utf-8")).get("items", []):
+                samples += [entry.get("title") or "", entry.get("content_html") or ""]
+        for raw in samples:
+            assert clean_text(raw) == reference(raw)
+
+    def test_clean_texts_preserves_order(self, monkeypatch):
+        """Batch cleaning returns one result per input, in order."""
+        from briefing import utils
+
+        texts = ["<p>a</p>", "plain  b", None, "c &amp; d"]
+        assert clean_texts(texts) == ["a", "plain b", "", "c & d"]
+        monkeypatch.setattr(utils, "CLEAN_TEXT_POOL_MIN_ITEMS", 10**9)
+        assert clean_texts(texts, processes=4) == [clean_text(t) for t in texts]
+
+    def test_items_are_sanitized_once_for_embedding_and_reranking(self, monkeypatch):
+        """Embedding and reranking share one sanitized copy of each item's text."""
+        import briefing.pipeline as pipeline
+
+        cleaned = []
+        real_clean = pipeline._clean_text_for_embedding
+
+        def counting_clean(text):
+            cleaned.append(text)
+            return real_clean(text)
+
+        embedded, scored = [], []
+
+        def fake_embed(texts, **kwargs):
+            assert kwargs["sanitized"] is True
+            embedded.extend(texts)
+            return np.eye(len(texts))
+
+        class FakeCrossEncoder:
+            def __init__(self, name):
+                pass
+
+            def predict(self, pairs, batch_size=32):
+                scored.extend(c for _, c in pairs)
+                return np.zeros(len(pairs))
+
+        monkeypatch.setattr(pipeline, "_clean_text_for_embedding", counting_clean)
+        monkeypatch.setattr(pipeline, "_embed_texts", fake_embed)
+        monkeypatch.setattr(pipeline, "_cluster", lambda embs, min_cluster_size: np.zeros(len(embs), dtype=int))
+        monkeypatch.setattr(pipeline, "CrossEncoder", FakeCrossEncoder)
+        monkeypatch.setattr(pipeline, "_RERANKERS", {})
+
+        recent = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        raw = ["a\\xZZ b\x00", " 中文\ud800 ", "plain"]
+        items = [{"id": str(i), "text": t, "url": f"http://example.com/{i}", "timestamp": recent} for i, t in enumerate(raw)]
+        config = {"time_window_hours": 24, "min_cluster_size": 1, "sim_near_dup": 0.99, "reranker_model": "stub"}
+
+        bundles = pipeline.run_processing_pipeline(items, config)
+
+        assert cleaned == raw
+        assert embedded == ["a ZZ b", "中文?", "plain"]
+        assert sorted(scored) == sorted(embedded)
+        assert [it["text"] for it in bundles[0]["items"]] == raw
+
 
 class TestConfigValidation:
     """Test configuration validation."""
@@ -218,6 +388,11 @@ class TestTimeWindowFiltering:
         monkeypatch.setattr(pipeline, "_top_k_by_centroid", lambda embs, idxs, k=50: idxs)
         monkeypatch.setattr(pipeline, "_cluster_centrality", lambda embs, idxs: (idxs[0], embs[idxs[0]]))
         monkeypatch.setattr(pipeline, "_rerank", lambda model, query, candidates: list(range(len(candidates))))
+        monkeypatch.setattr(
+            pipeline,
+            "_rerank_many",
+            lambda model, jobs, batch_size=64, **kwargs: [list(range(len(candidates))) for _, candidates in jobs],
+        )
 
         now = datetime.now(timezone.utc)
         recent = now - timedelta(hours=1)
@@ -258,6 +433,62 @@ class TestTimeWindowFiltering:
         assert captured_kwargs["max_batch_tokens"] > 0
         assert "chars_per_token" in captured_kwargs
 
+    def test_streaming_pipeline_embeds_while_fetching(self, monkeypatch):
+        """Chunks are embedded as batches arrive and results match the batch pipeline."""
+        import threading
+        import briefing.pipeline as pipeline
+
+        embedded_chunks = []
+        chunk_seen = threading.Event()
+
+        def fake_embed(texts, **kwargs):
+            embedded_chunks.append(list(texts))
+            chunk_seen.set()
+            return np.array([[float(t.split("-")[1]), 1.0] for t in texts])
+
+        flushes = []
+        monkeypatch.setattr(pipeline, "_embed_texts", fake_embed)
+        monkeypatch.setattr(
+            pipeline, "embedding_cache_from_config", lambda cfg: SimpleNamespace(flush=lambda: flushes.append(1))
+        )
+        monkeypatch.setattr(pipeline, "_cluster", lambda embs, min_cluster_size: np.zeros(len(embs), dtype=int))
+        monkeypatch.setattr(
+            pipeline,
+            "_rerank_many",
+            lambda model, jobs, batch_size=64, **kwargs: [list(range(len(candidates))) for _, candidates in jobs],
+        )
+
+        recent = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        old = (datetime.now(timezone.utc) - timedelta(hours=48)).isoformat()
+        items = [
+            {"id": str(i), "text": f"item-{i}", "url": f"http://example.com/{i}", "timestamp": old if i == 3 else recent}
+            for i in range(7)
+        ]
+
+        def batches():
+            yield items[:4]
+            # the first chunk is embedded before the source yields again
+            assert chunk_seen.wait(timeout=5)
+            yield items[4:]
+
+        config = {
+            "time_window_hours": 24,
+            "min_cluster_size": 1,
+            "sim_near_dup": 0.99,
+            "reranker_model": "stub-model",
+            "streaming": {"chunk_items": 2},
+        }
+
+        timings = {}
+        streamed = pipeline.run_streaming_pipeline(batches(), config, timings=timings)
+        assert embedded_chunks == [["item-0", "item-1"], ["item-2", "item-4"], ["item-5", "item-6"]]
+        # three chunks, but the embedding cache index is rewritten once
+        assert flushes == [1]
+        assert set(timings) == {"fetch_ms", "embed_ms", "embed_tail_ms", "overlap_ms"}
+
+        batch = run_processing_pipeline(items, config)
+        assert [it["id"] for it in streamed[0]["items"]] == [it["id"] for it in batch[0]["items"]]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,5 +1,7 @@
+import json as jsonlib
 import os
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
@@ -10,6 +12,14 @@ _TEST_LOG_DIR.mkdir(parents=True, exist_ok=True)
 import briefing.pipeline as pipeline
 
 
+class _JsonResp:
+    """Fake TEI response; ``content`` is the raw body the orjson fast path parses."""
+
+    @property
+    def content(self):
+        return jsonlib.dumps(self.json()).encode()
+
+
 def test_embed_texts_respects_batch_limits(monkeypatch, tmp_path):
     monkeypatch.setenv("LOG_DIR", str(tmp_path / "logs"))
 
@@ -20,7 +30,7 @@ def test_embed_texts_respects_batch_limits(monkeypatch, tmp_path):
         payload = json["input"]
         batches.append(payload)
 
-        class _Resp:
+        class _Resp(_JsonResp):
             status_code = 200
 
             def raise_for_status(self):
@@ -37,7 +47,7 @@ def test_embed_texts_respects_batch_limits(monkeypatch, tmp_path):
 
         return _Resp()
 
-    monkeypatch.setattr(pipeline.requests, "post", fake_post)
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: SimpleNamespace(post=fake_post))
 
     texts = ["a" * 400, "b" * 400, "c" * 120]
 
@@ -69,7 +79,7 @@ def test_embed_texts_handles_413(monkeypatch, tmp_path):
         payload = json["input"]
         call_payloads.append([len(text) for text in payload])
 
-        class _Resp:
+        class _Resp(_JsonResp):
             def __init__(self, status_code: int, data: list[float] | None = None):
                 self.status_code = status_code
                 self._data = data or []
@@ -96,7 +106,7 @@ def test_embed_texts_handles_413(monkeypatch, tmp_path):
         data = [float(length)]
         return _Resp(200, data)
 
-    monkeypatch.setattr(pipeline.requests, "post", fake_post)
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: SimpleNamespace(post=fake_post))
 
     texts = ["a" * 280, "b" * 280]
 
@@ -113,3 +123,342 @@ def test_embed_texts_handles_413(monkeypatch, tmp_path):
     # Ensure we attempted a combined batch first, then singles with progressively shorter payloads
     assert call_payloads[0] == [280, 280]
     assert all(len(payload) == 1 for payload in call_payloads[1:])
+
+
+def test_embed_texts_only_sends_cache_misses(monkeypatch, tmp_path):
+    from briefing.embedding_cache import EmbeddingCache
+
+    sent = []
+
+    def fake_post(url, json=None, timeout=None):
+        payload = json["input"]
+        sent.extend(payload)
+
+        class _Resp(_JsonResp):
+            status_code = 200
+
+            def raise_for_status(self):
+                return None
+
+            def json(self):
+                return {"data": [{"embedding": [float(len(text))]} for text in payload]}
+
+        return _Resp()
+
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: SimpleNamespace(post=fake_post))
+
+    cache = EmbeddingCache(tmp_path / "cache", model_id="test-model")
+    kwargs = dict(max_batch_tokens=1000, max_item_chars=0, chars_per_token=4.0)
+
+    first = pipeline._embed_texts(["aa", "bbb"], cache=cache, **kwargs)
+    assert sent == ["aa", "bbb"]
+    # _embed_texts only stages vectors; the pipelines flush once per run
+    assert EmbeddingCache(tmp_path / "cache", model_id="test-model").get_many(["aa"]) == [None]
+    cache.flush()
+
+    sent.clear()
+    reopened = EmbeddingCache(tmp_path / "cache", model_id="test-model")
+    second = pipeline._embed_texts(["bbb", "cccc", "aa"], cache=reopened, **kwargs)
+    assert sent == ["cccc"]
+    assert second[:, 0].tolist() == [3.0, 4.0, 2.0]
+    assert first[:, 0].tolist() == [2.0, 3.0]
+
+
+def test_clean_text_for_embedding_matches_legacy_chain():
+    import re
+
+    def legacy(text):
+        text = text.encode("utf-8", errors="replace").decode("utf-8", errors="replace")
+        text = re.sub(r"\\x(?![0-9a-fA-F]{2})", " ", text)
+        text = re.sub(r"\\u(?![0-9a-fA-F]{4})", " ", text)
+        text = text.replace("\\", " ")
+        return "".join(c for c in text if ord(c) >= 32 or c in "\n\r\t").strip()
+
+    samples = [
+        "",
+        "  plain ascii\t\r\n",
+        "C:\\Users\\x86\\new",
+        "ok \\x41 \\u00e9 bad \\xZ \\u12 \\\\xZ \\u\\x12",
+        "ctrl\x00\x07\x1b[0m\x7f end",
+        "中文 \\xZZ 🚀\ud800\x01",
+        "\\",
+    ]
+    for text in samples:
+        assert pipeline._clean_text_for_embedding(text) == legacy(text)
+    assert pipeline._clean_texts_for_embedding(samples) == [legacy(t) for t in samples]
+
+
+def test_embed_texts_keeps_batches_in_flight_and_backs_off_on_429(monkeypatch):
+    import threading
+    import time
+
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+    throttled = []
+    pauses = []
+    waited = threading.local()
+    posts_after_wait = []
+
+    class _SpyThrottle(pipeline._TeiThrottle):
+        def pause(self, seconds):
+            pauses.append(seconds)
+            super().pause(seconds)
+
+        def wait(self):
+            with self._lock:
+                waited.pending = self._until > time.monotonic()
+            super().wait()
+
+    class _Resp(_JsonResp):
+        def __init__(self, status_code, payload=(), headers=None):
+            self.status_code = status_code
+            self.headers = headers or {}
+            self._payload = payload
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"data": [{"embedding": [float(text.split("-")[1])]} for text in self._payload]}
+
+    def fake_post(url, json=None, timeout=None):
+        payload = json["input"]
+        with lock:
+            posts_after_wait.append((payload[0], getattr(waited, "pending", None)))
+            if payload == ["t-3"] and not throttled:
+                throttled.append(payload[0])
+                return _Resp(429, headers={"Retry-After": "0.2"})
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        # later batches finish first, so results arrive out of order
+        time.sleep(0.05 if int(payload[0].split("-")[1]) % 2 else 0.01)
+        with lock:
+            active[0] -= 1
+        return _Resp(200, payload)
+
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: SimpleNamespace(post=fake_post))
+    monkeypatch.setattr(pipeline, "_TeiThrottle", _SpyThrottle)
+
+    texts = [f"t-{i}" for i in range(12)]
+    embeddings = pipeline._embed_texts(
+        texts, max_batch_tokens=1, max_item_chars=0, chars_per_token=4.0, concurrency=4
+    )
+
+    assert embeddings[:, 0].tolist() == [float(i) for i in range(12)]
+    assert peak[0] > 1
+    # the 429 set one shared pause from Retry-After ...
+    assert pauses == [0.2]
+    # ... every request went through the throttle, and the retry waited the pause out
+    assert all(pending is not None for _, pending in posts_after_wait)
+    assert [pending for text, pending in posts_after_wait if text == "t-3"] == [False, True]
+
+
+def test_embed_texts_packs_batches_by_exact_token_counts(monkeypatch):
+    from briefing.embedding_tokenizer import EmbeddingTokenizer
+
+    # one token per character plus [CLS]/[SEP], like CJK text under a BERT vocabulary
+    def true_tokens(text):
+        return len(text) + 2
+
+    embed_calls = []
+    tokenize_calls = []
+
+    class _Resp(_JsonResp):
+        def __init__(self, status_code, body=None):
+            self.status_code = status_code
+            self.headers = {}
+            self._body = body
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return self._body
+
+    def fake_get(url, timeout=None):
+        assert url.endswith("/info")
+        return _Resp(200, {"max_input_length": 40, "max_client_batch_size": 4})
+
+    def fake_post(url, json=None, timeout=None):
+        if url.endswith("/tokenize"):
+            assert len(json["inputs"]) <= 4
+            tokenize_calls.append(len(json["inputs"]))
+            return _Resp(200, [[{"id": 0}] * true_tokens(t) for t in json["inputs"]])
+        payload = json["input"]
+        embed_calls.append(payload)
+        if sum(map(true_tokens, payload)) > 100 or any(true_tokens(t) > 40 for t in payload):
+            return _Resp(413)
+        return _Resp(200, {"data": [{"embedding": [float(true_tokens(t))]} for t in payload]})
+
+    session = SimpleNamespace(get=fake_get, post=fake_post)
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: session)
+    monkeypatch.setattr(pipeline.time, "sleep", lambda s: None)
+    tokenizer = EmbeddingTokenizer("tei", origin="http://tei", session=session)
+    assert tokenizer.max_input_tokens == 40
+
+    texts = ["中" * 30, "文" * 25, "字" * 80, "词" * 10, "句" * 33, "段" * 5]
+    kwargs = dict(max_batch_tokens=100, max_item_chars=0, chars_per_token=4.0, concurrency=1)
+
+    exact = pipeline._embed_texts(texts, tokenizer=tokenizer, **kwargs)
+    exact_calls, embed_calls[:] = list(embed_calls), []
+    heuristic = pipeline._embed_texts(texts, **kwargs)
+
+    assert all(sum(map(true_tokens, batch)) <= 100 for batch in exact_calls)
+    assert all(true_tokens(t) <= 40 for batch in exact_calls for t in batch)
+    # the 80-char text is cut to fit the model's max_input_length
+    values = exact[:, 0].tolist()
+    assert values[:2] + values[3:] == [32.0, 27.0, 12.0, 35.0, 7.0]
+    assert 36.0 <= values[2] <= 40.0
+    assert len(exact_calls) < len(embed_calls)
+    assert tokenize_calls and max(tokenize_calls) <= 4
+
+    batches, overflows = pipeline._heuristic_batch_plan(
+        texts, [true_tokens(t) for t in texts], 4.0, 100, 40
+    )
+    # the heuristic sees ~49 tokens and packs everything into one batch TEI rejects
+    assert (batches, overflows) == (1, 1)
+    assert heuristic.shape == exact.shape
+
+
+def test_tokenizer_from_config_keys_on_cap_and_retries_failed_info(monkeypatch):
+    import requests
+
+    from briefing import embedding_tokenizer
+
+    info_up = [False]
+    info_calls = []
+
+    class _Resp(_JsonResp):
+        status_code = 200
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return {"max_input_length": 256, "max_client_batch_size": 8}
+
+    def fake_get(url, timeout=None):
+        info_calls.append(url)
+        if not info_up[0]:
+            raise requests.exceptions.ConnectionError("TEI still starting")
+        return _Resp()
+
+    session = SimpleNamespace(get=fake_get)
+    monkeypatch.setattr(embedding_tokenizer, "_TOKENIZERS", {})
+    monkeypatch.setattr(embedding_tokenizer, "_INFO_RETRY_SECONDS", 0.0)
+    cfg = {"tokenizer": {"backend": "tei"}}
+
+    tokenizer = embedding_tokenizer.from_config(cfg, session=session)
+    assert tokenizer.max_input_tokens is None
+    assert tokenizer._client_batch == 32
+
+    info_up[0] = True
+    assert embedding_tokenizer.from_config(cfg, session=session) is tokenizer
+    assert tokenizer.max_input_tokens == 256
+    assert tokenizer._client_batch == 8
+    # loaded once, so later lookups no longer hit /info
+    embedding_tokenizer.from_config(cfg, session=session)
+    assert len(info_calls) == 2
+
+    capped = embedding_tokenizer.from_config({"tokenizer": {"backend": "tei", "max_input_tokens": 128}}, session=session)
+    assert capped is not tokenizer
+    assert capped.max_input_tokens == 128
+
+
+def test_embed_texts_decodes_base64_into_float32_and_falls_back_to_floats(monkeypatch):
+    import base64
+
+    import numpy as np
+
+    requests_seen = []
+    supports_base64 = [True]
+
+    class _Resp(_JsonResp):
+        def __init__(self, status_code, body=None):
+            self.status_code = status_code
+            self.headers = {}
+            self._body = body
+
+        def raise_for_status(self):
+            return None
+
+        def json(self):
+            return self._body
+
+    def fake_post(url, json=None, timeout=None):
+        requests_seen.append(json.get("encoding_format"))
+        vectors = [np.array([len(t), 0.5, -1.25], dtype=np.float32) for t in json["input"]]
+        if json.get("encoding_format") == "base64":
+            if not supports_base64[0]:
+                return _Resp(422, {"error": "Failed to deserialize the JSON body: encoding_format: unknown variant `base64`"})
+            rows = [base64.b64encode(v.astype("<f4").tobytes()).decode() for v in vectors]
+        else:
+            rows = [v.tolist() for v in vectors]
+        return _Resp(200, {"data": [{"embedding": row} for row in rows]})
+
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: SimpleNamespace(post=fake_post))
+    monkeypatch.setattr(pipeline, "_TEI_NO_BASE64", set())
+    kwargs = dict(max_batch_tokens=2, max_item_chars=0, chars_per_token=4.0, concurrency=2)
+    texts = ["a", "bb" * 4, "ccc"]
+
+    embs = pipeline._embed_texts(texts, **kwargs)
+    assert embs.dtype == np.float32 and embs.flags["C_CONTIGUOUS"]
+    assert embs.tolist() == [[1.0, 0.5, -1.25], [8.0, 0.5, -1.25], [3.0, 0.5, -1.25]]
+    assert set(requests_seen) == {"base64"}
+
+    # an older TEI rejects the field once; the batch is resent as floats and later batches skip it
+    requests_seen.clear()
+    supports_base64[0] = False
+    monkeypatch.setattr(pipeline, "_TEI_NO_BASE64", set())
+    fallback = pipeline._embed_texts(texts, **dict(kwargs, concurrency=1))
+    assert fallback.tolist() == embs.tolist()
+    assert requests_seen == ["base64", None, None, None]
+
+    requests_seen.clear()
+    floats = pipeline._embed_texts(texts, encoding="float", **kwargs)
+    assert floats.tolist() == embs.tolist()
+    assert set(requests_seen) == {None}
+
+
+def test_embed_texts_keeps_base64_after_an_unrelated_422(monkeypatch):
+    import base64
+
+    import numpy as np
+
+    formats = []
+    rejected = []
+
+    class _Resp(_JsonResp):
+        def __init__(self, status_code, body=None):
+            self.status_code = status_code
+            self.headers = {}
+            self._body = body
+
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                import requests
+
+                raise requests.exceptions.HTTPError(response=self)
+
+        def json(self):
+            return self._body
+
+    def fake_post(url, json=None, timeout=None):
+        formats.append(json.get("encoding_format"))
+        if not rejected:
+            rejected.append(True)
+            return _Resp(422, {"error": "Input validation error: `inputs` cannot be empty", "error_type": "Validation"})
+        rows = [base64.b64encode(np.float32([len(t)]).astype("<f4").tobytes()).decode() for t in json["input"]]
+        return _Resp(200, {"data": [{"embedding": row} for row in rows]})
+
+    monkeypatch.setattr(pipeline, "_tei_session", lambda: SimpleNamespace(post=fake_post))
+    monkeypatch.setattr(pipeline, "_TEI_NO_BASE64", set())
+    monkeypatch.setattr(pipeline.time, "sleep", lambda s: None)
+
+    embs = pipeline._embed_texts(["ab", "c"], max_batch_tokens=100, max_item_chars=0, chars_per_token=4.0)
+
+    assert embs[:, 0].tolist() == [2.0, 1.0]
+    # the validation error was retried as an ordinary failure; base64 stays on for the process
+    assert formats == ["base64", "base64"]
+    assert pipeline._TEI_NO_BASE64 == set()
@@ -258,3 +258,163 @@ def test_invalid_item_urls_do_not_drop_cluster(monkeypatch, tmp_path):
     assert briefing.topics[0].headline == "Mixed Cluster Survives"
     assert len(briefing.topics[0].bullets) == 1
     assert str(briefing.topics[0].bullets[0].url).startswith("https://")
+
+
+def test_parallel_clusters_keep_order_and_isolate_failures(monkeypatch, tmp_path, sample_bundles):
+    import threading
+    import time
+
+    in_flight = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_call_with_schema(**kwargs):
+        title = kwargs["schema"]["title"]
+        cluster_id = "cluster-hn-001" if "cluster-hn-001" in kwargs["prompt"] else "cluster-tw-002"
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        try:
+            # the first cluster is slower so completion order differs from input order
+            time.sleep(0.05 if cluster_id == "cluster-hn-001" else 0.01)
+            if cluster_id == "cluster-tw-002" and title == "ClusterSelection":
+                raise RuntimeError("provider 5xx")
+            url = "https://example.com/acme-cli"
+            if title == "ClusterFacts":
+                return {"cluster_id": cluster_id, "facts": [{"fact_id": "f0", "text": "t", "url": url}]}
+            if title == "ClusterSelection":
+                return {
+                    "cluster_id": cluster_id,
+                    "picked": [
+                        {
+                            "fact_id": "f0",
+                            "text": "t",
+                            "url": url,
+                            "scores": {"actionability": 3, "novelty": 1, "impact": 1, "reusability": 1, "reliability": 1},
+                            "strategic_flag": False,
+                            "rationale": "r",
+                        }
+                    ],
+                }
+            return {"topic_id": cluster_id, "headline": f"H {cluster_id}", "bullets": [{"text": "b", "url": url}]}
+        finally:
+            with lock:
+                in_flight["now"] -= 1
+
+    monkeypatch.setattr("briefing.pipeline_multistep.call_with_schema", fake_call_with_schema)
+
+    config = {
+        "briefing_title": "Daily AI Brief",
+        "processing": {"multi_stage": True, "agentic_section": False},
+        "multistage": {"max_concurrency": 4},
+    }
+
+    briefing, state = run_multistage_pipeline(sample_bundles, config, output_root=tmp_path)
+
+    assert in_flight["peak"] == 2
+    assert list(state.facts) == ["cluster-hn-001", "cluster-tw-002"]
+    assert "cluster-tw-002" not in state.selections
+    assert [topic.headline for topic in briefing.topics] == ["H cluster-hn-001"]
+
+
+def test_metrics_count_only_their_own_run(monkeypatch, tmp_path, sample_bundles):
+    from briefing.llm import cache as llm_cache
+    from briefing.llm import registry
+
+    url = "https://example.com/acme-cli"
+
+    def fake_call_openai(prompt, model, temperature, timeout, retries, schema, options):
+        title = schema["title"]
+        cluster_id = "cluster-hn-001" if "cluster-hn-001" in prompt else "cluster-tw-002"
+        if title == "ClusterFacts":
+            return {"cluster_id": cluster_id, "facts": [{"fact_id": "f0", "text": "t", "url": url}]}
+        if title == "ClusterSelection":
+            return {
+                "cluster_id": cluster_id,
+                "picked": [
+                    {
+                        "fact_id": "f0",
+                        "text": "t",
+                        "url": url,
+                        "scores": {"actionability": 2, "novelty": 1, "impact": 1, "reusability": 1, "reliability": 1},
+                        "strategic_flag": False,
+                        "rationale": "r",
+                    }
+                ],
+            }
+        return {"topic_id": cluster_id, "headline": f"H {cluster_id}", "bullets": [{"text": "b", "url": url}]}
+
+    monkeypatch.setattr(registry, "call_openai", fake_call_openai)
+    monkeypatch.setattr(llm_cache, "_CACHES", {})
+
+    config = {
+        "briefing_title": "Brief",
+        "processing": {"agentic_section": False},
+        "multistage": {
+            "llm_provider": "openai",
+            "max_concurrency": 2,
+            "response_cache": {"enabled": True, "dir": str(tmp_path / "llm")},
+        },
+    }
+    first_briefing, first_state = run_multistage_pipeline(sample_bundles, config)
+    second_briefing, second_state = run_multistage_pipeline(sample_bundles, config)
+
+    first = compute_metrics(first_state, first_briefing, config)
+    second = compute_metrics(second_state, second_briefing, config)
+    assert first["llm_cache_hits"] == 0
+    assert first["llm_cache_hit_rate"] == 0.0
+    # the process-wide cache saw 6 misses then 6 hits; the second run reports only its own
+    assert second["llm_cache_hits"] == 6
+    assert second["llm_cache_hit_rate"] == 1.0
+    assert second["prompt_template_compiles"] == 0
+
+
+def test_resume_reuses_artifacts_with_matching_fingerprints(monkeypatch, tmp_path, sample_bundles):
+    calls = []
+    url = "https://example.com/acme-cli"
+
+    def fake_call_with_schema(**kwargs):
+        title = kwargs["schema"]["title"]
+        calls.append(title)
+        cluster_id = "cluster-hn-001" if "cluster-hn-001" in kwargs["prompt"] else "cluster-tw-002"
+        if title == "ClusterFacts":
+            return {"cluster_id": cluster_id, "facts": [{"fact_id": "f0", "text": "t", "url": url}]}
+        if title == "ClusterSelection":
+            return {
+                "cluster_id": cluster_id,
+                "picked": [
+                    {
+                        "fact_id": "f0",
+                        "text": "t",
+                        "url": url,
+                        "scores": {"actionability": 2, "novelty": 1, "impact": 1, "reusability": 1, "reliability": 1},
+                        "strategic_flag": False,
+                        "rationale": "r",
+                    }
+                ],
+            }
+        return {"topic_id": cluster_id, "headline": f"H {cluster_id}", "bullets": [{"text": "b", "url": url}]}
+
+    monkeypatch.setattr("briefing.pipeline_multistep.call_with_schema", fake_call_with_schema)
+
+    config = {"briefing_title": "Brief", "processing": {"agentic_section": False}, "multistage": {}}
+    first, _ = run_multistage_pipeline(sample_bundles, config, briefing_id="b", output_root=tmp_path)
+    assert len(calls) == 6
+    assert (tmp_path / "b" / "stages" / "cluster-hn-001" / "cluster-hn-001_stage1.sha256").exists()
+
+    calls.clear()
+    config["multistage"]["resume"] = True
+    resumed, state = run_multistage_pipeline(sample_bundles, config, briefing_id="b", output_root=tmp_path)
+    assert calls == []
+    assert [t.headline for t in resumed.topics] == [t.headline for t in first.topics]
+    assert set(state.topics) == {"cluster-hn-001", "cluster-tw-002"}
+
+    # changing model settings invalidates every fingerprint
+    config["multistage"]["temperature"] = 0.7
+    run_multistage_pipeline(sample_bundles, config, briefing_id="b", output_root=tmp_path)
+    assert len(calls) == 6
+
+    # so does pointing the provider at another endpoint
+    calls.clear()
+    config["multistage"]["provider_options"] = {"gemini": {"base_url": "https://proxy.example.com"}}
+    run_multistage_pipeline(sample_bundles, config, briefing_id="b", output_root=tmp_path)
+    assert len(calls) == 6
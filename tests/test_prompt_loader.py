@@ -0,0 +1,22 @@
+"""Tests for the compiled prompt template cache."""
+
+import os
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing.rendering import prompt_loader
+
+
+def test_templates_compiled_once_and_reloaded_on_change(tmp_path):
+    prompt = tmp_path / "p.yaml"
+    prompt.write_text('system: "Hi {{ briefing_title }}"\ntask: "{{ bundles_json }}"\n', encoding="utf-8")
+
+    before = prompt_loader.template_stats()["compiles"]
+    assert prompt_loader.render_prompt("T", [1], str(prompt)) == "Hi T\n\n[\n  1\n]\n"
+    assert prompt_loader.render_prompt("U", [], str(prompt)) == "Hi U\n\n[]\n"
+    assert prompt_loader.template_stats()["compiles"] == before + 1
+
+    prompt.write_text('system: "Bye {{ briefing_title }}"\ntask: ""\n', encoding="utf-8")
+    os.utime(prompt, ns=(1, 1))
+    assert prompt_loader.render_prompt("T", [], str(prompt)) == "Bye T\n"
+    assert prompt_loader.template_stats()["compiles"] == before + 2
@@ -0,0 +1,63 @@
+"""Tests for the in-process briefing scheduler."""
+
+import datetime as dt
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing.scheduler import BriefingScheduler, CronSchedule, schedule_briefing
+
+
+def test_cron_next_after():
+    base = dt.datetime(2025, 1, 31, 23, 58, 30)
+    assert CronSchedule("* * * * *").next_after(base) == dt.datetime(2025, 1, 31, 23, 59)
+    assert CronSchedule("*/15 * * * *").next_after(base) == dt.datetime(2025, 2, 1, 0, 0)
+    assert CronSchedule("0 7,19 * * *").next_after(base) == dt.datetime(2025, 2, 1, 7, 0)
+    # 2025-02-03 is a Monday
+    assert CronSchedule("30 9 * * 1-5").next_after(base) == dt.datetime(2025, 2, 3, 9, 30)
+    assert CronSchedule("0 0 29 2 *").next_after(base) == dt.datetime(2028, 2, 29, 0, 0)
+    # both day fields restricted: either matches
+    assert CronSchedule("0 0 15 * 0").next_after(base) == dt.datetime(2025, 2, 2, 0, 0)
+
+    for bad in ("* * * *", "61 * * * *", "*/0 * * * *"):
+        with pytest.raises(ValueError):
+            CronSchedule(bad)
+
+
+def test_scheduler_isolates_failures_and_skips_overlapping_runs():
+    now = [dt.datetime(2025, 1, 1, 8, 0)]
+    release = threading.Event()
+    calls = []
+
+    def runner(path: Path) -> None:
+        calls.append(path.name)
+        if path.name == "bad.yaml":
+            raise RuntimeError("boom")
+        release.wait(timeout=5)
+
+    start = now[0] - dt.timedelta(minutes=1)
+    jobs = [
+        schedule_briefing(Path("bad.yaml"), "* * * * *", now=start),
+        schedule_briefing(Path("slow.yaml"), "* * * * *", now=start),
+    ]
+    scheduler = BriefingScheduler(jobs, runner=runner, max_parallel=2, clock=lambda: now[0])
+
+    first = scheduler.tick()
+    first[0].result(timeout=5)
+    now[0] += dt.timedelta(minutes=1)
+    second = scheduler.tick()
+    release.set()
+    for f in first + second:
+        f.result(timeout=5)
+
+    # slow.yaml was still running on the second tick, so only bad.yaml ran again
+    assert sorted(calls) == ["bad.yaml", "bad.yaml", "slow.yaml"]
+    assert scheduler.stats() == {
+        "bad.yaml": {"runs": 2, "failures": 2},
+        "slow.yaml": {"runs": 1, "failures": 0},
+    }
+    assert jobs[1].next_run == dt.datetime(2025, 1, 1, 8, 2)
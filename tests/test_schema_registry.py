@@ -0,0 +1,56 @@
+"""Tests for the process-wide schema registry."""
+
+import os
+
+import pytest
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing import schema_registry
+from briefing.llm.schema_adapter import to_gemini, to_openai
+from briefing.utils import validate_config
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    schema_registry.reset_registry()
+    yield
+    schema_registry.reset_registry()
+
+
+def test_config_schema_loaded_and_compiled_once():
+    cfg = {"briefing_id": "x"}
+    for _ in range(3):
+        with pytest.raises(ValueError, match="Config validation error"):
+            validate_config(cfg)
+
+    stats = schema_registry.registry_stats()
+    assert stats["loads"] == 1
+    assert stats["validators_built"] == 1
+
+
+def test_provider_schema_converted_once_per_content():
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "title": "T",
+        "type": "object",
+        "properties": {"a": {"type": "string"}},
+        "required": ["a"],
+    }
+
+    first = schema_registry.provider_schema("gemini", schema)
+    assert first == to_gemini(schema)
+    assert schema_registry.provider_schema("Gemini", dict(schema)) is first
+    assert schema_registry.provider_schema("openai", schema) == to_openai(schema)
+
+    changed = {**schema, "required": []}
+    assert schema_registry.provider_schema("gemini", changed)["required"] == []
+
+    reordered = {**schema, "properties": {"b": {"type": "integer"}, "a": {"type": "string"}}}
+    swapped = {**schema, "properties": {"a": {"type": "string"}, "b": {"type": "integer"}}}
+    assert schema_registry.provider_schema("gemini", reordered)["propertyOrdering"] == ["b", "a"]
+    assert schema_registry.provider_schema("gemini", swapped)["propertyOrdering"] == ["a", "b"]
+    assert schema_registry.registry_stats()["conversions"] == 5
+
+    with pytest.raises(ValueError):
+        schema_registry.provider_schema("unknown", schema)
@@ -0,0 +1,64 @@
+"""Tests for the cross-run seen-items index."""
+
+import os
+
+import numpy as np
+
+os.environ.setdefault("LOG_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "_logs"))
+
+from briefing.seen_index import SeenItemsIndex, from_config
+
+
+def _items(*urls):
+    return [{"url": u, "text": u} for u in urls]
+
+
+def test_commit_then_match_by_url_and_embedding(tmp_path):
+    index = SeenItemsIndex(tmp_path, "brief", sim_threshold=0.9)
+    index.stage(_items("https://a", "https://b"), np.array([[1.0, 0.0], [0.0, 1.0]]))
+    # nothing is persisted until the run is committed
+    assert len(SeenItemsIndex(tmp_path, "brief")) == 0
+    index.commit("run1")
+
+    reopened = SeenItemsIndex(tmp_path, "brief", sim_threshold=0.9)
+    embs = np.array([[0.0, 5.0], [0.99, 0.05], [0.7, -0.7]])
+    assert reopened.seen_mask(_items("https://a", "https://new", "https://other"), embs) == [True, True, False]
+
+
+def test_only_last_max_runs_are_kept(tmp_path):
+    for n in range(3):
+        index = SeenItemsIndex(tmp_path, "brief", max_runs=2)
+        index.stage(_items(f"https://{n}"), np.array([[float(n + 1), 1.0]]))
+        index.commit(f"r{n}")
+
+    index = SeenItemsIndex(tmp_path, "brief", max_runs=2)
+    assert len(list((tmp_path / "brief").glob("run-*.npz"))) == 2
+    assert index.seen_mask(_items("https://0", "https://2"), np.zeros((2, 2))) == [False, True]
+
+
+def test_from_config_defaults(tmp_path):
+    assert from_config("brief", {}) is None
+    index = from_config("brief", {"sim_near_dup": 0.8, "seen_items": {"enabled": True, "dir": str(tmp_path)}})
+    assert index.sim_threshold == 0.8 and index.mode == "drop"
+
+
+def test_pipeline_stages_only_items_emitted_in_bundles(tmp_path, monkeypatch):
+    import briefing.pipeline as pipeline
+
+    items = _items(*(f"https://{n}" for n in range(5)))
+    embs = np.eye(5, dtype=np.float32)
+    monkeypatch.setattr(pipeline, "_cluster", lambda e, m: np.zeros(len(e), dtype=int))
+    monkeypatch.setattr(
+        pipeline, "_rerank_many", lambda model, jobs, **kw: [list(range(len(c))) for _, c in jobs]
+    )
+    index = SeenItemsIndex(tmp_path, "brief")
+    cfg = {"sim_near_dup": 0.9, "reranker_model": "m", "max_candidates_per_cluster": 2}
+
+    bundles = pipeline._bundle_embedded(items, embs, cfg, seen_index=index)
+    index.commit("run1")
+
+    emitted = {it["url"] for b in bundles for it in b["items"]}
+    assert len(emitted) == 2
+    reopened = SeenItemsIndex(tmp_path, "brief")
+    # candidates cut by max_candidates_per_cluster are not remembered as covered
+    assert reopened.seen_mask(items, np.zeros((5, 5))) == [it["url"] in emitted for it in items]